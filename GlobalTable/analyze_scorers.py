@@ -0,0 +1,104 @@
+"""Summarize the CLQ top scorer list: rates and per-nationality/position/club rollups.
+
+Usage:
+    python analyze_scorers.py [CSV] [--top 10] [--by nationality position club]
+                              [--json PATH] [--plot clq_scorers_analysis.png] [--no-cache]
+
+CSV defaults to top_1000_scorers.csv next to this script. Aggregates come
+from clq.analytics and are cached next to the CSV, keyed by its SHA-256, so
+repeated runs only recompute them after the CSV changes. --plot redraws the
+four-panel figure and needs matplotlib.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from clq import analytics  # noqa: E402
+
+HERE = Path(__file__).resolve().parent
+DEFAULT_INPUT = HERE / "top_1000_scorers.csv"
+
+
+def _fmt(value):
+    if value is None or value != value:  # None, NaN or <NA>
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def print_rollup(table, by, top):
+    columns = ("players", "goals", "matches", "goals_per_match", "penalty_share")
+    print(f"\nTop {top} by goals, per {by}:")
+    print(f"  {by:<28}" + "".join(f"{c:>17}" for c in columns))
+    for name, row in table.head(top).iterrows():
+        print(f"  {str(name)[:28]:<28}" + "".join(f"{_fmt(row[c]):>17}" for c in columns))
+
+
+def plot(agg, path):
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print("--plot needs matplotlib (pip install clq[plot])", file=sys.stderr)
+        return False
+    players = agg["players"]
+    rate = players["goals_per_match"].dropna().astype(float)
+    by_position = (players.groupby("position", observed=True)["goals_per_match"].mean()
+                   .astype(float).sort_values().tail(10))
+    fig, axes = plt.subplots(2, 2, figsize=(20, 16))
+    axes[0, 0].hist(rate, bins=30, color="skyblue", alpha=0.7)
+    axes[0, 0].set(title="Distribution of Goals per Match", xlabel="Goals per Match", ylabel="Number of Players")
+    axes[0, 1].scatter(players["matches"].astype(float), players["goals"].astype(float), color="coral", alpha=0.6)
+    axes[0, 1].set(title="Goals vs Matches Played", xlabel="Matches Played", ylabel="Total Goals")
+    axes[1, 0].barh(by_position.index.astype(str), by_position.values, color="lightgreen")
+    axes[1, 0].set(title="Average Goals per Match by Position", xlabel="Goals per Match")
+    axes[1, 1].hist(players["age"].dropna().astype(int), bins=20, color="gold", alpha=0.7)
+    axes[1, 1].set(title="Age Distribution of Players", xlabel="Age", ylabel="Number of Players")
+    fig.tight_layout()
+    fig.savefig(path, dpi=200)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv", nargs="?", type=Path, default=DEFAULT_INPUT)
+    parser.add_argument("--top", type=int, default=10, help="rows per rollup")
+    parser.add_argument("--by", nargs="+", choices=analytics.ROLLUPS, default=list(analytics.ROLLUPS))
+    parser.add_argument("--json", type=Path, help="write the summary and rollups as JSON to this path")
+    parser.add_argument("--plot", type=Path, help="save the analysis figure to this path")
+    parser.add_argument("--no-cache", action="store_true", help="recompute instead of using the aggregate cache")
+    args = parser.parse_args(argv)
+
+    if args.no_cache:
+        agg = analytics.aggregates(analytics.load_scorer_frame(args.csv))
+    else:
+        agg = analytics.cached_aggregates(args.csv)
+
+    s = agg["summary"]
+    print(f"{s['players']} scorers, {s['goals']} goals in {s['matches']} matches "
+          f"({_fmt(s['goals_per_match'])} per match), penalty share {_fmt(s['penalty_share'])}")
+    print(f"{s['multi_club_players']} scored for several clubs; not recorded: "
+          + ", ".join(f"{name} {count}" for name, count in s["missing"].items()))
+    for by in args.by:
+        print_rollup(agg[by], by, args.top)
+
+    if args.json:
+        out = {"summary": s}
+        for by in args.by:
+            table = agg[by].astype(object).where(agg[by].notna(), None)
+            out[by] = [{by: str(name), **row} for name, row in zip(table.index, table.to_dict("records"))]
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(out, f, indent=2, ensure_ascii=False)
+    if args.plot and not plot(agg, args.plot):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
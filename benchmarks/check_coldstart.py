@@ -0,0 +1,122 @@
+"""Cold-start regression check for the ``clq`` command.
+
+Runs each scenario in a fresh interpreter and fails (exit status 1) when
+
+* its startup overhead - best wall time minus the best wall time of a bare
+  ``python -c pass`` - exceeds the budget, or
+* ``-X importtime`` shows it importing a module that must stay off the
+  lookup path (pandas, NumPy).
+
+The lookups run against synthetic data ``--scale`` times the size of the
+published files (see ``synth.py``), so a lookup whose cost grows with the
+dataset shows up; ``--scale 0`` uses the published files.
+
+Usage:
+    python benchmarks/check_coldstart.py [--budget-ms 50] [--runs 10] [--scale 10]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+sys.path.insert(0, str(HERE.parent))
+
+# Rows at scale 1, as in the published files.
+TABLE_ROWS = 416
+SCORER_ROWS = 500
+FORBIDDEN = ("pandas", "numpy")
+ENTRY = "import sys; from clq.cli import main; sys.exit(main())"
+
+
+def write_dataset(root: Path, scale: int, seed: int = 0) -> str:
+    """Synthetic table JSON and scorer CSV in ``root``; returns a club to look up."""
+    import synth
+    from clq import sources
+
+    records = synth.table_records(TABLE_ROWS * scale, seed)
+    with open(root / sources.TABLE_FILE, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    synth.write_scorers(root / sources.SCORERS_FILE, SCORER_ROWS * scale, [r["club"] for r in records], seed)
+    return records[len(records) // 2]["club"]
+
+
+def best_wall_ms(cmd, runs, env=None):
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False, env=env)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def imported_modules(args, env=None):
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", ENTRY, *args],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+        env=env,
+    )
+    modules = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        try:
+            modules[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # the header line
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail if clq cold start goes over budget.")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="allowed overhead over a bare interpreter")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--scale", type=int, default=10, help="dataset size relative to the published files (0: published)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix="clq-coldstart-") as tmp:
+        env = None
+        club = "Celtic FC"
+        if args.scale:
+            club = write_dataset(Path(tmp), args.scale)
+            env = dict(os.environ, CLQ_DATA_DIR=tmp)
+        print(f"dataset: {'published' if not args.scale else f'{args.scale}x synthetic'}")
+        return check(args, [("clq --help", ["--help"]), (f"clq club {club!r}", ["club", club])], env)
+
+
+def check(args, scenarios, env):
+    baseline = best_wall_ms([sys.executable, "-c", "pass"], args.runs)
+    print(f"{'python -c pass':<24} {baseline:7.1f} ms")
+
+    failed = False
+    for label, cli_args in scenarios:
+        cmd = [sys.executable, "-c", ENTRY, *cli_args]
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False, env=env)  # build caches
+        wall = best_wall_ms(cmd, args.runs, env)
+        overhead = wall - baseline
+        modules = imported_modules(cli_args, env)
+        forbidden = sorted(name for name in modules if name.split(".")[0] in FORBIDDEN)
+        ok = overhead <= args.budget_ms and not forbidden
+        failed |= not ok
+        print(f"{label:<24} {wall:7.1f} ms  (+{overhead:.1f} ms, budget {args.budget_ms:.0f} ms)  {'ok' if ok else 'FAIL'}")
+        if forbidden:
+            print(f"    imports {', '.join(forbidden[:5])}")
+        if not ok:
+            slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:5]
+            for name, ms in slowest:
+                print(f"    {ms:7.1f} ms  {name}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
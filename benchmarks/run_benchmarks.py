@@ -0,0 +1,331 @@
+"""Time the CLQ and Squadify pipelines on synthetic data at several scales.
+
+For each scale factor (relative to the published files: 416 table rows, 500
+scorers, 195 XIs) the suite generates data with :mod:`synth` into a
+temporary directory and times
+
+* ``table.*``: parsing the export with ``GlobalTable/extract_clq_table.py``,
+  loading the JSON, building and reopening the columnar store, validating
+  the store;
+* ``scorers.*``: loading the CSV, building the store;
+* ``query.*``: opening the query engine, top-k, range and club lookups,
+  scorer filters, the similar-club index and its batched k-NN, quiz
+  generation;
+* ``game.*``: loading the XIs, scheduling a calendar window, building the
+  game payload, the alias index and the membership index.
+
+Every stage runs ``--repeat`` times and the best and median wall times are
+kept. Results are written as JSON together with the commit they were
+measured on. ``--baseline`` compares them with an earlier results file and
+exits with status 1 when a stage got slower than ``--threshold`` times its
+baseline.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--scales 10 100 1000] [--stages table query]
+                                        [--repeat 3] [-o results.json] [--baseline old.json]
+
+Scale 10000 means millions of table rows and needs several GB of memory.
+"""
+import argparse
+import datetime as dt
+import importlib.util
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+ROOT = HERE.parent
+sys.path.insert(0, str(ROOT))
+
+import numpy as np  # noqa: E402
+
+import synth  # noqa: E402
+from clq import lookup, sources, store  # noqa: E402
+from clq.query import QueryEngine  # noqa: E402
+from clq.quiz import QuizBank, generate  # noqa: E402
+from clq.similar import ClubIndex  # noqa: E402
+from clq.validate import validate_table  # noqa: E402
+from squadify.aliases import AliasIndex  # noqa: E402
+from squadify.build import build_game, load_xis  # noqa: E402
+from squadify.index import XIIndex  # noqa: E402
+from squadify.schedule import WINDOW_DAYS, resolve, schedule  # noqa: E402
+
+BASE_SIZES = {"table": 416, "scorers": 500, "xis": 195}
+GROUPS = ("table", "scorers", "query", "game")
+QUERIES = 200
+
+
+def _load_extractor():
+    spec = importlib.util.spec_from_file_location("extract_clq_table", ROOT / "GlobalTable" / "extract_clq_table.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Dataset:
+    """Synthetic sources for one scale, plus objects shared between stages."""
+
+    def __init__(self, root: Path, scale: int, seed: int):
+        self.root = root
+        self.scale = scale
+        self.sizes = {name: base * scale for name, base in BASE_SIZES.items()}
+        self.export = root / "clq_table_export.tsv"
+        self.table = root / sources.TABLE_FILE
+        self.scorers = root / sources.SCORERS_FILE
+        self.xis_path = root / "xis.json"
+
+        records = synth.table_records(self.sizes["table"], seed)
+        synth.write_table_export(self.export, records)
+        synth.write_scorers(self.scorers, self.sizes["scorers"], [r["club"] for r in records], seed)
+        synth.write_xis(self.xis_path, self.sizes["xis"], seed)
+        rng = np.random.default_rng(seed)
+        self.club_names = [records[i]["club"] for i in rng.integers(0, len(records), QUERIES).tolist()]
+        self.engine = None
+        self.similar = None
+        self.xis = None
+
+
+def _drop(*paths):
+    for path in paths:
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+
+def _extract(extractor, d):
+    with open(os.devnull, "w") as devnull:
+        stderr, sys.stderr = sys.stderr, devnull
+        try:
+            extractor.main([str(d.export), "-o", str(d.table)])
+        finally:
+            sys.stderr = stderr
+
+
+def stages(extractor):
+    """``(name, group, size key, setup, run)``; ``run`` returns its number of operations."""
+
+    def parse(d):
+        _extract(extractor, d)
+        return d.sizes["table"]
+
+    def table_store_build(d):
+        store.open_table(d.root).close()
+        return d.sizes["table"]
+
+    def scorer_store_build(d):
+        store.open_scorers(d.root).close()
+        return d.sizes["scorers"]
+
+    def table_store_open(d):
+        with store.open_table(d.root) as table:
+            return len(table)
+
+    def engine_open(d):
+        d.engine = QueryEngine.open(d.root)
+        return 1
+
+    def top(d):
+        clubs = d.engine.clubs
+        for by in ("points", "goal_difference", "points_per_tournament", "matches"):
+            for _ in range(QUERIES // 4):
+                clubs.top(by, 10, where={"participations": (3, None)})
+        return QUERIES
+
+    def range_(d):
+        clubs = d.engine.clubs
+        for lo in range(QUERIES):
+            clubs.select({"points": (lo, lo + 50)}, order_by="points", ascending=False, limit=20)
+        return QUERIES
+
+    def club_exact(d):
+        for name in d.club_names:
+            d.engine.club(name)
+        return len(d.club_names)
+
+    def club_fuzzy(d):
+        for name in d.club_names:
+            d.engine.club(name.upper().replace("O", "0", 1) + "x")
+        return len(d.club_names)
+
+    def club_cached(d):
+        # Opens the cache file and reads one bucket per call, as a fresh ``clq club`` process does.
+        for name in d.club_names:
+            lookup.find("club", name, d.root)
+        return len(d.club_names)
+
+    def scorers_by_club(d):
+        relation = d.engine.scorers
+        for name in d.club_names[:QUERIES // 4]:
+            relation.select({}, match={"club": name}, order_by="goals", ascending=False, limit=10)
+        return QUERIES // 4
+
+    def similar_index(d):
+        d.similar = ClubIndex.from_relation(d.engine.clubs)
+        return d.sizes["table"]
+
+    def similar_knn(d):
+        rows = np.arange(min(QUERIES * 10, len(d.similar.names)))
+        d.similar.neighbours(rows, 5)
+        return len(rows)
+
+    def quiz(d):
+        generate(2000, seed=1, bank=QuizBank(d.engine))
+        return 2000
+
+    def load_game(d):
+        d.xis = load_xis(d.xis_path)
+        return len(d.xis)
+
+    def build(d):
+        out = d.root / "dist"
+        window = schedule(d.xis, WINDOW_DAYS, dt.date(2026, 1, 1))
+        build_game(resolve(window, d.xis), out, window.start)
+        shutil.rmtree(out)
+        return WINDOW_DAYS
+
+    return [
+        ("table.parse", "table", "table", None, parse),
+        ("table.load_json", "table", "table", None, lambda d: len(sources.load_table(d.table))),
+        ("table.store_build", "table", "table", lambda d: _drop(d.root / "clq_table.clqs"), table_store_build),
+        ("table.store_open", "table", "table", None, table_store_open),
+        ("table.validate", "table", "table", None, lambda d: validate_table(d.root / "clq_table.clqs").rows),
+        ("scorers.load_csv", "scorers", "scorers", None, lambda d: len(sources.load_scorers(d.scorers))),
+        ("scorers.store_build", "scorers", "scorers", lambda d: _drop(d.root / "scorers.clqs"), scorer_store_build),
+        ("query.engine_open", "query", "table", None, engine_open),
+        ("query.top", "query", "table", None, top),
+        ("query.range", "query", "table", None, range_),
+        ("query.club_exact", "query", "table", None, club_exact),
+        ("query.club_fuzzy", "query", "table", None, club_fuzzy),
+        ("query.club_lookup_cache", "query", "table", club_cached, club_cached),
+        ("query.scorers_by_club", "query", "scorers", None, scorers_by_club),
+        ("query.similar_index", "query", "table", None, similar_index),
+        ("query.similar_knn", "query", "table", None, similar_knn),
+        ("query.quiz_2000", "query", "scorers", None, quiz),
+        ("game.load_xis", "game", "xis", None, load_game),
+        ("game.schedule_10y", "game", "xis", None, lambda d: len(schedule(d.xis, 3650, dt.date(2026, 1, 1)).days)),
+        ("game.build_window", "game", "xis", None, build),
+        ("game.alias_index", "game", "xis", None, lambda d: len(AliasIndex.from_xis(d.xis))),
+        ("game.xi_index", "game", "xis", None, lambda d: XIIndex.from_xis(d.xis).xi_count),
+    ]
+
+
+def run_stage(dataset, setup, fn, repeat):
+    times = []
+    ops = 0
+    for _ in range(repeat):
+        if setup is not None:
+            setup(dataset)
+        start = time.perf_counter()
+        ops = fn(dataset)
+        times.append(time.perf_counter() - start)
+    return times, ops
+
+
+def compare(results, baseline_path, threshold, min_time):
+    """Print per-op time ratios against a baseline; return the number of regressions.
+
+    Stages faster than ``min_time`` seconds in both runs are timer noise and
+    never count as regressions.
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {(r["scale"], r["stage"]): r for r in json.load(f)["results"]}
+    print(f"\nagainst {baseline_path} (commit {_baseline_commit(baseline_path)}):")
+    regressions = 0
+    for result in results:
+        old = baseline.get((result["scale"], result["stage"]))
+        if old is None or not old["best_per_op_us"] or not result["best_per_op_us"]:
+            continue
+        ratio = result["best_per_op_us"] / old["best_per_op_us"]
+        slower = ratio > threshold and max(result["best_s"], old["best_s"]) >= min_time
+        regressions += slower
+        print(f"  x{result['scale']:<6} {result['stage']:<26} {old['best_per_op_us']:>12} -> "
+              f"{result['best_per_op_us']:>12} us/op  {ratio:5.2f}x {'SLOWER' if slower else ''}")
+    return regressions
+
+
+def _baseline_commit(path):
+    with open(path, encoding="utf-8") as f:
+        return (json.load(f).get("commit") or "?")[:10]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the pipelines on synthetic data.")
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--stages", nargs="+", choices=GROUPS, default=list(GROUPS), help="stage groups to run")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", type=Path, help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--baseline", type=Path, help="results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--min-time", type=float, default=0.005, help="ignore regressions in stages faster than this (s)")
+    args = parser.parse_args(argv)
+
+    commit = _git("rev-parse", "HEAD")
+    started = dt.datetime.now(dt.timezone.utc)
+    output = args.output or HERE / "results" / f"{started:%Y%m%d-%H%M%S}-{(commit or 'nogit')[:8]}.json"
+    extractor = _load_extractor()
+    selected = [s for s in stages(extractor) if s[1] in args.stages]
+    results = []
+    for scale in args.scales:
+        root = Path(tempfile.mkdtemp(prefix=f"clq-bench-{scale}x-"))
+        dataset = None
+        try:
+            generated = time.perf_counter()
+            dataset = Dataset(root, scale, args.seed)
+            _extract(extractor, dataset)  # the query stages read the JSON whether or not parsing is timed
+            print(f"x{scale}: {dataset.sizes} generated in {time.perf_counter() - generated:.2f}s")
+            for name, group, size_key, setup, fn in selected:
+                times, ops = run_stage(dataset, setup, fn, args.repeat)
+                best = min(times)
+                result = {
+                    "scale": scale, "stage": name, "size": dataset.sizes[size_key], "ops": ops,
+                    "runs": len(times), "best_s": round(best, 6), "median_s": round(statistics.median(times), 6),
+                    "best_per_op_us": round(best / ops * 1e6, 3) if ops else None,
+                }
+                results.append(result)
+                print(f"  {name:<26} best {best:9.4f}s  median {result['median_s']:9.4f}s"
+                      f"  {result['best_per_op_us']:>12} us/op")
+        finally:
+            if dataset is not None and dataset.engine is not None:
+                dataset.engine.clubs.store.close()
+                dataset.engine.scorers.store.close()
+            shutil.rmtree(root, ignore_errors=True)
+
+    report = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "started": started.isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"results -> {output}")
+
+    if args.baseline:
+        return 1 if compare(results, args.baseline, args.threshold, args.min_time) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
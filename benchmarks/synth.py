@@ -0,0 +1,170 @@
+"""Synthetic CLQ and Squadify data at arbitrary scale.
+
+Each generator mirrors the schema and the quirks of a published file, so
+the real parsers and loaders run unchanged:
+
+* :func:`write_table_export` - the tab-separated CLQ table export parsed by
+  ``GlobalTable/extract_clq_table.py`` (multi-line header, "a : b" goals,
+  repeated club column, blank points per tournament on the tail rows);
+* :func:`write_scorers` - ``top_1000_scorers.csv`` (same header, ``-``
+  placeholders, "for N clubs" rows, clubs spelled like the table's);
+* :func:`xi_database` - ``diverse_english_xis.json``.
+
+Values are consistent where the real data is (W + D + L = matches,
+points = 3W + D, goal difference, rounded points per tournament, rows
+ordered by points then goal difference). Output depends only on ``n`` and
+``seed``.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+
+from clq.sources import SCORERS_HEADER
+
+# The export's column headings, split over several lines as published.
+EXPORT_HEADER = (
+    "#\tClub\t\nParticipations\n\t\nMatches\n\t\nW\n\t\nD\n\t\nL\n\tGoals\t\nGD\n\t\nPoints\n\t\n"
+    "Points per tournament\n"
+)
+
+_STEMS = ("Dinamo", "Sporting", "Olimpija", "Zalgiris", "Skënderbeu", "Sheriff", "Ludogorets", "Qarabağ",
+          "Malmö", "Rosenborg", "Hafnarfjörður", "Bodø", "Ferencváros", "Slovan", "Partizan", "Crvena",
+          "Levadia", "Flora", "Valletta", "Birkirkara", "Lincoln", "Linfield", "Dundalk", "Shamrock")
+_AFFIXES = ("FC", "FK", "SK", "NK", "AC", "")
+_FIRST = ("Marko", "Luka", "Ivan", "João", "Andrés", "Søren", "Mikkel", "Ørjan", "Zoltán", "Gökhan", "Jürgen",
+          "Ryan", "Conor", "Kévin", "Piotr", "Dušan")
+_LAST = ("Petrović", "Nowak", "Silva", "Groß", "Pröpper", "Hansen", "O'Brien", "Kovač", "Müller", "Popescu",
+         "Andersen", "Fernández", "Wan-Bissaka", "Szabó", "Kanté", "Lindelöf")
+_POSITIONS = ("Goalkeeper", "Centre-Back", "Left-Back", "Right-Back", "Defensive Midfield", "Central Midfield",
+              "Attacking Midfield", "Left Winger", "Right Winger", "Centre-Forward", "Second Striker")
+_NATIONS = ("Slovenia", "Serbia", "Brazil", "Israel", "Norway", "Denmark", "Hungary", "Georgia", "Ireland",
+            "Scotland", "Poland", "Romania", "Azerbaijan", "Kazakhstan")
+_LEAGUES = ("Premier League", "Championship", "League One", "League Two")
+_FORMATIONS = {
+    "4-4-2": [(80, 40), (61, 15), (63, 30), (63, 50), (61, 65), (43, 15), (43, 30), (43, 50), (43, 65), (23, 30), (23, 50)],
+    "4-2-3-1": [(80, 40), (61, 15), (63, 30), (63, 50), (61, 65), (50, 30), (50, 50), (33, 15), (33, 40), (33, 65), (13, 40)],
+    "3-5-2": [(80, 40), (63, 25), (63, 40), (63, 55), (43, 10), (45, 28), (45, 40), (45, 52), (43, 70), (23, 30), (23, 50)],
+}
+
+
+def club_names(n: int) -> List[str]:
+    """``n`` distinct club names with accents, affixes and defunct-year suffixes."""
+    names = []
+    for i in range(n):
+        stem = _STEMS[i % len(_STEMS)]
+        affix = _AFFIXES[(i // len(_STEMS)) % len(_AFFIXES)]
+        name = f"{affix} {stem} {i // len(_STEMS)}".strip() if i >= len(_STEMS) else f"{affix} {stem}".strip()
+        if i % 17 == 5:
+            name += f" (- {2000 + i % 25})"
+        names.append(name)
+    return names
+
+
+def table_records(n: int, seed: int = 0) -> List[dict]:
+    """``n`` ranked table rows; roughly the last 12% have no points per tournament."""
+    rng = np.random.default_rng(seed)
+    participations = 1 + rng.geometric(0.25, n)
+    matches = participations * rng.integers(2, 7, n)
+    wins = rng.binomial(matches, 0.38)
+    draws = rng.binomial(matches - wins, 0.3)
+    losses = matches - wins - draws
+    goals_for = rng.poisson(1.3 * matches)
+    goals_against = rng.poisson(1.3 * matches)
+    points = 3 * wins + draws
+    difference = goals_for - goals_against
+    order = np.lexsort((-difference, -points))
+    clubs = club_names(n)
+    blank_from = int(n * 0.88)
+    records = []
+    for rank, i in enumerate(order.tolist(), 1):
+        ppt = np.floor(points[i] / participations[i] * 100 + 0.5) / 100
+        records.append({
+            "rank": rank, "club": clubs[i], "participations": int(participations[i]), "matches": int(matches[i]),
+            "wins": int(wins[i]), "draws": int(draws[i]), "losses": int(losses[i]),
+            "goals_for": int(goals_for[i]), "goals_against": int(goals_against[i]),
+            "goal_difference": int(difference[i]), "points": int(points[i]),
+            "points_per_tournament": None if rank > blank_from else float(ppt),
+        })
+    return records
+
+
+def write_table_export(path: Path, records: Sequence[dict]) -> Path:
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write(EXPORT_HEADER)
+        for r in records:
+            ppt = "" if r["points_per_tournament"] is None else f"{r['points_per_tournament']:.2f}"
+            f.write(
+                f"{r['rank']}\t{r['club']}\t{r['club']}\t{r['participations']}\t{r['matches']}\t{r['wins']}\t"
+                f"{r['draws']}\t{r['losses']}\t{r['goals_for']} : {r['goals_against']}\t{r['goal_difference']}\t"
+                f"{r['points']}\t{ppt}\n"
+            )
+    return path
+
+
+def write_scorers(path: Path, n: int, clubs: Sequence[str], seed: int = 0) -> Path:
+    """``n`` scorer rows in ``top_1000_scorers.csv`` layout, ordered by goals."""
+    rng = np.random.default_rng(seed + 1)
+    goals = np.sort(rng.geometric(0.18, n))[::-1]
+    matches = goals + rng.integers(2, 40, n)
+    sub_on = rng.binomial(matches, 0.15)
+    sub_off = rng.binomial(matches, 0.3)
+    assists = rng.binomial(matches, 0.1)
+    penalties = rng.binomial(goals, 0.12)
+    club_pick = rng.integers(0, len(clubs), n)
+    multi = rng.random(n) < 0.1
+    missing = rng.random((n, 3)) < 0.08
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(SCORERS_HEADER)
+        for i in range(n):
+            club = f"for {2 + i % 3} clubs" if multi[i] else clubs[club_pick[i]]
+            if not multi[i] and i % 7 == 3:
+                club = club.split(" (")[0]  # defunct suffix dropped, as in the real list
+            writer.writerow([
+                i + 1, f"{_FIRST[i % len(_FIRST)]} {_LAST[(i // len(_FIRST)) % len(_LAST)]} {i}",
+                _POSITIONS[i % len(_POSITIONS)], club, _NATIONS[(i * 7) % len(_NATIONS)],
+                18 + i % 22, 1 + i % 12, matches[i],
+                "-" if missing[i, 0] else sub_on[i], "-" if missing[i, 1] else sub_off[i],
+                "-" if missing[i, 2] else assists[i], penalties[i], goals[i],
+            ])
+    return path
+
+
+def xi_database(n: int, seed: int = 0) -> dict:
+    """``n`` starting XIs in the ``diverse_english_xis.json`` schema."""
+    rng = np.random.default_rng(seed + 2)
+    n_teams = max(24, n // 3)
+    squad = 28
+    surnames = [f"{_LAST[i % len(_LAST)]}{i // len(_LAST) or ''}" for i in range(n_teams * squad)]
+    xis = []
+    formations = list(_FORMATIONS)
+    for i in range(n):
+        team = int(rng.integers(n_teams))
+        formation = formations[int(rng.integers(len(formations)))]
+        picks = team * squad + rng.choice(squad, 11, replace=False)
+        players = []
+        for slot, (player, (top, left)) in enumerate(zip(picks.tolist(), _FORMATIONS[formation])):
+            name = surnames[player]
+            if len(name) > 11:
+                name = name[:10] + "."  # Transfermarkt truncates long names
+            players.append({"name": name, "number": str(1 + (player + slot) % 40), "id": str(100000 + player),
+                            "position_top": top, "position_left": left})
+        xis.append({
+            "team": f"{_STEMS[team % len(_STEMS)]} Town {team}", "formation": formation, "match_id": 3000000 + i,
+            "players": players, "season": "30/XX", "league": _LEAGUES[team % len(_LEAGUES)],
+            "season_year": 2010 + int(rng.integers(16)), "matchday": 1 + int(rng.integers(46)),
+        })
+    return {"metadata": {"total_xis": n, "total_players": 11 * n, "description": "Synthetic benchmark XIs"},
+            "starting_xis": xis}
+
+
+def write_xis(path: Path, n: int, seed: int = 0) -> Path:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(xi_database(n, seed), f, ensure_ascii=False)
+    return path
@@ -0,0 +1,3 @@
+"""UEFA Champions League Qualifying statistics and quiz generator."""
+
+__version__ = "0.1.0"
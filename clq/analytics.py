@@ -0,0 +1,185 @@
+"""Typed pandas view of the scorer list, with vectorized, disk-cached aggregates.
+
+:func:`load_scorer_frame` reads ``top_1000_scorers.csv`` with explicit
+dtypes: categoricals for position, nationality and club, nullable integers
+for every count (the export writes ``-`` for "not recorded", which becomes
+``<NA>`` rather than turning the column into strings or floats). Rows for
+players who scored "for N clubs" keep no club (``<NA>``) and carry
+``club_count = N``; everyone else has ``club_count = 1``. Repeated rows are
+dropped, as in :func:`clq.sources.iter_scorers`.
+
+:func:`aggregates` computes the rates and rollups used by the analysis
+script and dashboards: goals per match, penalty share, and per-nationality,
+per-position and per-club totals. Ratios that involve a ``-`` field only
+count the rows where that field is recorded, so a missing penalty count is
+not read as zero.
+
+:func:`cached_aggregates` memoizes the result in ``scorer_aggregates.cache``
+next to the CSV, keyed by the CSV's SHA-256, so they are recomputed only
+when the file's content changes.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from typing import Dict, Optional
+
+import pandas as pd
+
+from . import sources
+
+VERSION = 1
+CACHE_FILE = "scorer_aggregates.cache"
+ROLLUPS = ("nationality", "position", "club")
+
+SCORER_DTYPES = {
+    "rank": "Int32",
+    "player": "string",
+    "position": "category",
+    "club": "category",
+    "nationality": "category",
+    "age": "Int16",
+    "seasons": "Int16",
+    "matches": "Int32",
+    "sub_on": "Int32",
+    "sub_off": "Int32",
+    "assists": "Int32",
+    "penalties": "Int32",
+    "goals": "Int32",
+}
+_MULTI_CLUB = r"^for (\d+) clubs$"
+
+
+def load_scorer_frame(path: Optional[Path] = None) -> pd.DataFrame:
+    """The scorer list as a typed frame, one row per distinct scorer record."""
+    path = path or sources.scorers_path()
+    header = pd.read_csv(path, nrows=0).columns
+    if tuple(header) != sources.SCORERS_HEADER:
+        raise ValueError(f"unexpected scorer CSV header: {tuple(header)!r}")
+    # The C parser reads numbers with missing values fastest as floats; they
+    # are converted to the nullable integer dtypes afterwards.
+    frame = pd.read_csv(
+        path,
+        header=0,
+        names=list(sources.SCORER_COLUMNS),
+        dtype={name: ("float64" if dtype.startswith("Int") else dtype) for name, dtype in SCORER_DTYPES.items()},
+        na_values=[sources.MISSING],
+        keep_default_na=False,
+    )
+    frame = frame.drop_duplicates(ignore_index=True)
+    frame = frame.astype({name: dtype for name, dtype in SCORER_DTYPES.items() if dtype.startswith("Int")})
+
+    counts = frame["club"].str.extract(_MULTI_CLUB, expand=False)
+    frame["club_count"] = counts.astype("Int8").fillna(1)
+    frame["club"] = frame["club"].mask(counts.notna()).cat.remove_unused_categories()
+    return frame
+
+
+def _ratio(numerator: pd.Series, denominator: pd.Series) -> pd.Series:
+    """Float ratio, ``<NA>`` where either side is missing or the denominator is 0."""
+    numerator = numerator.astype("Float64")
+    denominator = denominator.astype("Float64")
+    return (numerator / denominator.mask(denominator == 0)).astype("Float64")
+
+
+def with_rates(frame: pd.DataFrame) -> pd.DataFrame:
+    """``frame`` plus per-player ``goals_per_match`` and ``penalty_share``."""
+    return frame.assign(
+        goals_per_match=_ratio(frame["goals"], frame["matches"]),
+        penalty_share=_ratio(frame["penalties"], frame["goals"]),
+    )
+
+
+def rollup(frame: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Totals and rates per ``by`` value, most goals first.
+
+    ``penalty_share`` divides penalties by the goals of the rows whose
+    penalty count is recorded; ``goals_per_match`` is over all rows.
+    """
+    known = frame["penalties"].notna()
+    work = pd.DataFrame({
+        by: frame[by],
+        "goals": frame["goals"],
+        "matches": frame["matches"],
+        "assists": frame["assists"],
+        "penalties": frame["penalties"],
+        "goals_with_penalties": frame["goals"].where(known),
+    })
+    grouped = work.groupby(by, observed=True, sort=False)
+    table = grouped.sum(min_count=1)
+    table.insert(0, "players", grouped.size())
+    table["goals_per_match"] = _ratio(table["goals"], table["matches"])
+    table["goals_per_player"] = _ratio(table["goals"], table["players"])
+    table["penalty_share"] = _ratio(table["penalties"], table.pop("goals_with_penalties"))
+    return table.sort_values(["goals", "players"], ascending=False, kind="stable")
+
+
+def summary(frame: pd.DataFrame) -> Dict[str, object]:
+    known = frame["penalties"].notna()
+    goals = int(frame["goals"].sum())
+    matches = int(frame["matches"].sum())
+    penalty_goals = int(frame["goals"][known].sum())
+    return {
+        "players": len(frame),
+        "goals": goals,
+        "matches": matches,
+        "goals_per_match": goals / matches if matches else None,
+        "penalty_share": int(frame["penalties"].sum()) / penalty_goals if penalty_goals else None,
+        "multi_club_players": int((frame["club_count"] > 1).sum()),
+        "missing": {name: int(frame[name].isna().sum()) for name in ("age", "sub_on", "sub_off", "assists", "penalties")},
+    }
+
+
+def aggregates(frame: pd.DataFrame) -> Dict[str, object]:
+    """Per-player rates, the per-group rollups and an overall summary."""
+    rates = with_rates(frame)
+    result: Dict[str, object] = {
+        "summary": summary(frame),
+        "players": rates[["player", "position", "club", "nationality", "age", "matches", "goals",
+                          "goals_per_match", "penalty_share"]],
+    }
+    for by in ROLLUPS:
+        result[by] = rollup(frame, by)
+    return result
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write(path: Path, cache: dict) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only data directory only costs a recomputation per process.
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def cached_aggregates(path: Optional[Path] = None, cache_dir: Optional[Path] = None) -> Dict[str, object]:
+    """:func:`aggregates` of the scorer CSV, recomputed only when its content changes."""
+    path = Path(path or sources.scorers_path())
+    cache_path = Path(cache_dir or path.parent) / CACHE_FILE
+    key = {"version": VERSION, "sha256": file_digest(path), "pandas": pd.__version__}
+    try:
+        with open(cache_path, "rb") as f:
+            cache = pickle.load(f)
+        if cache.get("key") == key:
+            return cache["aggregates"]
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, TypeError, ValueError):
+        pass
+    result = aggregates(load_scorer_frame(path))
+    _write(cache_path, {"key": key, "aggregates": result})
+    return result
@@ -0,0 +1,336 @@
+"""Batch ingestion of several competition tables into one club-keyed store.
+
+The Champions League, Europa League and Conference League qualifying tables
+share the export format parsed by :mod:`clq.ingest`. :func:`ingest_batch`
+takes a list of :class:`Source` (from a directory of ``*.tsv`` exports or a
+JSON manifest, see :func:`find_sources`), parses them in a process pool and
+merges them into a single :mod:`clq.store` file:
+
+* clubs are identified across competitions by a
+  :class:`~clq.resolve.ClubResolver` over the clubs of the earlier sources
+  (exact name, then :func:`~clq.resolve.club_key` with accents, affixes and
+  defunct-year suffixes folded, then trigram similarity), and each identity
+  gets a ``club_id``. The display name is the spelling of the first source
+  that lists the club. Two clubs of one competition never share an
+  identity: when a second one resolves to a club already matched in that
+  competition, or folds to the same key as another new club, it gets its
+  own identity and is reported as a :class:`Collision`;
+* rows are grouped into contiguous partitions, one per competition in
+  source order, followed by the ``"all"`` partition holding every club's
+  combined totals (ranked by points, then goal difference, then goals
+  scored; points per tournament recomputed). The partitions' row ranges are
+  recorded in the store's meta, so :class:`MergedTable` slices one without
+  scanning the others.
+
+Every row has the table's columns plus ``competition``, ``club_id`` and
+``club_key``, so any partition reads like a single table.
+
+Parsed exports are cached by the SHA-256 of their content and a
+fingerprint of the parser (:func:`parser_fingerprint`) in ``.ingest-cache``
+next to the output: rerunning a batch only parses the exports that changed
+(all of them after a parser change), and hashing is the only per-file work
+for the rest.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from . import ingest
+from .ingest import FIELDS, IngestStats, iter_records
+from .resolve import DEFAULT_THRESHOLD, ClubResolver, club_key
+from .store import Store, write_store
+
+VERSION = 1
+COMBINED = "all"
+CACHE_DIR = ".ingest-cache"
+# Columns summed into the combined totals.
+TOTAL_COLUMNS = ("participations", "matches", "wins", "draws", "losses", "goals_for", "goals_against",
+                 "goal_difference", "points")
+
+
+class Source(NamedTuple):
+    competition: str
+    path: Path
+
+
+class Parsed(NamedTuple):
+    records: List[dict]
+    rejected: List[dict]
+    skipped: int
+
+
+class Collision(NamedTuple):
+    """A club kept apart from the identity it resolved to, because another
+    club of the same competition already holds it."""
+
+    competition: str
+    club: str
+    other: str  # the club of the same competition holding the identity
+    method: str  # how ``club`` matched it: "exact", "key" or "fuzzy"
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+class SourceReport(NamedTuple):
+    competition: str
+    path: str
+    sha256: str
+    rows: int
+    rejected: int
+    cached: bool
+    collisions: List[dict]
+
+
+def find_sources(location: Path) -> List[Source]:
+    """Sources from a directory (every ``*.tsv``, named by file stem) or a JSON manifest.
+
+    A manifest is a list of ``{"competition": ..., "path": ...}`` objects;
+    relative paths are resolved against the manifest's directory.
+    """
+    location = Path(location)
+    if location.is_dir():
+        return [Source(path.stem, path) for path in sorted(location.glob("*.tsv"))]
+    with open(location, encoding="utf-8") as f:
+        entries = json.load(f)
+    sources = []
+    for entry in entries:
+        path = Path(entry["path"])
+        sources.append(Source(entry.get("competition") or path.stem, path if path.is_absolute() else location.parent / path))
+    return sources
+
+
+def file_digest(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def parser_fingerprint() -> str:
+    """Hash of :data:`VERSION`, the parsed ``FIELDS`` and the source of :mod:`clq.ingest`."""
+    digest = hashlib.sha256(f"{VERSION}\0{','.join(FIELDS)}\0".encode("utf-8"))
+    with open(ingest.__file__, "rb") as f:
+        digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+def parse_export(path: Path) -> Parsed:
+    """Records, rejected lines and the skipped-line count of one export."""
+    stats = IngestStats()
+    rejected: List[dict] = []
+    with open(path, encoding="utf-8", newline="") as f:
+        records = list(iter_records(f, on_reject=lambda r: rejected.append(r.to_dict()), stats=stats))
+    return Parsed(records, rejected, stats.skipped)
+
+
+class ParseCache:
+    """Parsed exports stored as JSON under the SHA-256 of the export and the parser fingerprint."""
+
+    def __init__(self, root: Path, parser: Optional[str] = None):
+        self.root = Path(root)
+        self.parser = parser or parser_fingerprint()
+
+    def _path(self, digest: str) -> Path:
+        return self.root / f"{digest}-{self.parser}.json"
+
+    def get(self, digest: str) -> Optional[Parsed]:
+        try:
+            with open(self._path(digest), encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get("version") != VERSION:
+            return None
+        return Parsed(data["records"], data["rejected"], data["skipped"])
+
+    def put(self, digest: str, parsed: Parsed) -> None:
+        data = {"version": VERSION, **parsed._asdict()}
+        try:
+            self.root.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=digest, suffix=".tmp", dir=self.root)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp, self._path(digest))
+        except OSError:
+            pass  # an unwritable cache only costs a reparse next time
+
+
+def parse_all(paths: Sequence[Path], cache: Optional[ParseCache] = None, workers: int = 1):
+    """``(digests, parsed, cached)`` for ``paths``; uncached exports are parsed in a pool."""
+    digests = [file_digest(path) for path in paths]
+    parsed: List[Optional[Parsed]] = [cache.get(d) if cache is not None else None for d in digests]
+    cached = [p is not None for p in parsed]
+    # Identical exports listed twice are parsed once.
+    todo = {d: path for d, path, p in zip(digests, paths, parsed) if p is None}
+    if workers > 1 and len(todo) > 1:
+        with ProcessPoolExecutor(min(workers, len(todo))) as pool:
+            results = dict(zip(todo, pool.map(parse_export, todo.values())))
+    else:
+        results = {d: parse_export(path) for d, path in todo.items()}
+    for digest, result in results.items():
+        if cache is not None:
+            cache.put(digest, result)
+    parsed = [p if p is not None else results[d] for p, d in zip(parsed, digests)]
+    return digests, parsed, cached
+
+
+def _half_up(values: np.ndarray) -> np.ndarray:
+    return np.floor(values * 100 + 0.5) / 100
+
+
+def identify(partitions: Sequence[tuple], threshold: float = DEFAULT_THRESHOLD) -> tuple:
+    """``(club_ids, names, collisions)``: an identity per row of the
+    ``(competition, records)`` pairs, each identity's display name, and the
+    clubs kept apart from the identity they resolved to."""
+    names: List[str] = []
+    club_ids: List[int] = []
+    collisions: List[Collision] = []
+    for competition, records in partitions:
+        # Resolve against the clubs of the earlier competitions only.
+        resolver = ClubResolver(names, threshold)
+        holder: Dict[int, str] = {}
+        new_keys: Dict[str, str] = {}
+        for record in records:
+            club = record["club"]
+            match = resolver.resolve(club)
+            if match is not None and match.index in holder:
+                collisions.append(Collision(competition, club, holder[match.index], match.method))
+                match = None
+            if match is None:
+                key = club_key(club)
+                if key in new_keys:
+                    collisions.append(Collision(competition, club, new_keys[key], "key"))
+                else:
+                    new_keys[key] = club
+                identity = len(names)
+                names.append(club)
+            else:
+                identity = match.index
+            holder[identity] = club
+            club_ids.append(identity)
+    return club_ids, names, collisions
+
+
+def merge(partitions: Sequence[tuple], threshold: float = DEFAULT_THRESHOLD) -> tuple:
+    """Columns, partition ranges, club count and collisions for ``(competition, records)`` pairs."""
+    club_ids, names, collisions = identify(partitions, threshold)
+    competition: List[str] = []
+    columns: Dict[str, list] = {name: [] for name in FIELDS}
+    ranges = []
+    start = 0
+    for name, records in partitions:
+        competition.extend([name] * len(records))
+        for field in FIELDS:
+            columns[field].extend([record[field] for record in records])
+        ranges.append({"competition": name, "start": start, "stop": start + len(records)})
+        start += len(records)
+
+    n_clubs = len(names)
+    club_of = np.array(club_ids, dtype=np.int64)
+    totals = {
+        field: np.bincount(club_of, weights=np.array(columns[field], dtype=np.float64), minlength=n_clubs).astype(np.int64)
+        for field in TOTAL_COLUMNS
+    }
+    order = np.lexsort((np.arange(n_clubs), -totals["goals_for"], -totals["goal_difference"], -totals["points"]))
+    participations = totals["participations"][order]
+    ppt = np.full(n_clubs, np.nan)
+    np.divide(totals["points"][order], participations, out=ppt, where=participations > 0)
+    ranges.append({"competition": COMBINED, "start": len(club_ids), "stop": len(club_ids) + n_clubs})
+
+    keys = [club_key(name) for name in names]
+    out: Dict[str, object] = {
+        "competition": competition + [COMBINED] * n_clubs,
+        "club_id": np.concatenate([club_of, order]).astype(np.int32),
+        "club_key": [keys[i] for i in club_ids] + [keys[i] for i in order.tolist()],
+    }
+    for field in FIELDS:
+        if field == "club":
+            out[field] = columns[field] + [names[i] for i in order.tolist()]
+        elif field == "rank":
+            out[field] = np.concatenate([np.array(columns[field], dtype=np.int32), np.arange(1, n_clubs + 1, dtype=np.int32)])
+        elif field == "points_per_tournament":
+            published = np.array([np.nan if v is None else v for v in columns[field]], dtype=np.float64)
+            out[field] = np.concatenate([published, _half_up(ppt)])
+        else:
+            out[field] = np.concatenate([np.array(columns[field], dtype=np.int32), totals[field][order].astype(np.int32)])
+    return out, ranges, n_clubs, collisions
+
+
+def ingest_batch(sources: Sequence[Source], output: Path, workers: int = 1, cache_dir: Optional[Path] = None) -> List[SourceReport]:
+    """Parse ``sources``, merge them and write the store to ``output``."""
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    cache = ParseCache(cache_dir or output.parent / CACHE_DIR)
+    names = [source.competition for source in sources]
+    clashes = {name for name in names if names.count(name) > 1 or name == COMBINED}
+    if clashes:
+        raise ValueError(f"competition names must be unique and not {COMBINED!r}: {', '.join(sorted(clashes))}")
+
+    digests, parsed, cached = parse_all([source.path for source in sources], cache, workers)
+    columns, ranges, n_clubs, collisions = merge([(s.competition, p.records) for s, p in zip(sources, parsed)])
+    reports = [
+        SourceReport(s.competition, str(s.path), d, len(p.records), len(p.rejected), c,
+                     [x.to_dict() for x in collisions if x.competition == s.competition])
+        for s, d, p, c in zip(sources, digests, parsed, cached)
+    ]
+    meta = {
+        "dataset": "clq_merged",
+        "version": VERSION,
+        "rows": len(columns["club_id"]),
+        "clubs": n_clubs,
+        "partitions": ranges,
+        "sources": [r._asdict() for r in reports],
+    }
+    write_store(output, columns, meta)
+    return reports
+
+
+class MergedTable:
+    """Partition and club access over a store written by :func:`ingest_batch`."""
+
+    def __init__(self, store: Store):
+        self.store = store
+        self.partitions = {p["competition"]: (p["start"], p["stop"]) for p in store.meta["partitions"]}
+        self._resolver: Optional[ClubResolver] = None
+
+    @classmethod
+    def open(cls, path: Path) -> "MergedTable":
+        return cls(Store.open(path))
+
+    def close(self) -> None:
+        self.store.close()
+
+    @property
+    def competitions(self) -> List[str]:
+        return [name for name in self.partitions if name != COMBINED]
+
+    def rows(self, competition: str = COMBINED) -> List[dict]:
+        start, stop = self.partitions[competition]
+        return [self.store.row(i) for i in range(start, stop)]
+
+    def club(self, name: str) -> Dict[str, dict]:
+        """The club's row in every partition that lists it, by competition."""
+        start, stop = self.partitions[COMBINED]
+        if self._resolver is None:
+            self._resolver = ClubResolver(self.store.text("club")[start:stop])
+        match = self._resolver.resolve(name)
+        if match is None:
+            return {}
+        club_ids = self.store.column("club_id")
+        found = {}
+        for row in np.flatnonzero(club_ids == club_ids[start + match.index]):
+            record = self.store.row(int(row))
+            found[record["competition"]] = record
+        return found
+
@@ -0,0 +1,41 @@
+"""Entry point for the ``clq`` console script.
+
+Quiz bots shell out to ``clq club NAME`` thousands of times a day, so
+startup cost matters. A bare ``club``/``player`` lookup is answered straight
+from the lookup cache (:mod:`clq.lookup`) using only built-in modules;
+everything else goes through the click commands in :mod:`clq.commands`,
+which defer the query engine and NumPy to the commands that need them.
+Nothing on the CLI path imports pandas.
+"""
+
+import sys
+
+_FAST_COMMANDS = ("club", "player")
+
+
+def _fast_lookup(args) -> "int | None":
+    if len(args) != 2 or args[0] not in _FAST_COMMANDS or args[1].startswith("-"):
+        return None
+    from .format import COLUMNS, format_rows
+    from .lookup import find
+
+    rows = find(args[0], args[1])
+    if not rows:
+        # Let the full command try fuzzy resolution.
+        return None
+    print(format_rows(rows, COLUMNS[args[0]]))
+    return 0
+
+
+def main(argv=None):
+    args = sys.argv[1:] if argv is None else list(argv)
+    code = _fast_lookup(args)
+    if code is not None:
+        return code
+    from .commands import cli
+
+    return cli.main(args=args, prog_name="clq")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
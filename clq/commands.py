@@ -0,0 +1,246 @@
+"""Click commands behind the ``clq`` console script.
+
+Only click is imported at module level; the query engine (and with it
+NumPy) is imported inside the commands that need it, so ``clq --help`` and
+the lookup commands stay cheap.
+"""
+
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+import click
+
+from . import lookup
+from .format import CLUB_COLUMNS, SCORER_COLUMNS, columns_with, format_rows
+
+# Mirrors clq.query.CLUB_SORT_COLUMNS / SCORER_SORT_COLUMNS without importing
+# the query engine just to build the option choices.
+CLUB_SORT_COLUMNS = ("points", "points_per_tournament", "goal_difference", "matches", "participations", "goals_for")
+SCORER_SORT_COLUMNS = ("goals", "matches", "assists", "penalties")
+
+
+def _echo_rows(rows: List[dict], columns: Sequence[str]) -> bool:
+    if not rows:
+        click.echo("No matches.", err=True)
+        return False
+    click.echo(format_rows(rows, columns))
+    return True
+
+
+def _bounds(**named: Optional[float]) -> dict:
+    return {name: (value, None) for name, value in named.items() if value is not None}
+
+
+@click.group()
+@click.option("--data-dir", type=click.Path(file_okay=False), envvar="CLQ_DATA_DIR", help="Directory holding the CLQ JSON and scorer CSV.")
+@click.pass_context
+def cli(ctx, data_dir):
+    """UEFA Champions League Qualifying statistics."""
+    ctx.obj = {"data_dir": data_dir}
+
+
+def _engine(ctx):
+    from .query import QueryEngine
+
+    return QueryEngine.open(ctx.obj["data_dir"])
+
+
+@cli.command()
+@click.option("--by", type=click.Choice(CLUB_SORT_COLUMNS), default="points", show_default=True)
+@click.option("-k", "limit", type=int, default=10, show_default=True)
+@click.option("--min-participations", type=int)
+@click.option("--min-matches", type=int)
+@click.option("--asc", is_flag=True, help="Lowest values first.")
+@click.pass_context
+def top(ctx, by, limit, min_participations, min_matches, asc):
+    """Top clubs by a table column."""
+    clubs = _engine(ctx).clubs
+    ids = clubs.top(by, limit, where=_bounds(participations=min_participations, matches=min_matches), ascending=asc)
+    _echo_rows(clubs.rows(ids), columns_with(CLUB_COLUMNS, by))
+
+
+@cli.command(name="range")
+@click.option("--by", type=click.Choice(CLUB_SORT_COLUMNS), required=True)
+@click.option("--min", "lo", type=float)
+@click.option("--max", "hi", type=float)
+@click.option("-k", "limit", type=int, help="Show at most this many rows.")
+@click.pass_context
+def range_(ctx, by, lo, hi, limit):
+    """Clubs whose column value lies within [--min, --max]."""
+    clubs = _engine(ctx).clubs
+    ids = clubs.select({by: (lo, hi)}, order_by=by, ascending=False, limit=limit)
+    _echo_rows(clubs.rows(ids), columns_with(CLUB_COLUMNS, by))
+
+
+@cli.command()
+@click.argument("name")
+@click.pass_context
+def club(ctx, name):
+    """Look up a club's table row (accents, affixes and typos tolerated)."""
+    rows = lookup.find("club", name, ctx.obj["data_dir"]) or _engine(ctx).club(name)
+    if not _echo_rows(rows, CLUB_COLUMNS):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("name")
+@click.option("-k", "limit", type=int, default=5, show_default=True)
+@click.option("--radius", type=float, help="Every club within this distance instead of the k nearest.")
+@click.pass_context
+def similar(ctx, name, limit, radius):
+    """Clubs whose CLQ records are most like NAME's (rates, goals, points per tournament)."""
+    from .similar import ClubIndex
+
+    relation = _engine(ctx).clubs
+    index = ClubIndex.from_relation(relation)
+    try:
+        found = index.within(name, radius) if radius is not None else index.similar(name, limit)
+    except KeyError as exc:
+        click.echo(exc.args[0], err=True)
+        ctx.exit(1)
+    rows = [{**row, "distance": n.distance} for row, n in zip(relation.rows([n.index for n in found]), found)]
+    _echo_rows(rows, columns_with(CLUB_COLUMNS, "distance"))
+
+
+@cli.command()
+@click.option("--by", type=click.Choice(SCORER_SORT_COLUMNS), default="goals", show_default=True)
+@click.option("-k", "limit", type=int, default=10, show_default=True)
+@click.option("--min-matches", type=int)
+@click.option("--club", "club_name", help="Only scorers listed for this club.")
+@click.option("--nationality")
+@click.pass_context
+def scorers(ctx, by, limit, min_matches, club_name, nationality):
+    """Top scorers by a scorer column."""
+    relation = _engine(ctx).scorers
+    where = _bounds(matches=min_matches)
+    match = {name: value for name, value in (("club", club_name), ("nationality", nationality)) if value}
+    if match:
+        ids = relation.select(where, match=match, order_by=by, ascending=False, limit=limit)
+    else:
+        ids = relation.top(by, limit, where=where)
+    _echo_rows(relation.rows(ids), columns_with(SCORER_COLUMNS, by))
+
+
+@cli.command()
+@click.argument("name")
+@click.pass_context
+def player(ctx, name):
+    """Look up a scorer."""
+    if not _echo_rows(lookup.find("player", name, ctx.obj["data_dir"]), SCORER_COLUMNS):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.option("-n", "count", type=int, default=100, show_default=True, help="Number of distinct questions.")
+@click.option("--seed", type=int, default=0, show_default=True)
+@click.option("--workers", type=int, default=1, show_default=True, help="Worker processes.")
+@click.option("-o", "--output", type=click.File("w", encoding="utf-8"), default="-", help="JSON Lines output file.")
+@click.pass_context
+def quiz(ctx, count, seed, workers, output):
+    """Generate a batch of quiz questions as JSON Lines."""
+    import json
+
+    from .quiz import generate
+
+    for question in generate(count, seed=seed, workers=workers, data_dir=ctx.obj["data_dir"]):
+        output.write(json.dumps(question, ensure_ascii=False) + "\n")
+
+
+@cli.command()
+@click.argument("results", type=click.File("r", encoding="utf-8"))
+@click.option("-o", "--output", type=click.File("w", encoding="utf-8"), default="-", help="Updated table (JSON).")
+@click.option("--format", "fmt", type=click.Choice(("json", "jsonl")), default="json", show_default=True)
+@click.pass_context
+def update(ctx, results, output, fmt):
+    """Apply match results (CSV: club,opponent,goals_for,goals_against,season) to the table."""
+    import csv
+
+    from . import sources
+    from .live import LiveTable, MatchResult
+
+    table = LiveTable(sources.load_table(sources.table_path(ctx.obj["data_dir"])))
+    applied = table.apply_many(
+        MatchResult(r["club"], r["opponent"], int(r["goals_for"]), int(r["goals_against"]), r["season"])
+        for r in csv.DictReader(results)
+    )
+    table.write(output, fmt)
+    click.echo(f"Applied {applied} results to {len(table)} clubs.", err=True)
+
+
+@cli.command()
+@click.option("--host", default="127.0.0.1", show_default=True)
+@click.option("--port", type=int, default=8765, show_default=True)
+@click.option("--xis", "xis_path", type=click.Path(dir_okay=False), help="Starting-XI database (default: diverse_english_xis.json).")
+@click.option("--calendar", "calendar_path", type=click.Path(dir_okay=False), help="Puzzle calendar (default: puzzle_calendar.json).")
+@click.option("--cache-entries", type=int, default=4096, show_default=True, help="Responses kept in the LRU cache.")
+@click.option("--reload-interval", type=float, default=2.0, show_default=True, help="Seconds between source file checks; 0 disables reloading.")
+@click.pass_context
+def serve(ctx, host, port, xis_path, calendar_path, cache_entries, reload_interval):
+    """Serve puzzles, club and scorer lookups and quiz batches as JSON over HTTP."""
+    import asyncio
+
+    from .server import App
+    from .server import serve as run_server
+
+    app = App(ctx.obj["data_dir"], xis_path, calendar_path, cache_entries)
+    try:
+        asyncio.run(run_server(app, host, port, reload_interval,
+                               ready=lambda bound: click.echo(f"Serving on http://{host}:{bound}/", err=True)))
+    except KeyboardInterrupt:
+        pass
+
+
+@cli.command()
+@click.option("--table", "table_path", type=click.Path(exists=True, dir_okay=False), help="Table JSON, JSON Lines or store (default: the data directory's table).")
+@click.option("--scorers", "scorers_path", type=click.Path(exists=True, dir_okay=False), help="Scorer CSV or store (default: the data directory's scorer list).")
+@click.option("--json", "as_json", is_flag=True, help="Print the reports as JSON.")
+@click.pass_context
+def validate(ctx, table_path, scorers_path, as_json):
+    """Check the table and scorer list for internally inconsistent rows."""
+    import json
+
+    from . import sources
+    from .validate import validate_scorers, validate_table
+
+    data_dir = ctx.obj["data_dir"]
+    reports = [
+        validate_table(table_path or sources.table_path(data_dir)),
+        validate_scorers(scorers_path or sources.scorers_path(data_dir)),
+    ]
+    if as_json:
+        click.echo(json.dumps([r.to_dict() for r in reports], indent=2, ensure_ascii=False))
+    else:
+        for report in reports:
+            click.echo(report.format())
+    if not all(r.ok for r in reports):
+        ctx.exit(1)
+
+
+@cli.command()
+@click.argument("source", type=click.Path(exists=True))
+@click.option("-o", "--output", type=click.Path(dir_okay=False), default="data/clq_merged.clqs", show_default=True)
+@click.option("--workers", type=int, help="Parser processes (default: one per CPU).")
+@click.option("--cache-dir", type=click.Path(file_okay=False), help="Parsed-export cache (default: .ingest-cache next to the output).")
+@click.pass_context
+def ingest(ctx, source, output, workers, cache_dir):
+    """Parse a directory of table exports (or a JSON manifest) into one club-keyed store."""
+    import os
+    import time
+
+    from .batch import find_sources, ingest_batch
+
+    started = time.perf_counter()
+    sources = find_sources(source)
+    if not sources:
+        raise click.UsageError(f"no *.tsv exports in {source}")
+    reports = ingest_batch(sources, output, workers or os.cpu_count() or 1, cache_dir)
+    for r in reports:
+        click.echo(f"{r.competition:<24} {r.rows:>7} rows  {r.rejected:>4} rejected  {'cached' if r.cached else 'parsed'}", err=True)
+        for c in r.collisions:
+            click.echo(f"  warning: {c['club']!r} matches {c['other']!r} ({c['method']}); kept as a separate club", err=True)
+    rejected = sum(r.rejected for r in reports)
+    click.echo(f"Merged {len(reports)} competitions into {output} in {time.perf_counter() - started:.2f}s"
+               f" ({rejected} rejected rows).", err=True)
+    if rejected:
+        ctx.exit(1)
@@ -0,0 +1,24 @@
+"""Plain-text rendering of result rows, shared by every CLI code path."""
+
+CLUB_COLUMNS = ("rank", "club", "participations", "matches", "wins", "draws", "losses", "goal_difference", "points", "points_per_tournament")
+SCORER_COLUMNS = ("rank", "player", "position", "club", "nationality", "matches", "penalties", "goals")
+COLUMNS = {"club": CLUB_COLUMNS, "player": SCORER_COLUMNS}
+
+
+def format_value(value) -> str:
+    if value is None:
+        return "-"
+    if isinstance(value, float):
+        return f"{value:.2f}"
+    return str(value)
+
+
+def format_rows(rows: list, columns) -> str:
+    """Left-aligned columns with a header line."""
+    table = [list(columns)] + [[format_value(row[c]) for c in columns] for row in rows]
+    widths = [max(len(line[i]) for line in table) for i in range(len(columns))]
+    return "\n".join("  ".join(cell.ljust(width) for cell, width in zip(line, widths)).rstrip() for line in table)
+
+
+def columns_with(base, extra: str):
+    return base if extra in base else (*base, extra)
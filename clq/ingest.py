@@ -0,0 +1,211 @@
+"""Streaming parser for tab-delimited CLQ table exports.
+
+An export row looks like::
+
+    1<TAB>GNK Dinamo Zagreb<TAB>GNK Dinamo Zagreb<TAB>24<TAB>108<TAB>61<TAB>24<TAB>23<TAB>203 : 107<TAB>96<TAB>207<TAB>8.63
+
+The club name is repeated (display name and link text), goals are a single
+``for : against`` cell and the trailing points-per-tournament cell may be
+empty or missing altogether. Rows are tokenized by column position rather
+than by a regular expression over the club name, so any character is allowed
+in a club name and nothing is dropped silently: a line that starts with a
+rank but cannot be parsed is reported as rejected.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from json.encoder import encode_basestring_ascii as _encode_string
+from typing import IO, Callable, Iterable, Iterator, Optional
+
+FIELDS = (
+    "rank",
+    "club",
+    "participations",
+    "matches",
+    "wins",
+    "draws",
+    "losses",
+    "goals_for",
+    "goals_against",
+    "goal_difference",
+    "points",
+    "points_per_tournament",
+)
+
+FORMATS = ("json", "jsonl")
+
+# Export columns: rank, club, club (again), participations, matches, W, D, L,
+# goals, GD, points, points per tournament (optional).
+_MIN_COLUMNS = 11
+_MAX_COLUMNS = 12
+
+
+@dataclass
+class Rejected:
+    """A line that looked like a table row but could not be parsed."""
+
+    line_no: int
+    line: str
+    reason: str
+
+    def to_dict(self) -> dict:
+        return {"line_no": self.line_no, "line": self.line, "reason": self.reason}
+
+
+@dataclass
+class IngestStats:
+    rows: int = 0
+    rejected: int = 0
+    skipped: int = 0
+
+
+def parse_row(line: str) -> dict:
+    """Parse one export line into a record, raising ``ValueError`` on bad input."""
+    cells = line.rstrip("\r\n").split("\t")
+    if not _MIN_COLUMNS <= len(cells) <= _MAX_COLUMNS:
+        raise ValueError(f"expected {_MIN_COLUMNS}-{_MAX_COLUMNS} columns, got {len(cells)}")
+
+    club = cells[1].strip()
+    if not club:
+        raise ValueError("empty club name")
+
+    goals_for, sep, goals_against = cells[8].partition(":")
+    if not sep:
+        raise ValueError(f"goals cell {cells[8]!r} is not 'for : against'")
+
+    ppt = cells[11].strip() if len(cells) == _MAX_COLUMNS else ""
+
+    return {
+        "rank": int(cells[0]),
+        "club": club,
+        "participations": int(cells[3]),
+        "matches": int(cells[4]),
+        "wins": int(cells[5]),
+        "draws": int(cells[6]),
+        "losses": int(cells[7]),
+        "goals_for": int(goals_for),
+        "goals_against": int(goals_against),
+        "goal_difference": int(cells[9]),
+        "points": int(cells[10]),
+        "points_per_tournament": float(ppt) if ppt else None,
+    }
+
+
+def _is_candidate(line: str) -> bool:
+    # Header fragments and blank lines never start with a rank.
+    return line[:1].isdigit()
+
+
+def iter_records(
+    lines: Iterable[str],
+    on_reject: Optional[Callable[[Rejected], None]] = None,
+    stats: Optional[IngestStats] = None,
+) -> Iterator[dict]:
+    """Yield records from export lines one at a time.
+
+    Lines that do not start with a rank (the export's multi-line header, blank
+    lines) are skipped. Lines that start with a rank but fail to parse are
+    passed to ``on_reject`` and counted in ``stats``.
+    """
+    if stats is None:
+        stats = IngestStats()
+    for line_no, line in enumerate(lines, 1):
+        if not _is_candidate(line):
+            stats.skipped += 1
+            continue
+        try:
+            record = parse_row(line)
+        except ValueError as exc:
+            stats.rejected += 1
+            if on_reject is not None:
+                on_reject(Rejected(line_no, line.rstrip("\r\n"), str(exc)))
+            continue
+        stats.rows += 1
+        yield record
+
+
+def _template(indent: str, item_sep: str) -> str:
+    parts = [f'"{name}": %s' for name in FIELDS]
+    return "{" + indent + item_sep.join(parts) + indent[:-2] + "}"
+
+
+# Records have a fixed shape, so they are rendered through a format string
+# instead of the generic (and, with ``indent``, pure-Python) JSON encoder.
+# The output is identical to ``json.dumps`` with the matching settings.
+_JSONL_TEMPLATE = _template("", ", ")
+_ARRAY_TEMPLATE = _template("\n    ", ",\n    ")
+
+
+def _encode(record: dict, template: str) -> str:
+    ppt = record["points_per_tournament"]
+    return template % (
+        record["rank"],
+        _encode_string(record["club"]),
+        record["participations"],
+        record["matches"],
+        record["wins"],
+        record["draws"],
+        record["losses"],
+        record["goals_for"],
+        record["goals_against"],
+        record["goal_difference"],
+        record["points"],
+        "null" if ppt is None else repr(ppt),
+    )
+
+
+class JsonLinesWriter:
+    """Writes one JSON object per line."""
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+
+    def write(self, record: dict) -> None:
+        self.stream.write(_encode(record, _JSONL_TEMPLATE) + "\n")
+
+    def close(self) -> None:
+        pass
+
+
+class JsonArrayWriter:
+    """Writes a JSON array incrementally.
+
+    The output is byte-for-byte what ``json.dump(records, f, indent=2)`` would
+    produce, without holding the records in memory.
+    """
+
+    def __init__(self, stream: IO[str]):
+        self.stream = stream
+        self._first = True
+
+    def write(self, record: dict) -> None:
+        self.stream.write("[\n  " if self._first else ",\n  ")
+        self.stream.write(_encode(record, _ARRAY_TEMPLATE))
+        self._first = False
+
+    def close(self) -> None:
+        self.stream.write("[]" if self._first else "\n]")
+
+
+def make_writer(stream: IO[str], fmt: str = "json"):
+    if fmt == "json":
+        return JsonArrayWriter(stream)
+    if fmt == "jsonl":
+        return JsonLinesWriter(stream)
+    raise ValueError(f"unknown output format {fmt!r}, expected one of {FORMATS}")
+
+
+def ingest(
+    src: Iterable[str],
+    dst: IO[str],
+    fmt: str = "json",
+    on_reject: Optional[Callable[[Rejected], None]] = None,
+) -> IngestStats:
+    """Stream records from ``src`` lines to ``dst`` in the given format."""
+    stats = IngestStats()
+    writer = make_writer(dst, fmt)
+    for record in iter_records(src, on_reject=on_reject, stats=stats):
+        writer.write(record)
+    writer.close()
+    return stats
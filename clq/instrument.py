@@ -0,0 +1,294 @@
+"""Per-stage timing and memory instrumentation for the data pipeline scripts.
+
+A :class:`Profiler` collects one record per pipeline stage::
+
+    with Profiler.from_args("extract_clq_table", args) as profiler:
+        with profiler.stage("ingest") as stage:
+            stats = ingest(src, dst)
+            stage.rows = stats.rows
+            stage.count("rejected", stats.rejected)
+
+Each stage records wall and CPU seconds, rows and bytes (set by the caller)
+with their per-second rates, named counters, the process's peak RSS so far
+and, through :mod:`tracemalloc`, the peak and net Python allocations during
+the stage. Stages nest; a nested stage is reported as ``outer/inner``. When
+the run ends the report, with the allocation sites still holding the most
+memory, is written as JSON to the requested path (``-`` for stderr), and an
+optional :mod:`cProfile` dump of the whole run is saved to its own path. A
+run asked only for the dump collects no stages and leaves tracemalloc off.
+
+Profiling is switched on by the scripts' ``--profile`` / ``--profile-out
+PATH`` / ``--cprofile PATH`` options (see :func:`add_arguments`) or the
+``CLQ_PROFILE`` / ``CLQ_CPROFILE`` environment variables, so scheduled
+rebuilds can turn it on without changing their command lines. ``0``,
+``false`` or an empty value leave it off. A disabled profiler hands out one
+shared no-op stage and never imports or starts :mod:`tracemalloc` or
+:mod:`cProfile`, so the instrumented code paths cost a method call.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import json
+import os
+import platform
+import sys
+import time
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+ENV_VAR = "CLQ_PROFILE"
+CPROFILE_ENV_VAR = "CLQ_CPROFILE"
+# Environment values that switch profiling off, or on with the default output.
+_OFF = frozenset({"", "0", "false", "no", "off"})
+_ON = frozenset({"1", "true", "yes", "on"})
+# Allocation sites still holding memory at the end of a run, listed in the report.
+TOP_RETAINED = 10
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB, if the platform reports it."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak  # bytes on macOS
+
+
+def env_output(name: str, default: str) -> Optional[str]:
+    """Output path set by environment variable ``name``: ``None`` if unset or
+    off, ``default`` for ``1``/``true``, else the value itself."""
+    value = os.environ.get(name, "").strip()
+    if value.lower() in _OFF:
+        return None
+    if value.lower() in _ON:
+        return default
+    return value
+
+
+def _rate(amount: Optional[int], seconds: float) -> Optional[float]:
+    if amount is None or seconds <= 0:
+        return None
+    return round(amount / seconds, 1)
+
+
+class _NullStage:
+    """The stage handed out by a disabled profiler; accepts and drops everything."""
+
+    rows = None
+    bytes = None
+
+    def __setattr__(self, name, value) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+
+NULL_STAGE = _NullStage()
+
+
+class Stage:
+    """One timed stage; set ``rows`` and ``bytes`` and call :meth:`count` inside it."""
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.rows: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.counters: Dict[str, int] = {}
+        self.record: Optional[dict] = None
+        self._child_peak = 0
+
+    def count(self, name: str, n: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def __enter__(self) -> "Stage":
+        self.profiler._enter(self)
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        seconds = time.perf_counter() - self._start
+        cpu = time.process_time() - self._cpu
+        self.record = {
+            "stage": self.name,
+            "seconds": round(seconds, 6),
+            "cpu_seconds": round(cpu, 6),
+            "rows": self.rows,
+            "rows_per_second": _rate(self.rows, seconds),
+            "bytes": self.bytes,
+            "bytes_per_second": _rate(self.bytes, seconds),
+            "counters": self.counters,
+            "peak_rss_kb": peak_rss_kb(),
+        }
+        self.profiler._exit(self, failed=exc[0] is not None)
+
+
+class Profiler:
+    """Collects stage records for one run of a pipeline script."""
+
+    def __init__(
+        self,
+        run: str,
+        output: Optional[str] = None,
+        cprofile: Optional[str] = None,
+        enabled: bool = True,
+        trace_memory: bool = True,
+    ):
+        self.run = run
+        self.output = output
+        self.cprofile = cprofile
+        self.enabled = enabled
+        # Stages and allocations only feed the report; a cProfile-only run skips them.
+        self.reporting = enabled and output is not None
+        self.trace_memory = trace_memory and self.reporting
+        self.stages: List[dict] = []
+        self.counters: Dict[str, int] = {}
+        self._stack: List[Stage] = []
+        self._profile = None
+
+    @classmethod
+    def from_args(cls, run: str, args=None) -> "Profiler":
+        """A profiler configured by :func:`add_arguments` options, else the environment.
+
+        ``CLQ_PROFILE=1`` reports to stderr and ``CLQ_CPROFILE=1`` dumps to
+        ``<run>.prof``; any other value except ``0``/``false``/empty is the
+        output path. ``--cprofile`` alone saves the dump without collecting
+        stages or tracing memory.
+        """
+        output = getattr(args, "profile_out", None) or ("-" if getattr(args, "profile", False) else None)
+        output = output or env_output(ENV_VAR, "-")
+        cprofile = getattr(args, "cprofile", None) or env_output(CPROFILE_ENV_VAR, f"{run}.prof")
+        return cls(run, output, cprofile, enabled=bool(output or cprofile))
+
+    def stage(self, name: str):
+        if not self.reporting:
+            return NULL_STAGE
+        return Stage(self, name)
+
+    def count(self, name: str, n: int = 1) -> None:
+        if self.reporting:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def __enter__(self) -> "Profiler":
+        if not self.enabled:
+            return self
+        self._started = dt.datetime.now(dt.timezone.utc)
+        self._start = time.perf_counter()
+        self._cpu = time.process_time()
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        if self.cprofile:
+            import cProfile
+
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.enabled:
+            self.finish(failed=exc[0] is not None)
+
+    # Memory accounting across nested stages: tracemalloc keeps a single
+    # peak, so entering a stage folds the peak so far into the enclosing
+    # stage before resetting it, and leaving one passes its peak up.
+
+    def _traced(self):
+        import tracemalloc
+
+        return tracemalloc.get_traced_memory()
+
+    def _reset_peak(self) -> None:
+        import tracemalloc
+
+        if hasattr(tracemalloc, "reset_peak"):  # Python 3.9+
+            tracemalloc.reset_peak()
+
+    def _enter(self, stage: Stage) -> None:
+        if self._stack:
+            stage.name = f"{self._stack[-1].name}/{stage.name}"
+        if self.trace_memory:
+            current, peak = self._traced()
+            if self._stack:
+                parent = self._stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+            self._reset_peak()
+            stage._allocated = current
+        self._stack.append(stage)
+
+    def _exit(self, stage: Stage, failed: bool) -> None:
+        self._stack.pop()
+        if self.trace_memory:
+            current, peak = self._traced()
+            peak = max(peak, stage._child_peak)
+            stage.record["alloc_peak_bytes"] = peak - stage._allocated
+            stage.record["alloc_net_bytes"] = current - stage._allocated
+            if self._stack:
+                parent = self._stack[-1]
+                parent._child_peak = max(parent._child_peak, peak)
+        if failed:
+            stage.record["failed"] = True
+        self.stages.append(stage.record)
+
+    def report(self) -> dict:
+        return {
+            "run": self.run,
+            "started": self._started.isoformat(timespec="seconds"),
+            "seconds": round(time.perf_counter() - self._start, 6),
+            "cpu_seconds": round(time.process_time() - self._cpu, 6),
+            "peak_rss_kb": peak_rss_kb(),
+            "argv": sys.argv,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "counters": self.counters,
+            "stages": self.stages,
+        }
+
+    def finish(self, failed: bool = False) -> dict:
+        """Stop tracing, write the report and the cProfile dump, and return the report."""
+        if self._profile is not None:
+            self._profile.disable()
+        report = self.report()
+        if failed:
+            report["failed"] = True
+        if self.trace_memory:
+            import tracemalloc
+
+            _, report["alloc_peak_bytes"] = tracemalloc.get_traced_memory()
+            top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_RETAINED]
+            report["top_retained"] = [
+                {"site": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "bytes": s.size, "blocks": s.count}
+                for s in top
+            ]
+            tracemalloc.stop()
+        if self._profile is not None:
+            self._profile.dump_stats(self.cprofile)
+            report["cprofile"] = self.cprofile
+        if self.output == "-":
+            print(json.dumps(report, indent=2), file=sys.stderr)
+        elif self.output:
+            with open(self.output, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+                f.write("\n")
+        return report
+
+
+def add_arguments(parser) -> None:
+    """Add ``--profile``, ``--profile-out`` and ``--cprofile`` to an :mod:`argparse` parser."""
+    parser.add_argument("--profile", action="store_true",
+                        help=f"report per-stage timings and memory as JSON on stderr; also ${ENV_VAR}")
+    parser.add_argument("--profile-out", metavar="PATH", help="write the --profile report to PATH instead")
+    parser.add_argument("--cprofile", metavar="PATH", help=f"save a cProfile dump of the run; also ${CPROFILE_ENV_VAR}")
@@ -0,0 +1,287 @@
+"""Incremental maintenance of the CLQ table as qualifying results arrive.
+
+:class:`LiveTable` applies individual match results to the table in place:
+both clubs' W/D/L, goals, goal difference, points, participations and
+points per tournament are updated, and each club's position is kept in an
+order-statistic treap (:class:`RankedSet`), so applying a result and asking
+for a rank are O(log n) instead of a full re-sort.
+
+Clubs are ordered as in the published table: points, then goal difference,
+then their existing table position (clubs new to the table come after
+existing clubs on a tie).
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import IO, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from .ingest import make_writer
+from .resolve import club_key
+
+Key = Tuple[int, int, int]
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right", "size")
+
+    def __init__(self, key, priority: float):
+        self.key = key
+        self.priority = priority
+        self.left: Optional[_Node] = None
+        self.right: Optional[_Node] = None
+        self.size = 1
+
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+
+def _fix(node: _Node) -> _Node:
+    node.size = 1 + _size(node.left) + _size(node.right)
+    return node
+
+
+def _split(node: Optional[_Node], key) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Split into keys ``< key`` and keys ``>= key``."""
+    if node is None:
+        return None, None
+    if node.key < key:
+        node.right, right = _split(node.right, key)
+        return _fix(node), right
+    left, node.left = _split(node.left, key)
+    return left, _fix(node)
+
+
+def _merge(left: Optional[_Node], right: Optional[_Node]) -> Optional[_Node]:
+    if left is None:
+        return right
+    if right is None:
+        return left
+    if left.priority > right.priority:
+        left.right = _merge(left.right, right)
+        return _fix(left)
+    right.left = _merge(left, right.left)
+    return _fix(right)
+
+
+class RankedSet:
+    """Ordered set of distinct keys with O(log n) insert, remove, rank and select."""
+
+    def __init__(self, keys: Iterable = (), seed: int = 0):
+        self._root: Optional[_Node] = None
+        self._random = random.Random(seed)
+        for key in keys:
+            self.add(key)
+
+    def __len__(self) -> int:
+        return _size(self._root)
+
+    def add(self, key) -> None:
+        left, right = _split(self._root, key)
+        if right is not None:
+            node = right
+            while node.left is not None:
+                node = node.left
+            if node.key == key:
+                raise KeyError(f"{key!r} is already present")
+        self._root = _merge(_merge(left, _Node(key, self._random.random())), right)
+
+    def remove(self, key) -> None:
+        def _remove(node: Optional[_Node]) -> Optional[_Node]:
+            if node is None:
+                raise KeyError(key)
+            if node.key == key:
+                return _merge(node.left, node.right)
+            if key < node.key:
+                node.left = _remove(node.left)
+            else:
+                node.right = _remove(node.right)
+            return _fix(node)
+
+        self._root = _remove(self._root)
+
+    def rank(self, key) -> int:
+        """Number of keys smaller than ``key``."""
+        node, rank = self._root, 0
+        while node is not None:
+            if key <= node.key:
+                node = node.left
+            else:
+                rank += _size(node.left) + 1
+                node = node.right
+        return rank
+
+    def select(self, index: int):
+        """The key at 0-based position ``index``."""
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        node = self._root
+        while True:
+            left = _size(node.left)
+            if index < left:
+                node = node.left
+            elif index == left:
+                return node.key
+            else:
+                index -= left + 1
+                node = node.right
+
+    def __iter__(self) -> Iterator:
+        stack: List[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+
+class MatchResult(NamedTuple):
+    club: str
+    opponent: str
+    goals_for: int
+    goals_against: int
+    season: str
+
+
+def points_per_tournament(points: int, participations: int) -> Optional[float]:
+    if not participations:
+        return None
+    # The published table rounds half up (207 / 24 -> 8.63).
+    return math.floor(points / participations * 100 + 0.5) / 100
+
+
+class LiveTable:
+    """The CLQ table, updated one match result at a time."""
+
+    def __init__(self, records: Iterable[dict] = ()):
+        self._rows: Dict[str, dict] = {}
+        self._keys: Dict[str, Key] = {}
+        # Folded key -> club, or None when several clubs share the key.
+        self._names: Dict[str, Optional[str]] = {}
+        self._order: Dict[str, int] = {}
+        self._seasons: Set[Tuple[str, str]] = set()
+        self._by_position: Dict[int, str] = {}
+        self._ranks = RankedSet()
+        for record in sorted(records, key=lambda r: r["rank"]):
+            self._insert(dict(record))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, club: str) -> bool:
+        try:
+            return self._canonical(club) in self._rows
+        except KeyError:
+            return False
+
+    def _canonical(self, club: str) -> str:
+        """The table's name for ``club``: an exact name, else its unique folded key.
+
+        Raises :class:`KeyError` when the folded key matches more than one club.
+        """
+        for name in (club, club.strip()):
+            if name in self._rows:
+                return name
+        key = club_key(club)
+        if key not in self._names:
+            return club.strip()
+        name = self._names[key]
+        if name is None:
+            raise KeyError(f"{club!r} matches more than one club; give the full name")
+        return name
+
+    def _key(self, row: dict) -> Key:
+        return (-row["points"], -row["goal_difference"], self._order[row["club"]])
+
+    def _insert(self, row: dict) -> None:
+        club = row["club"]
+        self._order[club] = position = len(self._order)
+        self._by_position[position] = club
+        key = club_key(club)
+        self._names[key] = club if self._names.get(key, club) == club else None
+        self._rows[club] = row
+        self._keys[club] = key = self._key(row)
+        self._ranks.add(key)
+
+    def _new_row(self, club: str) -> dict:
+        row = {
+            "rank": 0, "club": club, "participations": 0, "matches": 0, "wins": 0, "draws": 0, "losses": 0,
+            "goals_for": 0, "goals_against": 0, "goal_difference": 0, "points": 0, "points_per_tournament": None,
+        }
+        self._insert(row)
+        return row
+
+    def _record(self, club: str, scored: int, conceded: int, season: str) -> None:
+        name = self._canonical(club)
+        row = self._rows.get(name) or self._new_row(name)
+        self._ranks.remove(self._keys[name])
+        row["matches"] += 1
+        # Deltas only: published totals (points in particular) need not be
+        # reproducible from the other columns.
+        if scored > conceded:
+            row["wins"] += 1
+            row["points"] += 3
+        elif scored == conceded:
+            row["draws"] += 1
+            row["points"] += 1
+        else:
+            row["losses"] += 1
+        row["goals_for"] += scored
+        row["goals_against"] += conceded
+        row["goal_difference"] += scored - conceded
+        if (name, season) not in self._seasons:
+            self._seasons.add((name, season))
+            row["participations"] += 1
+        row["points_per_tournament"] = points_per_tournament(row["points"], row["participations"])
+        self._keys[name] = key = self._key(row)
+        self._ranks.add(key)
+
+    def apply(self, result: MatchResult) -> None:
+        """Apply one result to both clubs.
+
+        A club's participations grow on its first result of a season seen by
+        this table, so the base table must not already include that season.
+        """
+        # Resolve both names first so an ambiguous one leaves the table untouched.
+        club, opponent = self._canonical(result.club), self._canonical(result.opponent)
+        self._record(club, result.goals_for, result.goals_against, str(result.season))
+        self._record(opponent, result.goals_against, result.goals_for, str(result.season))
+
+    def apply_many(self, results: Iterable[MatchResult]) -> int:
+        count = 0
+        for result in results:
+            self.apply(result)
+            count += 1
+        return count
+
+    def rank(self, club: str) -> int:
+        """1-based table position of ``club``."""
+        return self._ranks.rank(self._keys[self._canonical(club)]) + 1
+
+    def row(self, club: str) -> dict:
+        name = self._canonical(club)
+        return dict(self._rows[name], rank=self._ranks.rank(self._keys[name]) + 1)
+
+    def at(self, rank: int) -> dict:
+        """The row at 1-based table position ``rank``."""
+        club = self._by_position[self._ranks.select(rank - 1)[2]]
+        return dict(self._rows[club], rank=rank)
+
+    def top(self, k: int = 10) -> List[dict]:
+        return [self.at(rank) for rank in range(1, min(k, len(self)) + 1)]
+
+    def records(self) -> Iterator[dict]:
+        """All rows in table order with current ranks."""
+        for rank, key in enumerate(self._ranks, 1):
+            yield dict(self._rows[self._by_position[key[2]]], rank=rank)
+
+    def write(self, stream: IO[str], fmt: str = "json") -> None:
+        writer = make_writer(stream, fmt)
+        for record in self.records():
+            writer.write(record)
+        writer.close()
@@ -0,0 +1,137 @@
+"""Precomputed lookup cache for single club and player lookups.
+
+The cache maps normalized club and player names to their rows. It is a
+single file laid out as a hash table, so a lookup reads one small bucket
+rather than the whole dataset:
+
+* a fixed header (magic, version, length of the meta block);
+* the meta block: the size and mtime of the JSON/CSV sources and the
+  bucket count;
+* the bucket table: ``(offset, length)`` of every bucket;
+* the buckets: each a :mod:`marshal`-encoded dict of the names whose CRC-32
+  falls in it, with their rows.
+
+Reading it needs nothing beyond modules built into the interpreter
+(:mod:`marshal`, :mod:`struct`, :mod:`zlib`): answering ``clq club NAME``
+never imports NumPy, pandas or click. The cache is rebuilt from the sources
+(through :mod:`clq.sources`) when either of them changes.
+"""
+
+import marshal
+import os
+import struct
+import zlib
+
+from . import paths
+
+VERSION = 2
+CACHE_FILE = "clq_lookup.cache"
+KINDS = ("club", "player")
+MAGIC = b"CLQL"
+# Names per bucket on average; a lookup unmarshals one bucket.
+BUCKET_NAMES = 4
+
+_HEADER = struct.Struct("<4sHxxI")
+_SLOT = struct.Struct("<QI")
+
+
+def normalize_key(value: str) -> str:
+    return " ".join(value.split()).casefold()
+
+
+def _stamps(data_dir) -> list:
+    stamps = []
+    for path in (paths.table_path(data_dir), paths.scorers_path(data_dir)):
+        st = os.stat(path)
+        stamps.append([st.st_size, st.st_mtime_ns])
+    return stamps
+
+
+def _group(records, key: str) -> dict:
+    groups = {}
+    for record in records:
+        if record[key] is not None:
+            groups.setdefault(normalize_key(record[key]), []).append(record)
+    return groups
+
+
+def build(data_dir=None) -> dict:
+    """Rows grouped by normalized name, per kind, read from the sources."""
+    from . import sources
+
+    return {
+        "club": _group(sources.load_table(sources.table_path(data_dir)), "club"),
+        "player": _group(sources.load_scorers(sources.scorers_path(data_dir)), "player"),
+    }
+
+
+def _entry_key(kind: str, name: str) -> str:
+    return f"{kind}\x1f{name}"
+
+
+def _bucket(key: str, buckets: int) -> int:
+    return zlib.crc32(key.encode("utf-8")) % buckets
+
+
+def pack(groups: dict, stamps: list) -> bytes:
+    """The cache file for ``groups`` (as returned by :func:`build`)."""
+    entries = {_entry_key(kind, name): rows for kind in KINDS for name, rows in groups[kind].items()}
+    n_buckets = max(1, len(entries) // BUCKET_NAMES)
+    buckets = [{} for _ in range(n_buckets)]
+    for key, rows in entries.items():
+        buckets[_bucket(key, n_buckets)][key] = rows
+    meta = marshal.dumps({"stamps": stamps, "buckets": n_buckets})
+    blobs = [marshal.dumps(bucket) for bucket in buckets]
+    offset = _HEADER.size + len(meta) + _SLOT.size * n_buckets
+    table = bytearray()
+    for blob in blobs:
+        table += _SLOT.pack(offset, len(blob))
+        offset += len(blob)
+    return b"".join([_HEADER.pack(MAGIC, VERSION, len(meta)), meta, bytes(table), *blobs])
+
+
+def _write(path: str, data: bytes) -> None:
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except OSError:
+        # A read-only data directory only costs a rebuild per process.
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+
+
+def _read(path: str, stamps: list, key: str):
+    """Rows for ``key`` from the cache file, or ``None`` if it is missing, stale or damaged."""
+    try:
+        with open(path, "rb") as f:
+            magic, version, meta_len = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                return None
+            meta = marshal.loads(f.read(meta_len))
+            if meta.get("stamps") != stamps:
+                return None
+            f.seek(_HEADER.size + meta_len + _SLOT.size * _bucket(key, meta["buckets"]))
+            offset, length = _SLOT.unpack(f.read(_SLOT.size))
+            f.seek(offset)
+            return marshal.loads(f.read(length)).get(key, [])
+    except (OSError, EOFError, ValueError, TypeError, AttributeError, KeyError, struct.error):
+        return None
+
+
+def find(kind: str, name: str, data_dir=None, cache_dir=None) -> list:
+    """Rows whose club (``kind="club"``) or player name matches ``name``."""
+    if kind not in KINDS:
+        raise ValueError(f"unknown lookup kind {kind!r}, expected one of {KINDS}")
+    name = normalize_key(name)
+    stamps = _stamps(data_dir)
+    path = os.path.join(cache_dir or data_dir or paths.DATA_DIR, CACHE_FILE)
+    rows = _read(path, stamps, _entry_key(kind, name))
+    if rows is None:
+        groups = build(data_dir)
+        _write(path, pack(groups, stamps))
+        rows = groups[kind].get(name, [])
+    return rows
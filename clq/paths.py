@@ -0,0 +1,19 @@
+"""Default locations of the published CLQ data files.
+
+Kept free of heavy imports (including :mod:`pathlib`) because the ``clq``
+fast path resolves these on every invocation.
+"""
+
+import os
+
+DATA_DIR = os.environ.get("CLQ_DATA_DIR") or os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GlobalTable")
+TABLE_FILE = "clq_champions_league_qualifying.json"
+SCORERS_FILE = "top_1000_scorers.csv"
+
+
+def table_path(data_dir=None) -> str:
+    return os.path.join(data_dir or DATA_DIR, TABLE_FILE)
+
+
+def scorers_path(data_dir=None) -> str:
+    return os.path.join(data_dir or DATA_DIR, SCORERS_FILE)
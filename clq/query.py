@@ -0,0 +1,239 @@
+"""Indexed in-memory queries over the CLQ table and the scorer list.
+
+Each dataset is wrapped in a :class:`Relation` with
+
+* hash indexes on its key columns (club, player): case-insensitive lookups
+  in O(1) once the index has been built on first use;
+* sorted secondary indexes on its numeric columns, built lazily with one
+  ``argsort``: top-k reads the tail of the index, range queries are two
+  binary searches.
+
+Filtered queries (``top`` with ``where`` bounds, ``select``) start from the
+most selective indexed range and only check the remaining bounds on those
+candidate rows, so nothing scans the whole table unless the filter itself
+is unselective.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import store as _store
+from .lookup import normalize_key
+from .resolve import ClubResolver
+
+Bounds = Tuple[Optional[float], Optional[float]]
+
+CLUB_SORT_COLUMNS = ("points", "points_per_tournament", "goal_difference", "matches", "participations", "goals_for")
+SCORER_SORT_COLUMNS = ("goals", "matches", "assists", "penalties")
+
+# Top-k with a filter scans the sorted index in growing chunks until k rows
+# pass; the first chunk is this many times k.
+_CHUNK_FACTOR = 4
+_MIN_CHUNK = 256
+
+
+def _descending_order(values: np.ndarray) -> np.ndarray:
+    return np.argsort(-values.astype(np.float64), kind="stable")
+
+
+class SortedIndex:
+    """Row ids of one column in ascending value order, nulls excluded."""
+
+    def __init__(self, values: np.ndarray):
+        if values.dtype.kind == "f":
+            valid = ~np.isnan(values)
+        else:
+            valid = values != _store.INT_NULL
+        order = np.argsort(values, kind="stable")
+        self.order = order[valid[order]]
+        self.values = values[self.order]
+        self._descending: Optional[np.ndarray] = None
+
+    @property
+    def descending(self) -> np.ndarray:
+        """Row ids by descending value; ties keep their original row order."""
+        if self._descending is None:
+            self._descending = self.order[_descending_order(self.values)]
+        return self._descending
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+    def span(self, lo: Optional[float] = None, hi: Optional[float] = None) -> Tuple[int, int]:
+        """Positions ``[start, stop)`` in the index holding ``lo <= value <= hi``."""
+        start = 0 if lo is None else int(np.searchsorted(self.values, lo, side="left"))
+        stop = len(self.values) if hi is None else int(np.searchsorted(self.values, hi, side="right"))
+        return start, max(start, stop)
+
+
+class Relation:
+    """A store with hash indexes on its key columns and lazy sorted indexes."""
+
+    def __init__(self, data: _store.Store, keys: Sequence[str], sortable: Sequence[str]):
+        self.store = data
+        self.keys = tuple(keys)
+        self.sortable = tuple(sortable)
+        self._hash: Dict[str, Dict[str, np.ndarray]] = {}
+        self._sorted: Dict[str, SortedIndex] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.store)
+
+    def _build_hash(self, name: str) -> Dict[str, np.ndarray]:
+        groups: Dict[str, List[int]] = {}
+        for row, value in enumerate(self.store.text(name)):
+            if value is not None:
+                groups.setdefault(normalize_key(value), []).append(row)
+        return {key: np.array(rows, dtype=np.int64) for key, rows in groups.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        if name not in self._columns:
+            self._columns[name] = self.store.column(name)
+        return self._columns[name]
+
+    def index(self, name: str) -> SortedIndex:
+        if name not in self.sortable:
+            raise KeyError(f"no sorted index on {name!r}; choose from {', '.join(self.sortable)}")
+        if name not in self._sorted:
+            self._sorted[name] = SortedIndex(self.column(name))
+        return self._sorted[name]
+
+    def lookup(self, key_column: str, value: str) -> np.ndarray:
+        if key_column not in self._hash:
+            if key_column not in self.keys:
+                raise KeyError(f"no hash index on {key_column!r}; choose from {', '.join(self.keys)}")
+            self._hash[key_column] = self._build_hash(key_column)
+        return self._hash[key_column].get(normalize_key(value), np.empty(0, dtype=np.int64))
+
+    def rows(self, ids: Iterable[int]) -> List[dict]:
+        return [self.store.row(int(i)) for i in ids]
+
+    def warm(self) -> "Relation":
+        """Build every lazy index now, so concurrent readers only ever read them."""
+        for name in self.store.names:
+            self.column(name)
+        for name in self.keys:
+            if name not in self._hash:
+                self._hash[name] = self._build_hash(name)
+        for name in self.sortable:
+            self.index(name)
+        return self
+
+    def _mask(self, ids: np.ndarray, where: Mapping[str, Bounds]) -> np.ndarray:
+        keep = np.ones(len(ids), dtype=bool)
+        for name, (lo, hi) in where.items():
+            values = self.column(name)[ids]
+            if lo is not None:
+                keep &= values >= lo
+            if hi is not None:
+                keep &= values <= hi
+            if values.dtype.kind == "f":
+                keep &= ~np.isnan(values)
+            else:
+                keep &= values != _store.INT_NULL
+        return keep
+
+    def top(self, by: str, k: int = 10, where: Optional[Mapping[str, Bounds]] = None, ascending: bool = False) -> np.ndarray:
+        """Row ids of the ``k`` highest (or lowest) values of ``by`` passing ``where``."""
+        index = self.index(by)
+        order = index.order if ascending else index.descending
+        if not where:
+            return order[:k]
+        found: List[np.ndarray] = []
+        need = k
+        position = 0
+        chunk = max(_MIN_CHUNK, k * _CHUNK_FACTOR)
+        while need > 0 and position < len(order):
+            ids = order[position:position + chunk]
+            hits = ids[self._mask(ids, where)][:need]
+            found.append(hits)
+            need -= len(hits)
+            position += chunk
+            chunk *= 2
+        return np.concatenate(found) if found else order[:0]
+
+    def select(
+        self,
+        where: Optional[Mapping[str, Bounds]] = None,
+        match: Optional[Mapping[str, str]] = None,
+        order_by: Optional[str] = None,
+        ascending: bool = True,
+        limit: Optional[int] = None,
+    ) -> np.ndarray:
+        """Row ids matching every ``(lo, hi)`` bound and key-column value.
+
+        Candidates come from the hash indexes for ``match`` or, failing that,
+        from the narrowest indexed range in ``where``; the remaining
+        conditions are checked on those rows only.
+        """
+        where = dict(where or {})
+        if match:
+            ids = None
+            for name, value in match.items():
+                hits = self.lookup(name, value)
+                ids = hits if ids is None else np.intersect1d(ids, hits, assume_unique=True)
+        else:
+            indexed = [name for name in where if name in self.sortable]
+            if indexed:
+                spans = {name: self.index(name).span(*where[name]) for name in indexed}
+                driver = min(spans, key=lambda name: spans[name][1] - spans[name][0])
+                start, stop = spans[driver]
+                ids = self.index(driver).order[start:stop]
+                del where[driver]
+            else:
+                ids = np.arange(len(self), dtype=np.int64)
+        if where:
+            ids = ids[self._mask(ids, where)]
+        if order_by is not None:
+            values = self.column(order_by)[ids]
+            ids = ids[np.argsort(values, kind="stable") if ascending else _descending_order(values)]
+        return ids if limit is None else ids[:limit]
+
+
+class QueryEngine:
+    """Query entry point over the table (clubs) and the scorer list."""
+
+    def __init__(self, table: _store.Store, scorers: _store.Store):
+        self.clubs = Relation(table, keys=("club",), sortable=CLUB_SORT_COLUMNS)
+        self.scorers = Relation(scorers, keys=("player", "club", "nationality"), sortable=SCORER_SORT_COLUMNS)
+        self._resolver: Optional[ClubResolver] = None
+
+    @classmethod
+    def open(cls, data_dir=None, store_dir=None) -> "QueryEngine":
+        return cls(_store.open_table(data_dir, store_dir), _store.open_scorers(data_dir, store_dir))
+
+    @property
+    def resolver(self) -> ClubResolver:
+        if self._resolver is None:
+            self._resolver = ClubResolver(self.clubs.store.text("club"))
+        return self._resolver
+
+    def warm(self) -> "QueryEngine":
+        """Build the relations' indexes and the club resolver up front."""
+        self.clubs.warm()
+        self.scorers.warm()
+        self.resolver
+        return self
+
+    def close(self) -> None:
+        self.clubs.store.close()
+        self.scorers.store.close()
+
+    def club(self, name: str) -> List[dict]:
+        """Table rows for ``name``, falling back to fuzzy club resolution."""
+        ids = self.clubs.lookup("club", name)
+        if not len(ids):
+            match = self.resolver.resolve(name)
+            if match is not None:
+                ids = [match.index]
+        return self.clubs.rows(ids)
+
+    def player(self, name: str) -> List[dict]:
+        return self.scorers.rows(self.scorers.lookup("player", name))
+
+    def club_scorers(self, name: str) -> List[dict]:
+        return self.scorers.rows(self.scorers.lookup("club", name))
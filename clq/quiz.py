@@ -0,0 +1,343 @@
+"""Batch quiz generation over the CLQ table and the scorer list.
+
+Everything a question needs is precomputed once in a :class:`QuizBank`:
+
+* a :class:`RankTable` per statistic (club, scorer and per-nationality
+  aggregates): entities in descending value order, grouped into runs of
+  equal value so "near ties" are simply neighbouring runs. :meth:`QuizBank.open`
+  takes the nationality totals from :func:`clq.analytics.cached_aggregates`,
+  so they are only recomputed when the scorer CSV changes;
+* per-club scorer groups (scorers joined to table clubs through
+  :class:`~clq.resolve.ClubResolver`);
+* a :class:`~clq.similar.ClubIndex` for "whose record is this?"
+  questions: the wrong options are the right club's nearest neighbours in
+  record space, found with one batched k-NN query per chunk.
+
+Questions are then drawn in vectorized batches: pick positions in a rank
+table, pick partners a run or two away, and format. Nothing is aggregated
+per question. A batch is fully determined by ``seed``: work is split into
+fixed-size chunks seeded from ``numpy.random.SeedSequence(seed).spawn``, so
+the result does not depend on how many worker processes produce it.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .query import QueryEngine
+from .resolve import ClubResolver
+from .similar import ClubIndex
+from .store import INT_NULL
+
+CHUNK_SIZE = 2048
+# Partners and distractors are drawn from at most this many runs away.
+NEAR_RUNS = 2
+OPTIONS = 4
+# Chunks queued per worker process by generate().
+IN_FLIGHT = 2
+
+CLUB_STATS = {
+    "points": ("Which club has more CLQ points?", "Which of these clubs has the most CLQ points?"),
+    "points_per_tournament": (
+        "Which club has the higher points per tournament?",
+        "Which of these clubs has the highest points per tournament?",
+    ),
+    "goal_difference": ("Which club has the better CLQ goal difference?", "Which of these clubs has the best CLQ goal difference?"),
+    "wins": ("Which club has won more CLQ matches?", "Which of these clubs has won the most CLQ matches?"),
+    "participations": ("Which club has more CLQ participations?", "Which of these clubs has the most CLQ participations?"),
+    "goals_for": ("Which club has scored more CLQ goals?", "Which of these clubs has scored the most CLQ goals?"),
+}
+SCORER_STATS = {
+    "goals": ("Who scored more CLQ goals?", "Which of these players scored the most CLQ goals?"),
+    "matches": ("Who played more CLQ matches?", "Which of these players played the most CLQ matches?"),
+    "assists": ("Who has more CLQ assists?", "Which of these players has the most CLQ assists?"),
+}
+
+
+class RankTable:
+    """Entities ordered by descending value, grouped into equal-value runs."""
+
+    def __init__(self, names: Sequence[str], values: np.ndarray):
+        values = np.asarray(values, dtype=np.float64)
+        keep = ~np.isnan(values)
+        ids = np.flatnonzero(keep)
+        order = ids[np.argsort(-values[ids], kind="stable")]
+        self.names = list(names)
+        self.order = order
+        self.values = values[order]
+        starts = np.flatnonzero(np.r_[True, self.values[1:] != self.values[:-1]])
+        self.run_start = starts
+        self.run_len = np.diff(np.r_[starts, len(order)])
+        self.run_of = np.repeat(np.arange(len(starts)), self.run_len)
+
+    @property
+    def runs(self) -> int:
+        return len(self.run_start)
+
+    def _pick_in_runs(self, rng: np.random.Generator, runs: np.ndarray) -> np.ndarray:
+        return self.run_start[runs] + (rng.random(len(runs)) * self.run_len[runs]).astype(np.int64)
+
+    def pairs(self, rng: np.random.Generator, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """``n`` pairs of positions with different values, at most NEAR_RUNS runs apart."""
+        a = rng.integers(0, len(self.order), n)
+        run = self.run_of[a]
+        step = rng.integers(1, NEAR_RUNS + 1, n) * np.where(rng.random(n) < 0.5, -1, 1)
+        target = run + step
+        outside = (target < 0) | (target >= self.runs)
+        target[outside] = run[outside] - step[outside]
+        target = np.clip(target, 0, self.runs - 1)
+        return a, self._pick_in_runs(rng, target)
+
+    def groups(self, rng: np.random.Generator, n: int, size: int = OPTIONS) -> np.ndarray:
+        """``n`` rows of positions: a leader, then one pick from each of the next runs."""
+        top = rng.integers(0, self.runs - size + 1, n)
+        runs = top[:, None] + np.arange(size)[None, :]
+        return self._pick_in_runs(rng, runs.ravel()).reshape(n, size)
+
+
+class Question(NamedTuple):
+    id: str
+    kind: str
+    stat: str
+    question: str
+    options: List[str]
+    answer: int
+    values: List[float]
+
+    def to_dict(self) -> dict:
+        return self._asdict()
+
+
+def _question_id(kind: str, stat: str, options: Sequence[str]) -> str:
+    key = "\x1f".join((kind, stat, *sorted(options)))
+    return hashlib.blake2b(key.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def _value(value: float):
+    return int(value) if float(value).is_integer() else round(float(value), 2)
+
+
+def _totals(labels: Sequence[Optional[str]], values: np.ndarray) -> RankTable:
+    """Sum of ``values`` per label; rows with no label never become an option."""
+    known = np.array([bool(label and label.strip()) for label in labels], dtype=bool)
+    names, codes = np.unique(np.array(labels, dtype=object)[known], return_inverse=True)
+    return RankTable(list(names), np.bincount(codes, weights=np.nan_to_num(values[known]), minlength=len(names)))
+
+
+class QuizBank:
+    """Precomputed rank tables and aggregates that questions are drawn from."""
+
+    def __init__(self, engine: QueryEngine, aggregates: Optional[dict] = None):
+        clubs = engine.clubs
+        club_names = clubs.store.text("club")
+        self.club_tables = {stat: RankTable(club_names, _float(clubs.column(stat))) for stat in CLUB_STATS}
+
+        scorers = engine.scorers
+        players = scorers.store.text("player")
+        self.scorer_tables = {stat: RankTable(players, _float(scorers.column(stat))) for stat in SCORER_STATS}
+
+        goals = _float(scorers.column("goals"))
+        if aggregates is not None:
+            totals = aggregates["nationality"]["goals"].sort_index()
+            self.nationality_goals = RankTable(totals.index.astype(str).tolist(), totals.to_numpy(dtype=np.float64))
+        else:
+            self.nationality_goals = _totals(scorers.store.text("nationality"), goals)
+
+        resolver = ClubResolver(club_names)
+        club_of = resolver.join([{"club": c} for c in scorers.store.text("club")])
+        self.club_scorers: List[Tuple[str, List[str], List[float]]] = []
+        for club in np.unique(club_of[club_of >= 0]):
+            members = np.flatnonzero(club_of == club)
+            members = members[np.argsort(-goals[members], kind="stable")]
+            # Only clubs with an outright top scorer and enough alternatives.
+            if len(members) >= 3 and goals[members[0]] > goals[members[1]]:
+                picked = members[:OPTIONS]
+                self.club_scorers.append((club_names[club], [players[i] for i in picked], goals[picked].tolist()))
+
+        self.club_names = club_names
+        self.club_records = np.column_stack([clubs.column(name) for name in ("wins", "draws", "losses", "points")])
+        self.club_index = ClubIndex.from_relation(clubs) if len(club_names) >= OPTIONS else None
+
+    @classmethod
+    def open(cls, data_dir=None) -> "QuizBank":
+        from . import analytics, sources
+
+        return cls(QueryEngine.open(data_dir), analytics.cached_aggregates(sources.scorers_path(data_dir)))
+
+    # Each generator returns questions for ``n`` draws; duplicates are
+    # removed by the caller.
+
+    def _compare(self, rng, n: int, table: RankTable, kind: str, stat: str, text: str) -> Iterator[Question]:
+        a, b = table.pairs(rng, n)
+        swap = rng.random(n) < 0.5
+        names, order, values = table.names, table.order, table.values
+        for i, j, s in zip(a.tolist(), b.tolist(), swap.tolist()):
+            if values[i] == values[j]:
+                continue
+            if s:
+                i, j = j, i
+            options = [names[order[i]], names[order[j]]]
+            yield Question(
+                _question_id(kind, stat, options), kind, stat, text, options,
+                0 if values[i] > values[j] else 1, [_value(values[i]), _value(values[j])],
+            )
+
+    def _best_of(self, rng, n: int, table: RankTable, kind: str, stat: str, text: str) -> Iterator[Question]:
+        if table.runs < OPTIONS:
+            return
+        groups = table.groups(rng, n)
+        perms = np.argsort(rng.random((n, OPTIONS)), axis=1)
+        names, order, values = table.names, table.order, table.values
+        for group, perm in zip(groups.tolist(), perms.tolist()):
+            picked = [group[k] for k in perm]
+            options = [names[order[p]] for p in picked]
+            yield Question(
+                _question_id(kind, stat, options), kind, stat, text, options,
+                perm.index(0), [_value(values[p]) for p in picked],
+            )
+
+    def _club_top_scorer(self, rng, n: int) -> Iterator[Question]:
+        if not self.club_scorers:
+            return
+        picks = rng.integers(0, len(self.club_scorers), n)
+        perms = rng.random((n, OPTIONS))
+        for pick, keys in zip(picks.tolist(), perms):
+            club, players, goals = self.club_scorers[pick]
+            perm = np.argsort(keys[:len(players)]).tolist()
+            options = [players[k] for k in perm]
+            yield Question(
+                _question_id("club_top_scorer", "goals", options), "club_top_scorer", "goals",
+                f"Which player has scored the most CLQ goals for {club}?", options,
+                perm.index(0), [_value(goals[k]) for k in perm],
+            )
+
+    def _club_record(self, rng, n: int) -> Iterator[Question]:
+        if self.club_index is None or not n:
+            return
+        picks = rng.integers(0, len(self.club_names), n)
+        perms = np.argsort(rng.random((n, OPTIONS)), axis=1)
+        _, near = self.club_index.neighbours(picks, OPTIONS - 1)
+        record = self.club_records
+        # A neighbour with the very same record would make the question ambiguous.
+        same = (record[near] == record[picks][:, None, :]).all(axis=2).any(axis=1)
+        groups = np.take_along_axis(np.column_stack([picks, near]), perms, axis=1)
+        for pick, group, perm, skip in zip(picks.tolist(), groups.tolist(), perms.tolist(), same.tolist()):
+            if skip:
+                continue
+            wins, draws, losses, _ = record[pick].tolist()
+            options = [self.club_names[c] for c in group]
+            yield Question(
+                _question_id("club_record", "points", options), "club_record", "points",
+                f"Which club has won {wins}, drawn {draws} and lost {losses} CLQ matches?", options,
+                perm.index(0), [_value(record[c, 3]) for c in group],
+            )
+
+    def _sources(self) -> List[Tuple]:
+        """``(generator, *args)`` for every question type, in a fixed order."""
+        sources: List[Tuple] = []
+        for stat, (compare, best) in CLUB_STATS.items():
+            table = self.club_tables[stat]
+            sources.append((self._compare, table, "club_compare", stat, compare))
+            sources.append((self._best_of, table, "club_best", stat, best))
+        for stat, (compare, best) in SCORER_STATS.items():
+            table = self.scorer_tables[stat]
+            sources.append((self._compare, table, "scorer_compare", stat, compare))
+            sources.append((self._best_of, table, "scorer_best", stat, best))
+        sources.append((
+            self._compare, self.nationality_goals, "nationality_compare", "goals",
+            "Players from which country have scored more CLQ goals among the top scorers?",
+        ))
+        sources.append((self._club_top_scorer,))
+        sources.append((self._club_record,))
+        return sources
+
+    def chunk(self, seed_seq: np.random.SeedSequence, size: int = CHUNK_SIZE) -> List[Question]:
+        """One deterministic chunk of up to ``size`` distinct questions."""
+        rng = np.random.default_rng(seed_seq)
+        sources = self._sources()
+        counts = rng.multinomial(size, np.full(len(sources), 1 / len(sources)))
+        seen = set()
+        out: List[Question] = []
+        for (generator, *args), count in zip(sources, counts.tolist()):
+            for question in generator(rng, count, *args):
+                if question.id not in seen:
+                    seen.add(question.id)
+                    out.append(question)
+        order = rng.permutation(len(out))
+        return [out[i] for i in order.tolist()]
+
+
+_worker_bank: Optional[QuizBank] = None
+
+
+def _init_worker(data_dir) -> None:
+    global _worker_bank
+    _worker_bank = QuizBank.open(data_dir)
+
+
+def _worker_chunk(seed_seq: np.random.SeedSequence) -> List[dict]:
+    return [q.to_dict() for q in _worker_bank.chunk(seed_seq)]
+
+
+def generate(
+    n: int,
+    seed: int = 0,
+    bank: Optional[QuizBank] = None,
+    workers: int = 1,
+    data_dir=None,
+    max_chunks: Optional[int] = None,
+) -> List[dict]:
+    """``n`` distinct questions, identical for a given ``seed`` whatever ``workers`` is.
+
+    Chunks are merged in order, dropping questions already taken, until
+    ``n`` are collected; ``max_chunks`` (default: enough for ``4 * n``
+    draws) bounds the work when the pool of possible questions is small.
+    """
+    root = np.random.SeedSequence(seed)
+    if max_chunks is None:
+        max_chunks = max(1, 4 * -(-n // CHUNK_SIZE))
+    seeds = root.spawn(max_chunks)
+    taken: Dict[str, dict] = {}
+
+    def merge(chunks) -> bool:
+        for chunk in chunks:
+            for question in chunk:
+                if len(taken) >= n:
+                    return True
+                taken.setdefault(question["id"], question)
+        return len(taken) >= n
+
+    # A pool only pays for its start-up and IPC with several CPUs and chunks.
+    workers = min(workers, os.cpu_count() or 1)
+    if workers > 1 and n > CHUNK_SIZE:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(data_dir,)) as pool:
+            # A bounded window of chunks in flight, merged in seed order; the
+            # rest are never submitted once ``n`` questions are taken.
+            pending = deque(pool.submit(_worker_chunk, s) for s in seeds[:IN_FLIGHT * workers])
+            queued = len(pending)
+            while pending:
+                if merge([pending.popleft().result()]):
+                    break
+                if queued < len(seeds):
+                    pending.append(pool.submit(_worker_chunk, seeds[queued]))
+                    queued += 1
+            for future in pending:
+                future.cancel()
+    else:
+        bank = bank or QuizBank.open(data_dir)
+        merge([q.to_dict() for q in bank.chunk(s)] for s in seeds)
+    return list(taken.values())
+
+
+def _float(column: np.ndarray) -> np.ndarray:
+    if column.dtype.kind == "f":
+        return column
+    values = column.astype(np.float64)
+    values[column == INT_NULL] = np.nan
+    return values
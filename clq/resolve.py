@@ -0,0 +1,147 @@
+"""Club entity resolution between the scorer list and the CLQ table.
+
+The two sources spell clubs independently: accents, defunct-year suffixes
+("Bangor City (- 2025)", "1.FC Kosice (1951 - 2004)"), legal-form affixes
+("FK", "FC", "SK") and stray whitespace all vary. :func:`club_key` folds a
+name to a normalized key; :class:`ClubResolver` indexes the table's clubs by
+that key and by character trigrams of it, so names that still differ after
+normalization fall back to the trigram candidate with the best Dice score.
+
+Resolution is memoized per distinct input string and :meth:`ClubResolver.join`
+resolves each distinct club name of a record batch once, so joining a scorer
+list costs work proportional to its number of distinct clubs.
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+# Letters that NFKD does not decompose into an ASCII base letter.
+SPECIAL_LETTERS = {"ß": "ss", "ø": "o", "Ø": "o", "æ": "ae", "Æ": "ae", "œ": "oe", "Œ": "oe",
+                   "đ": "d", "Đ": "d", "ð": "d", "Ð": "d", "þ": "th", "Þ": "th", "ł": "l", "Ł": "l",
+                   "ı": "i"}
+_SPECIAL = str.maketrans(SPECIAL_LETTERS)
+# "(- 2016)", "(-2020)", "( - 2024)", "(1951 - 2004)"
+_DEFUNCT = re.compile(r"\(\s*\d{0,4}\s*-\s*\d{0,4}\s*\)")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_MULTI_CLUB = re.compile(r"^for \d+ clubs$")
+
+# Legal-form and sport-club abbreviations that appear before or after the
+# distinctive part of a club name.
+AFFIXES = frozenset({
+    "ac", "afc", "as", "bk", "bsc", "cd", "cf", "fbk", "fc", "fci", "fk", "gnk", "hnk", "hsk", "if", "ik",
+    "jfk", "jk", "kf", "kv", "nk", "ofk", "pfk", "rsc", "sc", "sk", "sl", "ss", "sv",
+})
+
+DEFAULT_THRESHOLD = 0.6
+
+
+def fold(text: str) -> str:
+    """Lower-case ASCII approximation of ``text`` ("Bodø/Glimt" -> "bodo/glimt")."""
+    decomposed = unicodedata.normalize("NFKD", text.translate(_SPECIAL))
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def club_key(name: str) -> str:
+    """Normalized club key used for exact matching across sources."""
+    text = _DEFUNCT.sub(" ", fold(name))
+    tokens = _NON_ALNUM.sub(" ", text).split()
+    core = [token for token in tokens if token not in AFFIXES]
+    return " ".join(core or tokens)
+
+
+def trigrams(key: str) -> List[str]:
+    padded = f"  {key} "
+    return sorted({padded[i:i + 3] for i in range(len(padded) - 2)})
+
+
+def is_multi_club(name: str) -> bool:
+    """True for scorer rows that aggregate several clubs ("for 3 clubs")."""
+    return bool(_MULTI_CLUB.match(name.strip().casefold()))
+
+
+class Resolution(NamedTuple):
+    index: int
+    club: str
+    score: float
+    method: str  # "exact", "key" or "fuzzy"
+
+
+class ClubResolver:
+    """Resolve free-text club names to rows of the CLQ table."""
+
+    def __init__(self, clubs: Sequence[str], threshold: float = DEFAULT_THRESHOLD):
+        self.clubs = list(clubs)
+        self.threshold = threshold
+        self._exact: Dict[str, int] = {}
+        self._keys: Dict[str, int] = {}
+        postings: Dict[str, List[int]] = {}
+        sizes = np.zeros(len(self.clubs), dtype=np.float64)
+        for index, name in enumerate(self.clubs):
+            self._exact.setdefault(name.strip(), index)
+            key = club_key(name)
+            # Keep the best-ranked club when two names fold to the same key.
+            self._keys.setdefault(key, index)
+            grams = trigrams(key)
+            sizes[index] = len(grams)
+            for gram in grams:
+                postings.setdefault(gram, []).append(index)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._sizes = sizes
+        self._cache: Dict[str, Optional[Resolution]] = {}
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], threshold: float = DEFAULT_THRESHOLD) -> "ClubResolver":
+        return cls([r["club"] for r in records], threshold)
+
+    def _fuzzy(self, key: str) -> Optional[Resolution]:
+        grams = [gram for gram in trigrams(key) if gram in self._postings]
+        if not grams:
+            return None
+        shared = np.bincount(np.concatenate([self._postings[g] for g in grams]), minlength=len(self.clubs))
+        dice = 2.0 * shared / (self._sizes + len(trigrams(key)))
+        best = int(np.argmax(dice))
+        score = float(dice[best])
+        if score < self.threshold:
+            return None
+        return Resolution(best, self.clubs[best], score, "fuzzy")
+
+    def _resolve(self, name: str) -> Optional[Resolution]:
+        if is_multi_club(name):
+            return None
+        index = self._exact.get(name.strip())
+        if index is not None:
+            return Resolution(index, self.clubs[index], 1.0, "exact")
+        key = club_key(name)
+        index = self._keys.get(key)
+        if index is not None:
+            return Resolution(index, self.clubs[index], 1.0, "key")
+        return self._fuzzy(key)
+
+    def resolve(self, name: str) -> Optional[Resolution]:
+        """Best table club for ``name``, or ``None`` (multi-club rows, no match)."""
+        try:
+            return self._cache[name]
+        except KeyError:
+            result = self._cache[name] = self._resolve(name)
+            return result
+
+    def resolve_many(self, names: Iterable[str]) -> List[Optional[Resolution]]:
+        return [self.resolve(name) for name in names]
+
+    def join(self, records: Sequence[dict], key: str = "club") -> np.ndarray:
+        """Table row index for each record's club, ``-1`` where unresolved.
+
+        Distinct names are resolved once and scattered back to the records.
+        """
+        names = [record[key] or "" for record in records]
+        distinct = {name: i for i, name in enumerate(dict.fromkeys(names))}
+        resolved = np.array(
+            [-1 if r is None else r.index for r in self.resolve_many(distinct)], dtype=np.int64
+        )
+        codes = np.fromiter((distinct[name] for name in names), dtype=np.int64, count=len(names))
+        return resolved[codes] if len(resolved) else codes
@@ -0,0 +1,482 @@
+"""Local asyncio JSON service over the CLQ table, the scorer list and the Squadify XIs.
+
+``clq serve`` keeps the data warm in one process: the table and scorer
+stores stay memory-mapped behind a :class:`~clq.query.QueryEngine`, the
+quiz's rank tables (:class:`~clq.quiz.QuizBank`) are built once, and the
+XIs and puzzle calendar are loaded at startup. Endpoints (``GET``/``HEAD``):
+
+* ``/puzzle/today``, ``/puzzle/YYYY-MM-DD``: the day's XI in the game's
+  shard format (see :mod:`squadify.build`);
+* ``/club/NAME``: table rows for a club, with fuzzy resolution;
+* ``/clubs/top?by=points&k=10&min_participations=&min_matches=&asc=0``;
+* ``/player/NAME`` and ``/scorers/top?by=goals&k=10&min_matches=&club=&nationality=``;
+* ``/quiz?n=100&seed=``: a batch of quiz questions (``seed`` defaults to
+  the day, so everyone gets the same batch);
+* ``/stats``: request and cache counters (never cached).
+
+Each response is encoded once: the JSON body, its gzip variant (for
+bodies worth compressing), a content-hash ``ETag`` and the data's
+``Last-Modified`` are kept in an LRU keyed by the canonical request
+(path plus sorted query, with ``today`` and default seeds resolved), so a
+repeated request costs a dictionary lookup and a socket write. Misses are
+rendered in the event loop's default executor, so a slow one (a large quiz
+batch) does not stall the other connections. ``If-None-Match`` /
+``If-Modified-Since`` get a 304. Connections are HTTP/1.1 keep-alive.
+
+The source files are polled every ``reload_interval`` seconds; when one
+changes the data is reloaded and the response cache dropped. A reload that
+fails (say, on a half-written file) keeps the old data and is retried on
+the next poll. Nothing but the standard library, NumPy and the local files
+is needed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import gzip
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from email.utils import formatdate, parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit
+
+from . import paths
+from .query import CLUB_SORT_COLUMNS, SCORER_SORT_COLUMNS, QueryEngine
+
+DEFAULT_PORT = 8765
+CACHE_ENTRIES = 4096
+# Bodies shorter than this are sent uncompressed; gzip would not pay off.
+GZIP_MIN_BYTES = 512
+MAX_K = 1000
+MAX_QUIZ = 2000
+MAX_HEADER_BYTES = 16384
+CACHE_CONTROL = "public, max-age=60"
+REASONS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           431: "Request Header Fields Too Large", 500: "Internal Server Error"}
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class Payload(NamedTuple):
+    """An encoded response body with its validators."""
+
+    body: bytes
+    gzip: Optional[bytes]
+    etag: str
+    last_modified: str
+    modified: float  # Unix time behind ``last_modified``, for If-Modified-Since
+
+    @classmethod
+    def encode(cls, obj, modified: float) -> "Payload":
+        body = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        compressed = gzip.compress(body, compresslevel=6, mtime=0) if len(body) >= GZIP_MIN_BYTES else None
+        etag = '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+        return cls(body, compressed, etag, formatdate(modified, usegmt=True), int(modified))
+
+
+class LRUCache:
+    """Least-recently-used mapping with hit/miss counters."""
+
+    def __init__(self, capacity: int = CACHE_ENTRIES):
+        self.capacity = capacity
+        self._items: "OrderedDict[str, Payload]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Optional[Payload]:
+        payload = self._items.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def put(self, key: str, payload: Payload) -> None:
+        self._items[key] = payload
+        self._items.move_to_end(key)
+        if len(self._items) > self.capacity:
+            self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        self._items.clear()
+
+
+def _int(params: Dict[str, str], name: str, default: Optional[int] = None, lo: int = 0, hi: Optional[int] = None):
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise HTTPError(400, f"{name} must be an integer") from None
+    if number < lo or (hi is not None and number > hi):
+        raise HTTPError(400, f"{name} must be between {lo} and {hi}")
+    return number
+
+
+def _choice(params: Dict[str, str], name: str, choices, default: str) -> str:
+    value = params.get(name) or default
+    if value not in choices:
+        raise HTTPError(400, f"{name} must be one of {', '.join(choices)}")
+    return value
+
+
+def _bounds(**named: Optional[int]) -> dict:
+    return {name: (value, None) for name, value in named.items() if value is not None}
+
+
+class App:
+    """The service's data and routes, independent of the socket layer."""
+
+    def __init__(
+        self,
+        data_dir=None,
+        xis_path: Optional[Path] = None,
+        calendar_path: Optional[Path] = None,
+        cache_entries: int = CACHE_ENTRIES,
+        today: Callable[[], dt.date] = dt.date.today,
+    ):
+        root = Path(paths.DATA_DIR).parent
+        self.data_dir = data_dir
+        self.xis_path = Path(xis_path or root / "diverse_english_xis.json")
+        self.calendar_path = Path(calendar_path or root / "puzzle_calendar.json")
+        self.today = today
+        self.cache = LRUCache(cache_entries)
+        self.requests = 0
+        self.started = time.time()
+        self.engine: Optional[QueryEngine] = None
+        # Bumped by every load, so a response rendered from older data is not cached.
+        self.generation = 0
+        # Executor renders in flight per generation they started in, and the
+        # engines replaced by a reload that such a render may still be reading.
+        self._renders: Dict[int, int] = {}
+        self._retired: List[Tuple[int, QueryEngine]] = []
+        self.load()
+
+    def _sources(self) -> List[str]:
+        return [paths.table_path(self.data_dir), paths.scorers_path(self.data_dir), str(self.xis_path), str(self.calendar_path)]
+
+    def stamps(self) -> List[Optional[Tuple[int, int]]]:
+        stamps = []
+        for path in self._sources():
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamps.append(None)
+            else:
+                stamps.append((st.st_size, st.st_mtime_ns))
+        return stamps
+
+    def load(self) -> None:
+        """(Re)load every source and drop cached responses.
+
+        Nothing is replaced unless everything loads, so a failed reload (a
+        half-written file) keeps the old data and is retried on the next poll.
+        Every index is built here, so the executor threads only read them; the
+        old stores are closed once no render can still be reading them.
+        """
+        from .quiz import QuizBank
+
+        stamps = self.stamps()
+        engine = QueryEngine.open(self.data_dir)
+        try:
+            engine.warm()
+            bank = QuizBank(engine)
+            puzzles = self._load_puzzles()
+        except BaseException:
+            engine.close()
+            raise
+        if self.engine is not None:
+            self._retired.append((self.generation, self.engine))
+        self.engine, self.bank = engine, bank
+        self.xis, self.calendar = puzzles
+        self.modified = max(stamp[1] / 1e9 for stamp in stamps if stamp is not None)
+        self._stamps = stamps
+        self.generation += 1
+        self.cache.clear()
+        self._close_retired()
+
+    def _close_retired(self) -> None:
+        # A render started in generation g reads the engine of g or a later one.
+        oldest = min(self._renders, default=self.generation)
+        while self._retired and self._retired[0][0] < oldest:
+            self._retired.pop(0)[1].close()
+
+    def _load_puzzles(self) -> tuple:
+        from squadify.build import load_xis
+        from squadify.schedule import WINDOW_DAYS, Calendar, schedule, xi_key
+
+        if not self.xis_path.exists():
+            return {}, None
+        xis = load_xis(self.xis_path)
+        if self.calendar_path.exists():
+            calendar = Calendar.load(self.calendar_path)
+        else:
+            calendar = schedule(xis, WINDOW_DAYS, self.today())
+        return {xi_key(xi): xi for xi in xis}, calendar
+
+    def reload_if_changed(self) -> bool:
+        if self.stamps() == self._stamps:
+            return False
+        self.load()
+        return True
+
+    # Routing
+
+    def canonical(self, target: str) -> Tuple[str, Dict[str, str]]:
+        """Path and parameters with defaults that depend on the day resolved."""
+        parts = urlsplit(target)
+        path = unquote(parts.path).rstrip("/") or "/"
+        params = dict(parse_qsl(parts.query))
+        if path == "/puzzle/today":
+            path = f"/puzzle/{self.today().isoformat()}"
+        elif path == "/quiz" and not params.get("seed"):
+            params["seed"] = str(self.today().toordinal())
+        return path, params
+
+    def lookup(self, target: str) -> Tuple[str, Dict[str, str], Optional[str], Optional[Payload]]:
+        """Canonical path and parameters, cache key and cached payload (``None`` on a miss)."""
+        self.requests += 1
+        path, params = self.canonical(target)
+        if path == "/stats":
+            return path, params, None, Payload.encode(self.stats(), time.time())
+        key = path + ("?" + urlencode(sorted(params.items())) if params else "")
+        return path, params, key, self.cache.get(key)
+
+    def render(self, path: str, params: Dict[str, str]) -> Payload:
+        return Payload.encode(self.route(path, params), self.modified)
+
+    def get(self, target: str) -> Payload:
+        path, params, key, payload = self.lookup(target)
+        if payload is None:
+            payload = self.render(path, params)
+            self.cache.put(key, payload)
+        return payload
+
+    async def get_async(self, target: str) -> Payload:
+        """:meth:`get`, rendering cache misses in the default executor.
+
+        Cache hits are answered on the event loop; a slow miss (a large
+        quiz batch) no longer holds up every other connection.
+        """
+        path, params, key, payload = self.lookup(target)
+        if payload is None:
+            generation = self.generation
+            self._renders[generation] = self._renders.get(generation, 0) + 1
+            try:
+                payload = await asyncio.get_running_loop().run_in_executor(None, self.render, path, params)
+            finally:
+                self._renders[generation] -= 1
+                if not self._renders[generation]:
+                    del self._renders[generation]
+                    self._close_retired()
+            if self.generation == generation:
+                self.cache.put(key, payload)
+        return payload
+
+    def route(self, path: str, params: Dict[str, str]):
+        _, first, *rest = path.split("/", 2) + [""]
+        arg = rest[0] if rest else ""
+        if first == "puzzle" and arg:
+            return self.puzzle(arg)
+        if first == "club" and arg:
+            return self.club(arg)
+        if first == "player" and arg:
+            return self.player(arg)
+        if path == "/clubs/top":
+            return self.top_clubs(params)
+        if path == "/scorers/top":
+            return self.top_scorers(params)
+        if path == "/quiz":
+            return self.quiz(params)
+        raise HTTPError(404, f"no route for {path}")
+
+    def puzzle(self, day: str) -> dict:
+        from squadify.build import compact_xi
+
+        try:
+            date = dt.date.fromisoformat(day)
+        except ValueError:
+            raise HTTPError(400, "puzzle date must be YYYY-MM-DD") from None
+        if self.calendar is None or not self.calendar.days:
+            raise HTTPError(404, "no puzzle calendar")
+        index = self.calendar.index(date)
+        if not 0 <= index < len(self.calendar.days):
+            raise HTTPError(404, f"the calendar does not cover {date}")
+        xi = self.xis.get(self.calendar.days[index])
+        if xi is None:
+            raise HTTPError(404, f"the XI for {date} is no longer in the database")
+        return {"date": date.isoformat(), "day": index, "puzzle": compact_xi(xi)}
+
+    def club(self, name: str) -> dict:
+        rows = self.engine.club(name)
+        if not rows:
+            raise HTTPError(404, f"no club matches {name!r}")
+        return {"query": name, "rows": rows}
+
+    def player(self, name: str) -> dict:
+        rows = self.engine.player(name)
+        if not rows:
+            raise HTTPError(404, f"no scorer named {name!r}")
+        return {"query": name, "rows": rows}
+
+    def top_clubs(self, params: Dict[str, str]) -> dict:
+        by = _choice(params, "by", CLUB_SORT_COLUMNS, "points")
+        k = _int(params, "k", 10, 1, MAX_K)
+        where = _bounds(participations=_int(params, "min_participations"), matches=_int(params, "min_matches"))
+        clubs = self.engine.clubs
+        ids = clubs.top(by, k, where=where, ascending=params.get("asc") in ("1", "true"))
+        return {"by": by, "rows": clubs.rows(ids)}
+
+    def top_scorers(self, params: Dict[str, str]) -> dict:
+        by = _choice(params, "by", SCORER_SORT_COLUMNS, "goals")
+        k = _int(params, "k", 10, 1, MAX_K)
+        where = _bounds(matches=_int(params, "min_matches"))
+        match = {name: params[name] for name in ("club", "nationality") if params.get(name)}
+        relation = self.engine.scorers
+        if match:
+            ids = relation.select(where, match=match, order_by=by, ascending=False, limit=k)
+        else:
+            ids = relation.top(by, k, where=where)
+        return {"by": by, "rows": relation.rows(ids)}
+
+    def quiz(self, params: Dict[str, str]) -> dict:
+        from .quiz import generate
+
+        n = _int(params, "n", 100, 1, MAX_QUIZ)
+        seed = _int(params, "seed", 0)
+        return {"seed": seed, "questions": generate(n, seed=seed, bank=self.bank)}
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "cache": {"entries": len(self.cache), "capacity": self.cache.capacity,
+                      "hits": self.cache.hits, "misses": self.cache.misses},
+        }
+
+
+def _not_modified(payload: Payload, headers: Dict[str, str]) -> bool:
+    tags = headers.get("if-none-match")
+    if tags is not None:
+        return tags.strip() == "*" or payload.etag in (t.strip().lstrip("W/") for t in tags.split(","))
+    since = headers.get("if-modified-since")
+    if since:
+        try:
+            return parsedate_to_datetime(since).timestamp() >= payload.modified
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+    return False
+
+
+async def respond(app: App, method: str, target: str, headers: Dict[str, str]) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    """Status, headers and body for one request."""
+    if method not in ("GET", "HEAD"):
+        return _error(405, "only GET and HEAD are supported", [("Allow", "GET, HEAD")])
+    try:
+        payload = await app.get_async(target)
+    except HTTPError as exc:
+        return _error(exc.status, str(exc))
+    except Exception as exc:  # keep serving; report the failure to the client
+        return _error(500, f"{type(exc).__name__}: {exc}")
+
+    out = [("ETag", payload.etag), ("Last-Modified", payload.last_modified), ("Cache-Control", CACHE_CONTROL),
+           ("Vary", "Accept-Encoding")]
+    if _not_modified(payload, headers):
+        return 304, out, b""
+    body = payload.body
+    if payload.gzip is not None and "gzip" in headers.get("accept-encoding", ""):
+        body = payload.gzip
+        out.append(("Content-Encoding", "gzip"))
+    out.append(("Content-Type", "application/json; charset=utf-8"))
+    return 200, out, body
+
+
+def _error(status: int, message: str, extra=()) -> Tuple[int, List[Tuple[str, str]], bytes]:
+    body = json.dumps({"error": message}).encode("utf-8")
+    return status, [("Content-Type", "application/json; charset=utf-8"), ("Cache-Control", "no-store"), *extra], body
+
+
+def _response_bytes(status: int, headers, body: bytes, keep_alive: bool, head: bool) -> bytes:
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+    lines.extend(f"{name}: {value}" for name, value in headers)
+    lines.append(f"Content-Length: {len(body)}")
+    if not keep_alive:
+        lines.append("Connection: close")
+    head_bytes = ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+    return head_bytes if head or status == 304 else head_bytes + body
+
+
+async def _handle(app: App, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        while True:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except asyncio.LimitOverrunError:
+                writer.write(_response_bytes(*_error(431, "request headers too large"), keep_alive=False, head=False))
+                break
+            except (asyncio.IncompleteReadError, ConnectionError):
+                break
+            lines = head.decode("latin-1").split("\r\n")
+            try:
+                method, target, version = lines[0].split(" ", 2)
+            except ValueError:
+                writer.write(_response_bytes(*_error(400, "malformed request line"), keep_alive=False, head=False))
+                break
+            headers = {}
+            for line in lines[1:]:
+                name, sep, value = line.partition(":")
+                if sep:
+                    headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length") or 0)
+            if length:
+                await reader.readexactly(length)  # bodies are ignored
+            connection = headers.get("connection", "").lower()
+            keep_alive = connection == "keep-alive" if version == "HTTP/1.0" else connection != "close"
+
+            status, out, body = await respond(app, method, target, headers)
+            writer.write(_response_bytes(status, out, body, keep_alive, method == "HEAD"))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def _watch(app: App, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            app.reload_if_changed()
+        except Exception as exc:  # half-written file: keep the old data, try again later
+            print(f"reload failed: {exc}", flush=True)
+
+
+async def serve(app: App, host: str = "127.0.0.1", port: int = DEFAULT_PORT, reload_interval: float = 2.0,
+                ready: Optional[Callable[[int], None]] = None) -> None:
+    """Serve ``app`` until cancelled; ``ready`` is called with the bound port."""
+    server = await asyncio.start_server(lambda r, w: _handle(app, r, w), host, port, limit=MAX_HEADER_BYTES)
+    watcher = asyncio.ensure_future(_watch(app, reload_interval)) if reload_interval > 0 else None
+    try:
+        if ready is not None:
+            ready(server.sockets[0].getsockname()[1])
+        async with server:
+            await server.serve_forever()
+    finally:
+        if watcher is not None:
+            watcher.cancel()
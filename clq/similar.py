@@ -0,0 +1,276 @@
+"""Nearest-neighbour search over club records ("clubs like Qarabağ FK").
+
+:func:`club_features` turns table columns into a feature matrix: win, draw
+and loss rates, goals scored and goal difference per match, points per
+tournament and ``log1p`` participations. Each feature is z-scored, so no
+single scale dominates the Euclidean distance.
+
+:class:`KDTree` indexes the rows. It splits on the widest dimension at the
+median until buckets hold at most ``leaf_size`` rows, and keeps each
+bucket's bounding box and padded coordinate block. Queries are answered in
+batches without a per-query Python loop:
+
+* :meth:`KDTree.query` (k nearest): distances from every query to every
+  bucket's box are computed as one matrix. The queries then visit buckets
+  in increasing box distance, one vectorized round per bucket rank. A
+  query stops once its next box is farther than its current k-th
+  neighbour, so the result is exact;
+* :meth:`KDTree.query_radius`: the (query, bucket) pairs whose box is
+  within the radius are gathered in one step and filtered by true
+  distance.
+
+Queries go through in chunks, so memory stays bounded at hundreds of
+thousands of rows. :class:`ClubIndex` ties the tree to club names.
+:class:`clq.quiz.QuizBank` uses it to pick plausible wrong answers: the
+clubs whose records are closest to the right one.
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .resolve import ClubResolver
+from .store import INT_NULL
+
+FEATURES = ("win_rate", "draw_rate", "loss_rate", "goals_per_match", "gd_per_match", "points_per_tournament",
+            "participations")
+# Minimum bucket size; larger trees use about sqrt(rows) so the (queries x
+# buckets) box matrix and the per-round (queries x bucket) blocks stay balanced.
+LEAF_SIZE = 32
+# Queries (or query/bucket pairs) per vectorized block; bounds temporary memory.
+QUERY_CHUNK = 256
+# Buckets ranked per query up front; queries that need more get a full sort.
+FIRST_ROUNDS = 8
+
+
+def _float(column: np.ndarray) -> np.ndarray:
+    if column.dtype.kind == "f":
+        return column.astype(np.float64)
+    values = column.astype(np.float64)
+    values[column == INT_NULL] = np.nan
+    return values
+
+
+def club_features(columns: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Unscaled ``(rows, len(FEATURES))`` matrix from table columns.
+
+    Missing points per tournament (the table leaves it blank for some
+    clubs) are recomputed from points and participations.
+    """
+    c = {name: _float(np.asarray(columns[name])) for name in
+         ("matches", "wins", "draws", "losses", "goals_for", "goal_difference", "points", "participations",
+          "points_per_tournament")}
+    matches = np.where(c["matches"] > 0, c["matches"], np.nan)
+    participations = np.where(c["participations"] > 0, c["participations"], np.nan)
+    ppt = np.where(np.isnan(c["points_per_tournament"]), c["points"] / participations, c["points_per_tournament"])
+    matrix = np.column_stack([
+        c["wins"] / matches,
+        c["draws"] / matches,
+        c["losses"] / matches,
+        c["goals_for"] / matches,
+        c["goal_difference"] / matches,
+        ppt,
+        np.log1p(c["participations"]),
+    ])
+    return np.nan_to_num(matrix, nan=0.0)
+
+
+def standardize(matrix: np.ndarray, weights: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Z-scored ``matrix`` (times ``weights``) with the mean and scale used."""
+    mean = matrix.mean(axis=0)
+    scale = matrix.std(axis=0)
+    scale[scale == 0] = 1.0
+    if weights is not None:
+        scale = scale / np.asarray(weights, dtype=np.float64)
+    return (matrix - mean) / scale, mean, scale
+
+
+class KDTree:
+    """Bucketed k-d tree with batched, exact k-NN and radius queries."""
+
+    def __init__(self, points: np.ndarray, leaf_size: Optional[int] = None):
+        points = np.ascontiguousarray(points, dtype=np.float64)
+        n, d = points.shape
+        if leaf_size is None:
+            leaf_size = max(LEAF_SIZE, int(np.sqrt(n)))
+        self.points = points
+        self.leaf_size = leaf_size
+        buckets: List[np.ndarray] = []
+        stack = [np.arange(n)]
+        while stack:
+            ids = stack.pop()
+            if len(ids) <= leaf_size:
+                buckets.append(ids)
+                continue
+            block = points[ids]
+            dim = int(np.argmax(block.max(axis=0) - block.min(axis=0)))
+            half = len(ids) // 2
+            order = np.argpartition(block[:, dim], half)
+            stack.append(ids[order[half:]])
+            stack.append(ids[order[:half]])
+
+        n_buckets = len(buckets)
+        self.bucket_ids = np.full((n_buckets, leaf_size), -1, dtype=np.int64)
+        for b, ids in enumerate(buckets):
+            self.bucket_ids[b, :len(ids)] = ids
+        # Padding slots sit at infinity so they never win a comparison.
+        padded = np.vstack([points, np.full((1, d), np.inf)])
+        self.bucket_points = padded[self.bucket_ids]
+        self.box_min = np.array([points[ids].min(axis=0) for ids in buckets]).reshape(n_buckets, d)
+        self.box_max = np.array([points[ids].max(axis=0) for ids in buckets]).reshape(n_buckets, d)
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _box_distances(self, queries: np.ndarray) -> np.ndarray:
+        """Squared distance from each query to each bucket's bounding box."""
+        shape = (len(queries), len(self.box_min))
+        out = np.zeros(shape)
+        below, above = np.empty(shape), np.empty(shape)
+        for dim in range(queries.shape[1]):
+            q = queries[:, dim:dim + 1]
+            np.subtract(self.box_min[:, dim], q, out=below)
+            np.subtract(q, self.box_max[:, dim], out=above)
+            np.maximum(below, above, out=below)
+            np.maximum(below, 0.0, out=below)
+            np.multiply(below, below, out=below)
+            out += below
+        return out
+
+    def _visit(self, queries: np.ndarray, buckets: np.ndarray, best_d: np.ndarray, best_i: np.ndarray) -> None:
+        """Merge the points of ``buckets[j]`` into the k best of query ``j`` (in place)."""
+        k = best_d.shape[1]
+        diff = self.bucket_points[buckets] - queries[:, None, :]
+        dist = np.einsum("qsd,qsd->qs", diff, diff)
+        dist = np.where(np.isnan(dist), np.inf, dist)
+        all_d = np.concatenate([best_d, dist], axis=1)
+        all_i = np.concatenate([best_i, self.bucket_ids[buckets]], axis=1)
+        keep = np.argpartition(all_d, k - 1, axis=1)[:, :k]
+        best_d[:] = np.take_along_axis(all_d, keep, axis=1)
+        best_i[:] = np.take_along_axis(all_i, keep, axis=1)
+
+    def _query_chunk(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        boxes = self._box_distances(queries)
+        n_buckets = boxes.shape[1]
+        first = min(FIRST_ROUNDS, n_buckets)
+        if first < n_buckets:
+            ranked = np.argpartition(boxes, first - 1, axis=1)[:, :first]
+        else:
+            ranked = np.broadcast_to(np.arange(n_buckets), boxes.shape)
+        ranked = np.take_along_axis(ranked, np.argsort(np.take_along_axis(boxes, ranked, axis=1), axis=1), axis=1)
+
+        best_d = np.full((len(queries), k), np.inf)
+        best_i = np.full((len(queries), k), -1, dtype=np.int64)
+        active = np.arange(len(queries))
+        for round_ in range(n_buckets):
+            if round_ == first:
+                # Rare: these queries still have candidates beyond the first buckets.
+                ranked = np.zeros((len(queries), n_buckets), dtype=np.int64)
+                ranked[active] = np.argsort(boxes[active], axis=1)
+            bucket = ranked[active, round_]
+            worst = best_d[active].max(axis=1)
+            active = active[boxes[active, bucket] <= worst]
+            if not len(active):
+                break
+            sub_d, sub_i = best_d[active], best_i[active]
+            self._visit(queries[active], ranked[active, round_], sub_d, sub_i)
+            best_d[active], best_i[active] = sub_d, sub_i
+
+        order = np.argsort(best_d, axis=1, kind="stable")
+        return np.sqrt(np.take_along_axis(best_d, order, axis=1)), np.take_along_axis(best_i, order, axis=1)
+
+    def query(self, queries: np.ndarray, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """Distances and row ids of the ``k`` nearest rows to each query, nearest first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+        k = min(k, len(self))
+        dist = np.empty((len(queries), k))
+        ids = np.empty((len(queries), k), dtype=np.int64)
+        for start in range(0, len(queries), QUERY_CHUNK):
+            stop = start + QUERY_CHUNK
+            dist[start:stop], ids[start:stop] = self._query_chunk(queries[start:stop], k)
+        return dist, ids
+
+    def query_radius(self, queries: np.ndarray, radius: float) -> List[np.ndarray]:
+        """Row ids within ``radius`` of each query, nearest first."""
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float64))
+        out: List[np.ndarray] = []
+        r2 = radius * radius
+        for start in range(0, len(queries), QUERY_CHUNK):
+            chunk = queries[start:start + QUERY_CHUNK]
+            q, bucket = np.nonzero(self._box_distances(chunk) <= r2)
+            owners, found, dists = [], [], []
+            for lo in range(0, len(q), QUERY_CHUNK):
+                pq, pb = q[lo:lo + QUERY_CHUNK], bucket[lo:lo + QUERY_CHUNK]
+                diff = self.bucket_points[pb] - chunk[pq][:, None, :]
+                dist = np.einsum("psd,psd->ps", diff, diff)
+                hit_pair, hit_slot = np.nonzero(dist <= r2)
+                owners.append(pq[hit_pair])
+                found.append(self.bucket_ids[pb[hit_pair], hit_slot])
+                dists.append(dist[hit_pair, hit_slot])
+            owner = np.concatenate(owners) if owners else np.empty(0, dtype=np.int64)
+            ids = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+            d = np.concatenate(dists) if dists else np.empty(0)
+            order = np.lexsort((ids, d, owner))
+            owner, ids = owner[order], ids[order]
+            bounds = np.searchsorted(owner, np.arange(len(chunk) + 1))
+            out.extend(ids[bounds[i]:bounds[i + 1]] for i in range(len(chunk)))
+        return out
+
+
+class Neighbour(NamedTuple):
+    club: str
+    distance: float
+    index: int
+
+
+class ClubIndex:
+    """k-d tree over standardized club features, addressed by club name."""
+
+    def __init__(self, names: Sequence[str], columns: Mapping[str, np.ndarray],
+                 weights: Optional[Sequence[float]] = None, leaf_size: Optional[int] = None):
+        self.names = list(names)
+        self.features, self.mean, self.scale = standardize(club_features(columns), weights)
+        self.tree = KDTree(self.features, leaf_size)
+        self._resolver: Optional[ClubResolver] = None
+
+    @classmethod
+    def from_relation(cls, clubs, **kwargs) -> "ClubIndex":
+        """Index over a :class:`clq.query.Relation` of table rows (``QueryEngine.clubs``)."""
+        columns: Dict[str, np.ndarray] = {name: clubs.column(name) for name in
+                                          ("matches", "wins", "draws", "losses", "goals_for", "goal_difference",
+                                           "points", "participations", "points_per_tournament")}
+        return cls(clubs.store.text("club"), columns, **kwargs)
+
+    def find(self, name: str) -> int:
+        if self._resolver is None:
+            self._resolver = ClubResolver(self.names)
+        match = self._resolver.resolve(name)
+        if match is None:
+            raise KeyError(f"no club matches {name!r}")
+        return match.index
+
+    def neighbours(self, rows, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """``k`` nearest other clubs for each row id in ``rows`` (the row itself
+        excluded), fewer when the table has no ``k`` other clubs."""
+        rows = np.atleast_1d(np.asarray(rows, dtype=np.int64))
+        k = min(k, len(self.names) - 1)
+        dist, ids = self.tree.query(self.features[rows], k + 1)
+        # Drop the row itself; if it tied with another club it may not be first.
+        own = ids == rows[:, None]
+        own[~own.any(axis=1), -1] = True
+        keep = np.argsort(own, axis=1, kind="stable")[:, :k]
+        return np.take_along_axis(dist, keep, axis=1), np.take_along_axis(ids, keep, axis=1)
+
+    def similar(self, name: str, k: int = 5) -> List[Neighbour]:
+        row = self.find(name)
+        dist, ids = self.neighbours([row], k)
+        return [Neighbour(self.names[i], float(d), int(i)) for d, i in zip(dist[0], ids[0])]
+
+    def within(self, name: str, radius: float) -> List[Neighbour]:
+        row = self.find(name)
+        ids = self.tree.query_radius(self.features[row], radius)[0]
+        ids = ids[ids != row]
+        dist = np.sqrt(((self.features[ids] - self.features[row]) ** 2).sum(axis=1))
+        return [Neighbour(self.names[i], float(d), int(i)) for d, i in zip(dist, ids)]
@@ -0,0 +1,95 @@
+"""Readers for the CLQ table and scorer list in their published text formats."""
+
+from __future__ import annotations
+
+import csv
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from . import paths
+from .ingest import FIELDS as TABLE_COLUMNS
+from .paths import DATA_DIR, SCORERS_FILE, TABLE_FILE  # noqa: F401
+
+SCORERS_HEADER = (
+    "Rank",
+    "Player",
+    "Position",
+    "Club(s)",
+    "Nationality",
+    "Age",
+    "Seasons",
+    "Matches",
+    "SubOn",
+    "SubOff",
+    "Assists",
+    "Penalties",
+    "Goals",
+)
+SCORER_COLUMNS = (
+    "rank",
+    "player",
+    "position",
+    "club",
+    "nationality",
+    "age",
+    "seasons",
+    "matches",
+    "sub_on",
+    "sub_off",
+    "assists",
+    "penalties",
+    "goals",
+)
+SCORER_TEXT_COLUMNS = ("player", "position", "club", "nationality")
+
+# The scorer export writes "-" for "not recorded".
+MISSING = "-"
+
+
+def table_path(data_dir: Optional[Path] = None) -> Path:
+    return Path(paths.table_path(data_dir))
+
+
+def scorers_path(data_dir: Optional[Path] = None) -> Path:
+    return Path(paths.scorers_path(data_dir))
+
+
+def load_table(path: Optional[Path] = None) -> List[dict]:
+    with open(path or table_path(), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _int_or_none(value: str) -> Optional[int]:
+    value = value.strip()
+    return None if value == MISSING or not value else int(value)
+
+
+def iter_scorers(lines: Iterable[str]) -> Iterator[dict]:
+    """Yield scorer records from CSV lines, mapping "-" to ``None``.
+
+    The published CSV repeats its last page of results several times, so rows
+    identical to one already seen are skipped.
+    """
+    reader = csv.reader(lines)
+    header = tuple(next(reader, ()))
+    if header != SCORERS_HEADER:
+        raise ValueError(f"unexpected scorer CSV header: {header!r}")
+    seen = set()
+    for row in reader:
+        if not row:
+            continue
+        key = tuple(row)
+        if key in seen:
+            continue
+        seen.add(key)
+        record = dict(zip(SCORER_COLUMNS, row))
+        for name in SCORER_COLUMNS:
+            if name not in SCORER_TEXT_COLUMNS:
+                record[name] = _int_or_none(record[name])
+        yield record
+
+
+def load_scorers(path: Optional[Path] = None) -> List[dict]:
+    with open(path or scorers_path(), encoding="utf-8", newline="") as f:
+        return list(iter_scorers(f))
@@ -0,0 +1,289 @@
+"""Memory-mapped columnar store for the CLQ table and the scorer list.
+
+File layout (little endian)::
+
+    magic "CLQS" | u16 version | u16 reserved | u32 directory length | 4 pad
+    directory    JSON: meta, column descriptors, string table descriptor
+    data         8-byte aligned column arrays, string offsets, string blob
+
+Numeric columns are fixed-width arrays read as zero-copy NumPy views over the
+mapping. Text columns hold ``int32`` codes into one interned string table
+shared by every text column (``-1`` is missing). Because the file is mapped
+read-only, forked workers share the same page-cache pages.
+
+``open_table``/``open_scorers`` return a store for the JSON/CSV sources
+(:func:`open_dataset` does the same for any other source), rebuilding it from
+those sources whenever their size or mtime no longer match the stamp
+recorded in the store.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+from . import sources
+
+MAGIC = b"CLQS"
+VERSION = 1
+SUFFIX = ".clqs"
+INT_NULL = np.iinfo(np.int32).min
+
+_HEADER = struct.Struct("<4sHHI4x")
+_ALIGN = 8
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def pack(columns: Mapping[str, object], meta: Optional[dict] = None) -> bytes:
+    """Serialize columns to the store format.
+
+    Values that are NumPy arrays are stored as-is; any other sequence is
+    treated as text (``str`` or ``None``) and interned.
+    """
+    strings: Dict[str, int] = {}
+    arrays = []
+    for name, values in columns.items():
+        if isinstance(values, np.ndarray):
+            arrays.append((name, "num", np.ascontiguousarray(values)))
+        else:
+            codes = np.fromiter(
+                (-1 if v is None else strings.setdefault(v, len(strings)) for v in values),
+                dtype=np.int32,
+                count=len(values),
+            )
+            arrays.append((name, "str", codes))
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    blob = b"".join(encoded)
+
+    # Offsets are relative to the start of the data section, which follows
+    # the (padded) directory.
+    layout = []
+    position = 0
+    for name, kind, array in arrays:
+        layout.append({"name": name, "kind": kind, "dtype": array.dtype.str, "offset": position, "length": len(array)})
+        position += array.nbytes + _pad(array.nbytes)
+    string_offsets = {"dtype": offsets.dtype.str, "offset": position, "length": len(offsets)}
+    position += offsets.nbytes
+    string_blob = {"offset": position, "length": len(blob)}
+
+    directory = {"meta": meta or {}, "columns": layout, "string_offsets": string_offsets, "string_blob": string_blob}
+    raw = json.dumps(directory, separators=(",", ":")).encode("utf-8")
+
+    parts = [_HEADER.pack(MAGIC, VERSION, 0, len(raw)), raw, b"\0" * _pad(_HEADER.size + len(raw))]
+    for _, _, array in arrays:
+        parts.append(array.tobytes())
+        parts.append(b"\0" * _pad(array.nbytes))
+    parts.append(offsets.tobytes())
+    parts.append(blob)
+    return b"".join(parts)
+
+
+def write_store(path: Path, columns: Mapping[str, object], meta: Optional[dict] = None) -> Path:
+    """Write a store atomically, so readers never map a half-written file."""
+    path = Path(path)
+    data = pack(columns, meta)
+    fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return path
+
+
+class Store:
+    """Read-only view over a serialized store (a file mapping or bytes)."""
+
+    def __init__(self, buffer, path: Optional[Path] = None):
+        self.path = path
+        self._buffer = buffer
+        magic, version, _, dir_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path or 'buffer'} is not a CLQ store")
+        if version != VERSION:
+            raise ValueError(f"{path or 'buffer'} has store version {version}, expected {VERSION}")
+        directory = json.loads(bytes(buffer[_HEADER.size:_HEADER.size + dir_len]))
+        base = _HEADER.size + dir_len + _pad(_HEADER.size + dir_len)
+        self.meta: dict = directory["meta"]
+        self._columns = {entry["name"]: entry for entry in directory["columns"]}
+        for entry in self._columns.values():
+            entry["offset"] += base
+        so = directory["string_offsets"]
+        self._string_offsets = np.frombuffer(buffer, dtype=so["dtype"], count=so["length"], offset=base + so["offset"])
+        sb = directory["string_blob"]
+        start = base + sb["offset"]
+        self._blob = memoryview(buffer)[start:start + sb["length"]]
+        self._strings: Optional[List[str]] = None
+        self._string_index: Optional[Dict[str, int]] = None
+        self._text: Dict[str, List[Optional[str]]] = {}
+
+    @classmethod
+    def open(cls, path: Path) -> "Store":
+        with open(path, "rb") as f:
+            mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(mapping, Path(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        self._text.clear()
+        self._strings = None
+        self._blob.release()
+        if isinstance(self._buffer, mmap.mmap):
+            try:
+                self._buffer.close()
+            except BufferError:
+                # Views handed out by column() are still alive; the mapping is
+                # released when they are garbage collected.
+                pass
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._columns)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __len__(self) -> int:
+        return int(self.meta.get("rows", 0))
+
+    def is_text(self, name: str) -> bool:
+        return self._columns[name]["kind"] == "str"
+
+    def column(self, name: str) -> np.ndarray:
+        """Zero-copy array for a column (string codes for text columns)."""
+        entry = self._columns[name]
+        return np.frombuffer(self._buffer, dtype=entry["dtype"], count=entry["length"], offset=entry["offset"])
+
+    __getitem__ = column
+
+    def string(self, code: int) -> Optional[str]:
+        if code < 0:
+            return None
+        start, end = self._string_offsets[code], self._string_offsets[code + 1]
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    @property
+    def strings(self) -> List[str]:
+        """The whole interned string table, decoded once."""
+        if self._strings is None:
+            offsets = self._string_offsets.tolist()
+            blob = bytes(self._blob)
+            self._strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+        return self._strings
+
+    def code(self, value: str) -> int:
+        """Code of ``value`` in the string table, or -1 if it is not interned."""
+        if self._string_index is None:
+            self._string_index = {s: i for i, s in enumerate(self.strings)}
+        return self._string_index.get(value, -1)
+
+    def text(self, name: str) -> List[Optional[str]]:
+        """Decoded values of a text column."""
+        if name not in self._text:
+            table = self.strings
+            self._text[name] = [table[c] if c >= 0 else None for c in self.column(name).tolist()]
+        return self._text[name]
+
+    def row(self, index: int) -> dict:
+        """One row as plain Python values, with nulls mapped back to ``None``."""
+        record = {}
+        for name, entry in self._columns.items():
+            value = self.column(name)[index]
+            if entry["kind"] == "str":
+                record[name] = self.string(int(value))
+            elif value.dtype.kind == "f":
+                record[name] = None if np.isnan(value) else float(value)
+            else:
+                record[name] = None if value == INT_NULL else int(value)
+        return record
+
+
+def _int_column(records: Sequence[dict], name: str) -> np.ndarray:
+    return np.fromiter(
+        (INT_NULL if r[name] is None else r[name] for r in records), dtype=np.int32, count=len(records)
+    )
+
+
+def table_columns(records: Sequence[dict]) -> Dict[str, object]:
+    columns: Dict[str, object] = {}
+    for name in sources.TABLE_COLUMNS:
+        if name == "club":
+            columns[name] = [r[name] for r in records]
+        elif name == "points_per_tournament":
+            columns[name] = np.array([np.nan if r[name] is None else r[name] for r in records], dtype=np.float64)
+        else:
+            columns[name] = _int_column(records, name)
+    return columns
+
+
+def scorer_columns(records: Sequence[dict]) -> Dict[str, object]:
+    columns: Dict[str, object] = {}
+    for name in sources.SCORER_COLUMNS:
+        if name in sources.SCORER_TEXT_COLUMNS:
+            columns[name] = [r[name] for r in records]
+        else:
+            columns[name] = _int_column(records, name)
+    return columns
+
+
+def _stamp(path: Path) -> List[int]:
+    st = os.stat(path)
+    return [st.st_size, st.st_mtime_ns]
+
+
+def open_dataset(name: str, source: Path, load, to_columns, store_dir: Optional[Path] = None) -> Store:
+    """Open the ``<name>.clqs`` store for ``source``, rebuilding it when stale.
+
+    ``load`` parses the source into records and ``to_columns`` turns them into
+    the columns passed to :func:`pack`.
+    """
+    source = Path(source)
+    store_path = Path(store_dir or source.parent) / (name + SUFFIX)
+    stamp = _stamp(source)
+    try:
+        store = Store.open(store_path)
+    except (OSError, ValueError):
+        store = None
+    if store is not None:
+        if store.meta.get("source_stamp") == stamp and store.meta.get("source") == source.name:
+            return store
+        store.close()
+
+    records = load(source)
+    columns = to_columns(records)
+    meta = {"dataset": name, "source": source.name, "source_stamp": stamp, "rows": len(records)}
+    try:
+        write_store(store_path, columns, meta)
+    except OSError:
+        # Read-only data directory: serve the freshly parsed data from memory.
+        return Store(pack(columns, meta))
+    return Store.open(store_path)
+
+
+def open_table(data_dir: Optional[Path] = None, store_dir: Optional[Path] = None) -> Store:
+    return open_dataset("clq_table", sources.table_path(data_dir), sources.load_table, table_columns, store_dir)
+
+
+def open_scorers(data_dir: Optional[Path] = None, store_dir: Optional[Path] = None) -> Store:
+    return open_dataset("scorers", sources.scorers_path(data_dir), sources.load_scorers, scorer_columns, store_dir)
@@ -0,0 +1,112 @@
+"""Build the English League Squadify game from diverse_english_xis.json.
+
+Usage:
+    python create_embedded_game.py [--xis diverse_english_xis.json] [--calendar puzzle_calendar.json]
+                                   [--date YYYY-MM-DD] [--days 366] [--out dist] [--per-shard]
+                                   [--min-saving 0.95]
+                                   [--profile] [--profile-out PATH] [--cprofile PATH]
+
+Writes dist/index.html (the game shell, with its first days inlined),
+dist/puzzles/calendar-<hash>.json (the calendar window from --date) and
+dist/puzzles/<hash>.json shards, all with .gz/.br siblings, then prints the
+size of each artifact and the first-load saving against the old single-file
+english_squadify_complete.html. The build fails if the raw first-load saving
+is below --min-saving. Without a calendar file (see diverse_xi_builder.py)
+the window is scheduled on the fly. --profile (or CLQ_PROFILE) reports
+per-stage timings and memory as JSON on stderr, or to --profile-out PATH
+(see clq.instrument).
+"""
+import argparse
+import datetime as dt
+import gzip
+import sys
+from pathlib import Path
+
+from clq import instrument
+from squadify.build import build_game, load_xis
+from squadify.schedule import WINDOW_DAYS, Calendar, resolve, schedule
+
+HERE = Path(__file__).resolve().parent
+
+
+def _pct(new, old):
+    return f"{100 * (1 - new / old):.1f}%"
+
+
+def _written(report):
+    files = [report["shell"], report["calendar"], *report["per_shard"]]
+    return sum(f["raw"] + f["gzip"] + (f["brotli"] or 0) for f in files)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the Squadify shell and daily puzzle shards.")
+    parser.add_argument("--xis", type=Path, default=HERE / "diverse_english_xis.json")
+    parser.add_argument("--calendar", type=Path, default=HERE / "puzzle_calendar.json")
+    parser.add_argument("--date", type=dt.date.fromisoformat, default=dt.date.today(), help="first day to embed")
+    parser.add_argument("--days", type=int, default=WINDOW_DAYS, help="number of calendar days to embed")
+    parser.add_argument("--out", type=Path, default=HERE / "dist")
+    parser.add_argument("--legacy", type=Path, default=HERE / "english_squadify_complete.html",
+                        help="single-file build to compare first-load bytes against")
+    parser.add_argument("--per-shard", action="store_true", help="print the size of every shard")
+    parser.add_argument("--min-saving", type=float, default=0.95,
+                        help="fail if the raw first-load saving against --legacy is below this fraction")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with instrument.Profiler.from_args("create_embedded_game", args) as profiler:
+        return _build(args, profiler)
+
+
+def _build(args, profiler):
+    with profiler.stage("load_xis") as stage:
+        xis = load_xis(args.xis)
+        stage.rows = len(xis)
+    with profiler.stage("calendar") as stage:
+        if args.calendar.exists():
+            window = Calendar.load(args.calendar).window(args.date, args.days)
+            if len(window.days) < args.days:
+                print(f"warning: {args.calendar} covers only {len(window.days)} of {args.days} days from {args.date};"
+                      " extend it with diverse_xi_builder.py", file=sys.stderr)
+            if not window.days:
+                return 1
+        else:
+            window = schedule(xis, args.days, args.date)
+            stage.count("scheduled")
+        stage.rows = len(window.days)
+    with profiler.stage("build") as stage:
+        report = build_game(resolve(window, xis), args.out, window.start)
+        stage.rows = report["days"]
+        stage.count("shards", report["shards"])
+        stage.bytes = _written(report)
+
+    shell = report["shell"]
+    calendar = report["calendar"]
+    shards = report["shard_bytes"]
+    print(f"{report['days']} days from {report['start']} -> {report['shards']} shards in {args.out}")
+    print(f"players: {report['player_slots']} slots, {report['distinct_players']} distinct ids")
+    print(f"shell    index.html  raw {shell['raw']:>7}  gzip {shell['gzip']:>6}  brotli {shell['brotli'] or '-':>6}"
+          f"  ({report['inline_days']} days inlined)")
+    print(f"calendar             raw {calendar['raw']:>7}  gzip {calendar['gzip']:>6}  brotli {calendar['brotli'] or '-':>6}"
+          f"  ({calendar['name']})")
+    print(f"shards   mean        raw {shards['raw_mean']:>7}  gzip {shards['gzip_mean']:>6}  brotli {shards['brotli_mean'] or '-':>6}"
+          f"  (max raw {shards['raw_max']})")
+    if args.per_shard:
+        for shard in report["per_shard"]:
+            print(f"  {shard['name']:<16} raw {shard['raw']:>5}  gzip {shard['gzip']:>5}  brotli {shard['brotli'] or '-':>5}")
+
+    first = report["first_load"]
+    if args.legacy.exists():
+        legacy = args.legacy.read_bytes()
+        legacy_gz = len(gzip.compress(legacy, 9))
+        # What a visitor downloads is compressed, so that figure leads.
+        print(f"first load gzip {first['gzip']:>7} vs {legacy_gz:>7}  ({_pct(first['gzip'], legacy_gz)} smaller)")
+        print(f"first load raw  {first['raw']:>7} vs {len(legacy):>7}  ({_pct(first['raw'], len(legacy))} smaller, uncompressed)")
+        if 1 - first["raw"] / len(legacy) < args.min_saving:
+            print(f"error: raw first-load saving is below the {args.min_saving:.0%} target", file=sys.stderr)
+            return 1
+    else:
+        print(f"first load gzip {first['gzip']}  raw {first['raw']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Build or extend the Squadify puzzle calendar.
+
+Usage:
+    python diverse_xi_builder.py [--xis diverse_english_xis.json] [--calendar puzzle_calendar.json]
+                                 [--years 10] [--start YYYY-MM-DD] [--keep-until YYYY-MM-DD]
+                                 [--profile] [--profile-out PATH] [--cprofile PATH]
+
+Without a calendar file, schedules ``--years`` of days from ``--start``
+(default: today). With one, keeps every day before ``--keep-until`` (default:
+today plus the window a game build embeds, since those days may already be
+live) and reschedules the rest over the current XI list, so new XIs are
+worked in without touching published days. Prints the repeat spacing of
+teams, leagues, seasons and players next to the old ``dayOfYear % length``
+rotation. --profile (or CLQ_PROFILE) reports per-stage timings and memory
+as JSON on stderr, or to --profile-out PATH (see clq.instrument).
+"""
+import argparse
+import datetime as dt
+import sys
+from pathlib import Path
+
+from clq import instrument
+from squadify.build import load_xis
+from squadify.schedule import WINDOW_DAYS, Calendar, extend, schedule, spacing, xi_key
+
+HERE = Path(__file__).resolve().parent
+
+
+def _date(text):
+    return dt.date.fromisoformat(text)
+
+
+def _days(start, years):
+    try:
+        end = start.replace(year=start.year + years)
+    except ValueError:  # 29 February
+        end = start.replace(year=start.year + years, day=28)
+    return (end - start).days
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or extend the daily puzzle calendar.")
+    parser.add_argument("--xis", type=Path, default=HERE / "diverse_english_xis.json")
+    parser.add_argument("--calendar", type=Path, default=HERE / "puzzle_calendar.json")
+    parser.add_argument("--years", type=int, default=10, help="calendar length from its start date")
+    parser.add_argument("--start", type=_date, help="first day of a new calendar (default: today)")
+    parser.add_argument("--keep-until", type=_date, help="keep existing days before this date")
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    with instrument.Profiler.from_args("diverse_xi_builder", args) as profiler:
+        return _build(args, profiler)
+
+
+def _build(args, profiler):
+    with profiler.stage("load_xis") as stage:
+        xis = load_xis(args.xis)
+        stage.rows = len(xis)
+    today = dt.date.today()
+    with profiler.stage("schedule") as stage:
+        if args.calendar.exists():
+            calendar = Calendar.load(args.calendar)
+            keep_until = args.keep_until or today + dt.timedelta(days=WINDOW_DAYS)
+            calendar = extend(calendar, xis, _days(calendar.start, args.years), keep_until)
+            kept = min(len(calendar.days), max(0, calendar.index(keep_until)))
+            print(f"kept {kept} published days, scheduled {len(calendar.days) - kept} from {calendar.date(kept)}")
+        else:
+            kept = 0
+            start = args.start or today
+            calendar = schedule(xis, _days(start, args.years), start)
+            print(f"scheduled {len(calendar.days)} days from {start}")
+        stage.rows = len(calendar.days) - kept
+        stage.count("kept", kept)
+    with profiler.stage("save") as stage:
+        calendar.save(args.calendar)
+        stage.rows = len(calendar.days)
+        stage.bytes = args.calendar.stat().st_size
+
+    with profiler.stage("spacing") as stage:
+        rotation = Calendar(calendar.start, [xi_key(xis[i % len(xis)]) for i in range(len(calendar.days))])
+        before, after = spacing(rotation, xis), spacing(calendar, xis)
+        stage.rows = 2 * len(calendar.days)
+    print(f"{len(xis)} XIs -> {args.calendar}")
+    print("days between repeats   p5 (old -> new)   median (old -> new)")
+    for kind in after:
+        old, new = before[kind], after[kind]
+        print(f"  {kind:<8} {old['p5']:>16} -> {new['p5']:<8} {old['median']:>10} -> {new['median']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
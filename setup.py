@@ -5,9 +5,15 @@ setup(
     version="0.1.0",
     packages=find_packages(),
     install_requires=[
+        "numpy>=1.21.0",
         "pandas>=1.5.0",
         "click>=8.0.0",
     ],
+    extras_require={
+        "brotli": ["brotli>=1.0"],
+        "plot": ["matplotlib>=3.5"],
+    },
+    package_data={"squadify": ["*.html"]},
     entry_points={
         "console_scripts": [
             "clq=clq.cli:main",
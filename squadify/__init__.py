@@ -0,0 +1 @@
+"""English League Squadify: build tooling for the daily starting-XI game."""
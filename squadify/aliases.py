@@ -0,0 +1,210 @@
+"""Accepted guesses for every player of the Squadify game.
+
+A guess used to be accepted when it was a substring of the player's name
+(or the other way round), so a single letter matched, and the page ran ten
+regex replaces on both strings for every check. The build now precomputes a
+small set of alias keys per player and the page only folds the guess:
+
+* :func:`name_key` folds a name to ``[a-z0-9]`` (NFKD plus the letters NFKD
+  keeps, as :func:`clq.resolve.fold`), so "Groß" -> "gross" and
+  "Pröpper" -> "propper";
+* :func:`aliases` adds the German/Scandinavian transliterations
+  ("proepper", "oedegaard"), the name's trailing words ("De Bruyne" ->
+  "debruyne", "bruyne"; "Wan-Bissaka" -> "bissaka") and any
+  :data:`KNOWN_ALIASES` for the player. A leading word is never a key on
+  its own, so the given name of "David Luiz" or "Lungi Søre." is not
+  accepted;
+* names that Transfermarkt truncated ("Konstantop.") give *prefix* keys,
+  written with a trailing ``"."``: a guess is accepted when its first
+  ``len(key) - 1`` characters equal the key.
+
+A guess is checked by folding it once and looking up the whole key and the
+keys of its trailing words ("Kevin De Bruyne" -> "kevindebruyne",
+"debruyne", "bruyne"), so "Leandro Trossard" is accepted for "Trossard"
+but "Trossard Smith" is not. :class:`AliasIndex` applies the same rule in Python, which is
+what ``python -m squadify.aliases`` uses to validate logged guesses in bulk::
+
+    python -m squadify.aliases guesses.csv -o checked.csv
+
+The shell's ``foldName`` must stay equivalent to :func:`name_key`; the
+table of special letters is injected into it from
+:data:`clq.resolve.SPECIAL_LETTERS` at build time.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import re
+import sys
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Sequence, Tuple
+
+from clq.resolve import fold
+
+_DROP = re.compile(r"[^0-9a-z]+")
+_WORDS = re.compile(r"[\s\-]+")
+
+# Alternative spellings of letters that fold drops to their base letter.
+TRANSLITERATIONS = str.maketrans({
+    "ä": "ae", "Ä": "ae", "ö": "oe", "Ö": "oe", "ü": "ue", "Ü": "ue",
+    "ø": "oe", "Ø": "oe", "å": "aa", "Å": "aa",
+})
+PARTICLES = frozenset({
+    "al", "da", "das", "de", "del", "della", "den", "der", "di", "do", "dos", "du", "el", "la", "le",
+    "ten", "ter", "van", "von",
+})
+# Shorter words would make common syllables valid guesses.
+MIN_TOKEN = 3
+MIN_PREFIX = 4
+PREFIX = "."
+
+# Extra accepted forms by Transfermarkt id: completions of truncated names
+# and widely used short forms.
+KNOWN_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "314353": ("alexanderarnold", "taa"),  # Alexander-.
+    "477758": ("awb",),  # Wan-Bissaka
+    "131789": ("firmino",),  # Roberto Fi.
+    "381362": ("moraes",),  # Wesley Mor.
+    "159372": ("anderson",),  # Felipe And.
+    "225984": ("pereira",),  # Matheus Pe.
+    "75471": ("bolasie",),  # Yannick Bo.
+}
+
+
+def name_key(text: str) -> str:
+    """Folded ``[a-z0-9]`` key ("Groß" -> "gross", "O'Brien" -> "obrien")."""
+    return _DROP.sub("", fold(text))
+
+
+def _add(keys: Dict[str, None], text: str, prefix: bool) -> None:
+    key = name_key(text)
+    if prefix:
+        if len(key) >= MIN_PREFIX:
+            keys.setdefault(key + PREFIX)
+    elif len(key) >= MIN_TOKEN or (key and not keys):
+        keys.setdefault(key)
+
+
+def aliases(name: str, player_id: str = "") -> List[str]:
+    """Accepted keys for a player, the whole-name key first."""
+    name = name.strip()
+    truncated = name.endswith(".")
+    base = name.rstrip(".").strip()
+    keys: Dict[str, None] = {}
+    for variant in (base, base.translate(TRANSLITERATIONS)):
+        _add(keys, variant, truncated)
+        words = [word for word in _WORDS.split(variant) if word]
+        # Trailing words only: they end in the surname, which is what a
+        # truncated name cuts short ("Yannick Bo." -> "bo.", too short).
+        for start in range(1, len(words)):
+            tail = " ".join(words[start:])
+            if name_key(tail) not in PARTICLES:
+                _add(keys, tail, truncated)
+    for extra in KNOWN_ALIASES.get(str(player_id), ()):
+        keys.setdefault(extra)
+    return list(keys)
+
+
+def guess_keys(guess: str) -> Tuple[str, ...]:
+    """Keys tried for a guess: the whole guess, then its trailing words."""
+    words = guess.split()
+    keys = (name_key(" ".join(words[start:])) for start in range(len(words)))
+    return tuple(dict.fromkeys(key for key in keys if key))
+
+
+def matches(keys: FrozenSet[str], prefix_lengths: Sequence[int], candidates: Sequence[str]) -> bool:
+    """True if any candidate key is an alias or starts with a prefix alias."""
+    for key in candidates:
+        if key in keys:
+            return True
+        for length in prefix_lengths:
+            if len(key) >= length and key[:length] + PREFIX in keys:
+                return True
+    return False
+
+
+class AliasIndex:
+    """Alias keys of every player, by Transfermarkt id."""
+
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+        self._keys: Dict[str, FrozenSet[str]] = {}
+        self._prefix_lengths: Dict[str, Tuple[int, ...]] = {}
+        self._guess_keys = lru_cache(maxsize=1 << 16)(guess_keys)
+
+    @classmethod
+    def from_xis(cls, xis: Iterable[dict]) -> "AliasIndex":
+        index = cls()
+        for xi in xis:
+            for player in xi["players"]:
+                index.add(str(player.get("id") or player["name"]), player["name"])
+        return index
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self._keys
+
+    def add(self, player_id: str, name: str) -> None:
+        if player_id in self._keys:
+            return
+        keys = aliases(name, player_id)
+        self.names[player_id] = name
+        self._keys[player_id] = frozenset(keys)
+        self._prefix_lengths[player_id] = tuple(sorted({len(k) - 1 for k in keys if k.endswith(PREFIX)}))
+
+    def aliases(self, player_id: str) -> List[str]:
+        return aliases(self.names[player_id], player_id)
+
+    def accepts(self, player_id: str, guess: str) -> bool:
+        return matches(self._keys[player_id], self._prefix_lengths[player_id], self._guess_keys(guess))
+
+    def validate(self, guesses: Iterable[Tuple[str, str]]) -> Iterator[bool]:
+        """Whether each ``(player_id, guess)`` is accepted; unknown players are not."""
+        for player_id, guess in guesses:
+            yield player_id in self._keys and self.accepts(player_id, guess)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m squadify.aliases",
+        description="Check logged guesses (CSV with player_id and guess columns) against the alias index.",
+    )
+    parser.add_argument("guesses", help="CSV of logged guesses, or - for stdin")
+    parser.add_argument("--xis", type=Path, default=Path("diverse_english_xis.json"))
+    parser.add_argument("-o", "--output", help="write the rows back with an 'accepted' column")
+    args = parser.parse_args(argv)
+
+    from .build import load_xis
+
+    index = AliasIndex.from_xis(load_xis(args.xis))
+    counts = {"rows": 0, "accepted": 0, "unknown": 0}
+    source = sys.stdin if args.guesses == "-" else open(args.guesses, newline="", encoding="utf-8")
+    output = open(args.output, "w", newline="", encoding="utf-8") if args.output else None
+    with source:
+        reader = csv.DictReader(source)
+        writer = None
+        if output is not None:
+            writer = csv.DictWriter(output, fieldnames=[*reader.fieldnames, "accepted"])
+            writer.writeheader()
+        for row in reader:
+            known = row["player_id"] in index
+            accepted = known and index.accepts(row["player_id"], row["guess"])
+            counts["rows"] += 1
+            counts["accepted"] += accepted
+            counts["unknown"] += not known
+            if writer is not None:
+                writer.writerow(dict(row, accepted=int(accepted)))
+    if output is not None:
+        output.close()
+    rejected = counts["rows"] - counts["accepted"]
+    print(f"{counts['rows']} guesses: {counts['accepted']} accepted, {rejected} rejected"
+          f" ({counts['unknown']} for unknown players)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
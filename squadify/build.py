@@ -0,0 +1,200 @@
+"""Build the Squadify game as a small HTML shell plus per-day puzzle shards.
+
+The old page inlined every XI as a JavaScript literal, so each visitor
+downloaded the whole database to play one puzzle. The build instead emits
+
+* ``index.html``: the game shell, with the shard names of only the first
+  :data:`INLINE_DAYS` days inlined;
+* ``puzzles/calendar-<hash>.json``: the shard name of each day from the
+  start date (see :mod:`squadify.schedule`), fetched by the shell only for
+  days past the inlined window and cacheable forever;
+* ``puzzles/<hash>.json``: one compact, content-hashed shard per XI.
+
+Every file gets ``.gz`` and (when the optional ``brotli`` package is
+installed) ``.br`` siblings for servers that serve pre-compressed files.
+
+A shard keeps only what the page renders::
+
+    {"t": team, "f": formation, "l": league, "y": season_year,
+     "p": [[name, [alias, ...]] or [name], ...],
+     "s": [[player, number, position_top, position_left], ...]}
+
+``p`` is the shard's player table: its players interned by Transfermarkt
+``id``, each with its accepted guess keys (:mod:`squadify.aliases`; left
+out when the folded name is the only one), and
+every slot of the XI (``s``) refers to a player by index, so a player
+listed twice is stored once. Each shard is self-contained, as a page
+fetches one per visit. Identical XIs map to the same shard file.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import gzip
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from clq.resolve import SPECIAL_LETTERS
+
+from .aliases import aliases, name_key
+
+try:
+    import brotli
+except ImportError:  # optional: only needed for .br shards
+    brotli = None
+
+SHELL = Path(__file__).with_name("shell.html")
+PUZZLE_DIR = "puzzles"
+HASH_LENGTH = 8
+# Days whose shard names the shell carries itself; a visit within this many
+# days of the build downloads the shell and one shard, nothing else.
+INLINE_DAYS = 7
+
+
+def load_xis(path: Path) -> List[dict]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["starting_xis"]
+
+
+def player_key(player: dict) -> str:
+    """Transfermarkt id of ``player``, or its name when the id is missing."""
+    return str(player.get("id") or player["name"])
+
+
+class PlayerTable:
+    """Players interned by Transfermarkt id, as ``[name, aliases]`` records (``[name]``
+    when the folded name is the only alias)."""
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+        self.records: List[list] = []
+        self.slots = 0
+
+    def intern(self, player: dict) -> int:
+        """Index of ``player``'s record, added on first sight."""
+        self.slots += 1
+        key = player_key(player)
+        position = self.index.get(key)
+        if position is None:
+            position = self.index[key] = len(self.records)
+            name = player["name"]
+            keys = aliases(name, key)
+            # The page folds the name itself when it is the only key.
+            self.records.append([name] if keys == [name_key(name)] else [name, keys])
+        return position
+
+
+def compact_xi(xi: dict) -> dict:
+    """The shard payload of ``xi``."""
+    players = PlayerTable()
+    slots = [[players.intern(p), p["number"], p["position_top"], p["position_left"]] for p in xi["players"]]
+    return {"t": xi["team"], "f": xi["formation"], "l": xi.get("league"), "y": xi.get("season_year"),
+            "p": players.records, "s": slots}
+
+
+def encode(payload: dict) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def shard_name(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def compact_html(html: str) -> str:
+    """Drop indentation and blank lines; newlines are kept for JS semicolon insertion."""
+    return "\n".join(line.strip() for line in html.splitlines() if line.strip())
+
+
+class ShardInfo(NamedTuple):
+    name: str
+    raw: int
+    gzip: int
+    brotli: Optional[int]
+
+
+def _gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _write_variants(path: Path, data: bytes) -> ShardInfo:
+    path.write_bytes(data)
+    gz = _gzip(data)
+    path.with_name(path.name + ".gz").write_bytes(gz)
+    br_size = None
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        path.with_name(path.name + ".br").write_bytes(br)
+        br_size = len(br)
+    return ShardInfo(path.name, len(data), len(gz), br_size)
+
+
+def render_shell(shards: Sequence[str], start: dt.date, calendar: str, base: str = f"{PUZZLE_DIR}/") -> str:
+    """The shell with the first :data:`INLINE_DAYS` of ``shards`` and the name of the calendar asset."""
+    html = SHELL.read_text(encoding="utf-8")
+    html = html.replace("__PUZZLE_BASE__", base)
+    html = html.replace("__PUZZLE_START__", start.isoformat())
+    html = html.replace("__PUZZLE_SHARDS__", json.dumps(list(shards[:INLINE_DAYS]), separators=(",", ":")))
+    html = html.replace("__PUZZLE_CALENDAR__", calendar)
+    html = html.replace("__FOLD_SPECIAL__", json.dumps(SPECIAL_LETTERS, ensure_ascii=False, separators=(",", ":")))
+    return compact_html(html)
+
+
+def build_game(xis: Sequence[dict], out_dir: Path, start: dt.date) -> dict:
+    """Write the shell and shards to ``out_dir`` and return a size report.
+
+    ``xis`` are the puzzles of consecutive days from ``start``.
+    """
+    out_dir = Path(out_dir)
+    puzzle_dir = out_dir / PUZZLE_DIR
+    puzzle_dir.mkdir(parents=True, exist_ok=True)
+
+    players = PlayerTable()
+    shards: Dict[str, ShardInfo] = {}
+    contents: Dict[str, bytes] = {}
+    calendar: List[str] = []
+    for xi in xis:
+        data = encode(compact_xi(xi))
+        for player in xi["players"]:
+            players.intern(player)
+        name = shard_name(data)
+        if name in contents and contents[name] != data:
+            raise ValueError(f"shard hash collision on {name}; increase HASH_LENGTH")
+        if name not in shards:
+            contents[name] = data
+            shards[name] = _write_variants(puzzle_dir / f"{name}.json", data)
+        calendar.append(name)
+
+    calendar_data = encode(calendar)
+    calendar_name = f"calendar-{shard_name(calendar_data)}.json"
+    calendar_info = _write_variants(puzzle_dir / calendar_name, calendar_data)
+    shell = render_shell(calendar, start, calendar_name).encode("utf-8")
+    shell_info = _write_variants(out_dir / "index.html", shell)
+
+    sizes = list(shards.values())
+    report = {
+        "start": start.isoformat(),
+        "days": len(xis),
+        "shards": len(shards),
+        "player_slots": players.slots,
+        "distinct_players": len(players.records),
+        "inline_days": min(INLINE_DAYS, len(calendar)),
+        "shell": shell_info._asdict(),
+        "calendar": calendar_info._asdict(),
+        "shard_bytes": {
+            "raw_max": max(s.raw for s in sizes),
+            "raw_mean": round(sum(s.raw for s in sizes) / len(sizes), 1),
+            "gzip_mean": round(sum(s.gzip for s in sizes) / len(sizes), 1),
+            "brotli_mean": round(sum(s.brotli for s in sizes) / len(sizes), 1) if brotli is not None else None,
+        },
+        "per_shard": [s._asdict() for s in sizes],
+    }
+    # Within the inlined window; later visits also fetch the calendar once.
+    report["first_load"] = {
+        "raw": shell_info.raw + report["shard_bytes"]["raw_max"],
+        "gzip": shell_info.gzip + max(s.gzip for s in sizes),
+    }
+    with open(out_dir / "build_report.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
@@ -0,0 +1,560 @@
+"""Shared asyncio fetch engine for the Transfermarkt and Squadify scrapers.
+
+:class:`Fetcher` downloads many URLs concurrently with only the standard
+library:
+
+* a bounded pool of worker tasks (``concurrency``);
+* HTTP/1.1 keep-alive connections reused per host (at most ``per_host``
+  open at once);
+* a token bucket per host (``rate`` requests per second, ``burst``), so
+  throughput is set by the rate limit rather than by round-trips;
+* retries with backoff on connection errors, 429 and 5xx, honouring
+  ``Retry-After``;
+* a content-addressed on-disk cache (:class:`ResponseCache`). Entries
+  older than ``max_age`` are revalidated with ``If-None-Match`` /
+  ``If-Modified-Since``, and a 304 keeps the stored body.
+
+With ``offline=True`` nothing touches the network: responses come from the
+given HAR archives (:class:`HarArchive`), then from the cache, and a miss
+raises :class:`NotCached`. Reruns and tests can therefore replay a scrape
+exactly::
+
+    fetcher = Fetcher(cache_dir=".http-cache", rate=2)
+    responses = fetcher.run(urls)
+
+    async with Fetcher(cache_dir=".http-cache") as fetcher:
+        response = await fetcher.fetch(url)
+
+    python -m squadify.fetch --offline --har "www.squadify.cc_Archive [...].har" https://www.squadify.cc/
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import os
+import random
+import ssl
+import sys
+import tempfile
+import time
+import zlib
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+from urllib.parse import urljoin, urlsplit
+
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36"
+REDIRECTS = {301, 302, 303, 307, 308}
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+MAX_REDIRECTS = 5
+
+Headers = List[Tuple[str, str]]
+
+
+class FetchError(Exception):
+    """A URL could not be fetched."""
+
+
+class NotCached(FetchError):
+    """Offline mode and the URL is in neither the HAR archives nor the cache."""
+
+
+class Response(NamedTuple):
+    url: str
+    status: int
+    headers: Headers
+    body: bytes
+    source: str  # "network", "cache", "revalidated" or "har"
+
+    def header(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        name = name.lower()
+        for key, value in self.headers:
+            if key.lower() == name:
+                return value
+        return default
+
+    @property
+    def text(self) -> str:
+        content_type = self.header("content-type", "")
+        charset = "utf-8"
+        if "charset=" in content_type:
+            charset = content_type.split("charset=", 1)[1].split(";")[0].strip() or charset
+        return self.body.decode(charset, errors="replace")
+
+
+class TokenBucket:
+    """``rate`` tokens per second, at most ``burst`` banked."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+# Cache
+
+
+def request_key(method: str, url: str) -> str:
+    return hashlib.sha256(f"{method.upper()} {url}".encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """On-disk responses: bodies stored once by SHA-256, plus a small JSON entry per request.
+
+    ``objects/ab/abcdef...`` holds bodies, ``entries/12/1234....json`` the
+    status, headers, validators and fetch time of each ``METHOD URL``.
+    Writes go through a temporary file and ``os.replace``.
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / key[:2] / f"{key}.json"
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root / "objects" / digest[:2] / digest
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def get(self, method: str, url: str) -> Optional[dict]:
+        """The stored entry, with its body under ``"body"``, or None."""
+        try:
+            with open(self._entry_path(request_key(method, url)), encoding="utf-8") as f:
+                entry = json.load(f)
+            entry["body"] = self._object_path(entry["sha256"]).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None
+        return entry
+
+    def put(self, method: str, response: Response) -> None:
+        digest = hashlib.sha256(response.body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            self._write(path, response.body)
+        self.touch(method, response.url, response.status, response.headers, digest)
+
+    def touch(self, method: str, url: str, status: int, headers: Headers, digest: str) -> None:
+        entry = {"url": url, "status": status, "headers": headers, "sha256": digest, "fetched": time.time()}
+        self._write(self._entry_path(request_key(method, url)), json.dumps(entry).encode("utf-8"))
+
+
+class HarArchive:
+    """Responses recorded in HAR files, by ``(method, url)``; the last recording wins."""
+
+    def __init__(self, paths: Iterable[Path] = ()):
+        self._entries: Dict[Tuple[str, str], Response] = {}
+        for path in paths:
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, path: Path) -> None:
+        with open(path, encoding="utf-8") as f:
+            log = json.load(f)["log"]
+        for entry in log["entries"]:
+            request, response = entry["request"], entry["response"]
+            content = response.get("content", {})
+            text = content.get("text") or ""
+            body = base64.b64decode(text) if content.get("encoding") == "base64" else text.encode("utf-8")
+            headers = [(h["name"], h["value"]) for h in response.get("headers", ())
+                       if h["name"].lower() not in ("content-encoding", "transfer-encoding", "content-length")]
+            self._entries[(request["method"].upper(), request["url"])] = Response(
+                request["url"], response["status"], headers, body, "har"
+            )
+
+    def get(self, method: str, url: str) -> Optional[Response]:
+        return self._entries.get((method.upper(), url))
+
+
+# HTTP/1.1 over asyncio streams
+
+
+class _Connection(NamedTuple):
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+
+
+class ConnectionPool:
+    """Idle keep-alive connections per ``(scheme, host, port)``."""
+
+    def __init__(self, per_host: int, timeout: float):
+        self.per_host = per_host
+        self.timeout = timeout
+        self._idle: Dict[tuple, List[_Connection]] = {}
+        self._limits: Dict[tuple, asyncio.Semaphore] = {}
+        self._ssl: Optional[ssl.SSLContext] = None
+        self.opened = 0
+
+    def limit(self, origin: tuple) -> asyncio.Semaphore:
+        if origin not in self._limits:
+            self._limits[origin] = asyncio.Semaphore(self.per_host)
+        return self._limits[origin]
+
+    async def connect(self, origin: tuple) -> Tuple[_Connection, bool]:
+        """An idle connection for ``origin`` (reused=True) or a new one."""
+        idle = self._idle.get(origin)
+        while idle:
+            connection = idle.pop()
+            if not connection.reader.at_eof() and not connection.writer.is_closing():
+                return connection, True
+            connection.writer.close()
+        scheme, host, port = origin
+        context = None
+        if scheme == "https":
+            if self._ssl is None:
+                self._ssl = ssl.create_default_context()
+            context = self._ssl
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, server_hostname=host if context else None),
+            self.timeout,
+        )
+        self.opened += 1
+        return _Connection(reader, writer), False
+
+    def release(self, origin: tuple, connection: _Connection, reusable: bool) -> None:
+        if reusable:
+            self._idle.setdefault(origin, []).append(connection)
+        else:
+            connection.writer.close()
+
+    async def close(self) -> None:
+        for connections in self._idle.values():
+            for connection in connections:
+                connection.writer.close()
+        self._idle.clear()
+
+
+def _origin(url: str) -> tuple:
+    parts = urlsplit(url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise FetchError(f"unsupported URL: {url}")
+    return parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80)
+
+
+def _decode(body: bytes, encoding: Optional[str]) -> bytes:
+    encoding = (encoding or "").strip().lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        try:
+            return zlib.decompress(body)
+        except zlib.error:
+            return zlib.decompress(body, -zlib.MAX_WBITS)
+    return body
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], method: str, status: int) -> Tuple[bytes, bool]:
+    """Body bytes and whether the connection can be reused afterwards."""
+    if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+        return b"", True
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks), True
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+    if "content-length" in headers:
+        return await reader.readexactly(int(headers["content-length"])), True
+    return await reader.read(), False
+
+
+async def _exchange(connection: _Connection, method: str, url: str, headers: Headers) -> Tuple[int, Headers, bytes, bool]:
+    parts = urlsplit(url)
+    target = parts.path or "/"
+    if parts.query:
+        target += "?" + parts.query
+    lines = [f"{method} {target} HTTP/1.1", f"Host: {parts.netloc}"]
+    lines += [f"{name}: {value}" for name, value in headers]
+    connection.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    await connection.writer.drain()
+
+    status_line = await connection.reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before the response")
+    version, status = status_line.decode("latin-1").split(" ", 2)[:2]
+    response_headers: Headers = []
+    while True:
+        line = (await connection.reader.readline()).decode("latin-1").rstrip("\r\n")
+        if not line:
+            break
+        name, _, value = line.partition(":")
+        response_headers.append((name.strip(), value.strip()))
+    lookup = {name.lower(): value for name, value in response_headers}
+    body, reusable = await _read_body(connection.reader, lookup, method, int(status))
+    if lookup.get("connection", "").lower() == "close" or version == "HTTP/1.0":
+        reusable = False
+    body = _decode(body, lookup.get("content-encoding"))
+    response_headers = [(k, v) for k, v in response_headers
+                        if k.lower() not in ("content-encoding", "transfer-encoding", "content-length")]
+    return int(status), response_headers, body, reusable
+
+
+def _retry_after(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class Fetcher:
+    """Concurrent, rate-limited, cached HTTP GETs."""
+
+    def __init__(
+        self,
+        cache_dir: Optional[Path] = None,
+        har: Sequence[Path] = (),
+        offline: bool = False,
+        concurrency: int = 8,
+        per_host: int = 4,
+        rate: float = 2.0,
+        burst: int = 2,
+        max_age: Optional[float] = None,
+        retries: int = 3,
+        timeout: float = 30.0,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """``max_age`` is how long (seconds) a cached response is used without
+        revalidation; None never revalidates, 0 always does."""
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.har = HarArchive(har)
+        self.offline = offline
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.rate = rate
+        self.burst = burst
+        self.max_age = max_age
+        self.retries = retries
+        self.timeout = timeout
+        self.headers = {"User-Agent": USER_AGENT, "Accept": "*/*", "Accept-Encoding": "gzip, deflate"}
+        self.headers.update(headers or {})
+        self.stats = {"network": 0, "cache": 0, "revalidated": 0, "har": 0, "errors": 0}
+        self._pool: Optional[ConnectionPool] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    # Offline sources
+
+    def _cached(self, url: str) -> Tuple[Optional[Response], Optional[dict]]:
+        """A response usable without the network, and the stale cache entry if any."""
+        recorded = self.har.get("GET", url)
+        if recorded is not None:
+            return recorded, None
+        entry = self.cache.get("GET", url) if self.cache else None
+        if entry is None:
+            return None, None
+        response = Response(url, entry["status"], [tuple(h) for h in entry["headers"]], entry["body"], "cache")
+        if self.offline or self.max_age is None or time.time() - entry["fetched"] < self.max_age:
+            return response, None
+        return None, entry
+
+    # Network
+
+    def _connections(self) -> ConnectionPool:
+        """The connection pool of the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        if self._pool is None or self._loop is not loop:
+            # Pools, semaphores and locks belong to the running event loop.
+            self._pool = ConnectionPool(self.per_host, self.timeout)
+            self._loop = loop
+            self._buckets = {}
+        return self._pool
+
+    async def close(self) -> None:
+        """Close the idle keep-alive connections."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    async def __aenter__(self) -> "Fetcher":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def _bucket(self, host: str) -> TokenBucket:
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    async def _send(self, connection: _Connection, url: str, headers: Headers) -> Tuple[int, Headers, bytes, bool]:
+        try:
+            return await asyncio.wait_for(_exchange(connection, "GET", url, headers), self.timeout)
+        except BaseException:
+            connection.writer.close()
+            raise
+
+    async def _request(self, url: str, extra: Dict[str, str]) -> Tuple[int, Headers, bytes]:
+        origin = _origin(url)
+        headers = [*self.headers.items(), *extra.items(), ("Connection", "keep-alive")]
+        pool = self._connections()
+        async with pool.limit(origin):
+            await self._bucket(origin[1]).acquire()
+            connection, reused = await pool.connect(origin)
+            try:
+                status, response_headers, body, reusable = await self._send(connection, url, headers)
+            except (ConnectionError, asyncio.IncompleteReadError):
+                if not reused:
+                    raise
+                # The server closed an idle keep-alive connection: retry once on a fresh one.
+                connection, _ = await pool.connect(origin)
+                status, response_headers, body, reusable = await self._send(connection, url, headers)
+            pool.release(origin, connection, reusable)
+        return status, response_headers, body
+
+    async def _download(self, url: str, stale: Optional[dict]) -> Response:
+        conditional: Dict[str, str] = {}
+        if stale is not None:
+            headers = {name.lower(): value for name, value in stale["headers"]}
+            if "etag" in headers:
+                conditional["If-None-Match"] = headers["etag"]
+            if "last-modified" in headers:
+                conditional["If-Modified-Since"] = headers["last-modified"]
+
+        for attempt in range(self.retries + 1):
+            try:
+                status, headers, body = await self._request(url, conditional)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as exc:
+                if attempt == self.retries:
+                    raise FetchError(f"{url}: {exc!r}") from exc
+                await asyncio.sleep(2 ** attempt + random.random())
+                continue
+            if status in RETRY_STATUSES and attempt < self.retries:
+                delay = _retry_after(dict((k.lower(), v) for k, v in headers).get("retry-after"))
+                await asyncio.sleep(delay if delay is not None else 2 ** attempt + random.random())
+                continue
+            break
+
+        if status == 304 and stale is not None:
+            if self.cache:
+                self.cache.touch("GET", url, stale["status"], stale["headers"], stale["sha256"])
+            return Response(url, stale["status"], [tuple(h) for h in stale["headers"]], stale["body"], "revalidated")
+        response = Response(url, status, headers, body, "network")
+        # Redirects and 4xx are cached too, so offline reruns see the same answers.
+        if self.cache and status not in RETRY_STATUSES:
+            self.cache.put("GET", response)
+        return response
+
+    async def fetch(self, url: str) -> Response:
+        """GET ``url``, following redirects, from the cheapest source allowed.
+
+        Connections opened here stay open for reuse until :meth:`close`.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            response, stale = self._cached(url)
+            if response is None:
+                if self.offline:
+                    raise NotCached(url)
+                response = await self._download(url, stale)
+            self.stats[response.source] += 1
+            location = response.header("location")
+            if response.status not in REDIRECTS or not location:
+                return response
+            url = urljoin(url, location)
+        raise FetchError(f"too many redirects: {url}")
+
+    async def fetch_all(self, urls: Iterable[str], return_exceptions: bool = False) -> List[object]:
+        """Responses in ``urls`` order, fetched by at most ``concurrency`` workers."""
+        urls = list(urls)
+        results: List[object] = [None] * len(urls)
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in enumerate(urls):
+            queue.put_nowait(item)
+
+        async def worker() -> None:
+            while True:
+                try:
+                    i, url = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results[i] = await self.fetch(url)
+                except FetchError as exc:
+                    self.stats["errors"] += 1
+                    if not return_exceptions:
+                        raise
+                    results[i] = exc
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, min(self.concurrency, len(urls))))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            await self.close()
+        return results
+
+    def run(self, urls: Iterable[str], return_exceptions: bool = False) -> List[object]:
+        """Blocking :meth:`fetch_all` for scripts."""
+        return asyncio.run(self.fetch_all(urls, return_exceptions))
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m squadify.fetch", description="Fetch URLs through the shared cache.")
+    parser.add_argument("urls", nargs="*", help="URLs to fetch (default: read one per line from stdin)")
+    parser.add_argument("--cache-dir", type=Path, default=Path(".http-cache"))
+    parser.add_argument("--har", type=Path, action="append", default=[], help="replay responses from a HAR file")
+    parser.add_argument("--offline", action="store_true", help="never touch the network")
+    parser.add_argument("--rate", type=float, default=2.0, help="requests per second per host")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--max-age", type=float, help="revalidate cached responses older than this (seconds)")
+    args = parser.parse_args(argv)
+
+    urls = args.urls or [line.strip() for line in sys.stdin if line.strip()]
+    fetcher = Fetcher(args.cache_dir, har=args.har, offline=args.offline, rate=args.rate,
+                      concurrency=args.concurrency, max_age=args.max_age)
+    started = time.perf_counter()
+    failed = 0
+    for url, result in zip(urls, fetcher.run(urls, return_exceptions=True)):
+        if isinstance(result, Exception):
+            failed += 1
+            print(f"ERR {url}: {result}")
+        else:
+            print(f"{result.status} {result.source:<11} {len(result.body):>8} {url}")
+    print(f"{len(urls)} URLs in {time.perf_counter() - started:.2f}s: "
+          + ", ".join(f"{k} {v}" for k, v in fetcher.stats.items()), file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,256 @@
+"""Interned player/team/season index over the starting-XI database.
+
+Players (by Transfermarkt id), teams and seasons (``season_year``) are
+interned to dense integer ids, and every membership is stored as a CSR
+adjacency: a ``<relation>_ptr`` array of row offsets and a ``<relation>``
+array of sorted, unique member ids, so the members of row ``i`` are
+``members[ptr[i]:ptr[i + 1]]``. The relations are
+
+* ``xi_players`` / ``player_xis``: XI <-> player;
+* ``team_players`` / ``player_teams``: team <-> player (over all seasons);
+* ``squad_players``: (team, season) -> player.
+
+Team rosters are also kept as packed bitsets (``team_bits``, one row of
+``uint64`` words per team), so overlap counts for many team pairs are a
+vectorized AND plus popcount.
+
+The index is persisted as a :mod:`clq.store` file next to the JSON
+(``diverse_english_xis.clqs``), rebuilt when the JSON's size or mtime
+changes, and memory-mapped on open: lookups slice zero-copy views and
+intersections of sorted id arrays are a single ``searchsorted``.
+"""
+
+from __future__ import annotations
+
+from functools import reduce
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from clq.store import Store, open_dataset, pack
+
+from .build import load_xis
+
+# Set bits per byte, for popcounts over uint8 views of the bitsets.
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n_rows: int, n_cols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR arrays for the distinct ``(row, col)`` pairs, columns sorted per row."""
+    pairs = np.unique(rows.astype(np.int64) * max(n_cols, 1) + cols)
+    ptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(pairs // max(n_cols, 1), minlength=n_rows), out=ptr[1:])
+    return ptr, (pairs % max(n_cols, 1)).astype(np.int32)
+
+
+def _bitsets(ptr: np.ndarray, members: np.ndarray, n_bits: int) -> np.ndarray:
+    words = max(1, -(-n_bits // 64))
+    rows = np.repeat(np.arange(len(ptr) - 1), np.diff(ptr))
+    bits = np.zeros((len(ptr) - 1, words), dtype=np.uint64)
+    np.bitwise_or.at(bits, (rows, members // 64), np.left_shift(np.uint64(1), (members % 64).astype(np.uint64)))
+    return bits
+
+
+def _season_year(xi: dict) -> Optional[int]:
+    """``season_year`` as an int ("2019" and 2019 are the same season), or None."""
+    year = xi.get("season_year")
+    return None if year is None or year == "" else int(year)
+
+
+def index_columns(xis: Sequence[dict]) -> Dict[str, object]:
+    """Columns of the index store for a list of XIs."""
+    players: Dict[str, int] = {}
+    player_names = []
+    teams: Dict[str, int] = {}
+    years = [_season_year(xi) for xi in xis]
+    seasons = sorted({year for year in years if year is not None})
+    season_ids = {season: i for i, season in enumerate(seasons)}
+
+    slot_xi, slot_player = [], []
+    xi_team, xi_season = [], []
+    for i, xi in enumerate(xis):
+        xi_team.append(teams.setdefault(xi["team"], len(teams)))
+        xi_season.append(season_ids.get(years[i], -1))
+        for player in xi["players"]:
+            key = str(player.get("id") or player["name"])
+            if key not in players:
+                players[key] = len(players)
+                player_names.append(player["name"])
+            slot_xi.append(i)
+            slot_player.append(players[key])
+
+    n_xis, n_players, n_teams, n_seasons = len(xis), len(players), len(teams), len(seasons)
+    slot_xi = np.array(slot_xi, dtype=np.int64)
+    slot_player = np.array(slot_player, dtype=np.int64)
+    xi_team = np.array(xi_team, dtype=np.int32)
+    xi_season = np.array(xi_season, dtype=np.int32)
+    slot_team = xi_team[slot_xi]
+
+    # (team, season) squads, numbered in order of their sorted pair key.
+    squad_keys, xi_squad = np.unique(xi_team.astype(np.int64) * (n_seasons + 1) + (xi_season + 1), return_inverse=True)
+    squad_team = (squad_keys // (n_seasons + 1)).astype(np.int32)
+    squad_season = (squad_keys % (n_seasons + 1) - 1).astype(np.int32)
+
+    xi_ptr, xi_players = _csr(slot_xi, slot_player, n_xis, n_players)
+    player_xi_ptr, player_xis = _csr(slot_player, slot_xi, n_players, n_xis)
+    team_ptr, team_players = _csr(slot_team, slot_player, n_teams, n_players)
+    player_team_ptr, player_teams = _csr(slot_player, slot_team, n_players, n_teams)
+    squad_ptr, squad_players = _csr(xi_squad[slot_xi], slot_player, len(squad_keys), n_players)
+
+    return {
+        "player_key": list(players),
+        "player_name": player_names,
+        "team": list(teams),
+        "season": np.array(seasons, dtype=np.int32),
+        "xi_team": xi_team,
+        "xi_season": xi_season,
+        "xi_match": np.array([xi.get("match_id") or 0 for xi in xis], dtype=np.int64),
+        "xi_league": [xi.get("league") for xi in xis],
+        "squad_team": squad_team,
+        "squad_season": squad_season,
+        "xi_players_ptr": xi_ptr,
+        "xi_players": xi_players,
+        "player_xis_ptr": player_xi_ptr,
+        "player_xis": player_xis,
+        "team_players_ptr": team_ptr,
+        "team_players": team_players,
+        "player_teams_ptr": player_team_ptr,
+        "player_teams": player_teams,
+        "squad_players_ptr": squad_ptr,
+        "squad_players": squad_players,
+        "team_bits": _bitsets(team_ptr, team_players, n_players).ravel(),
+    }
+
+
+def intersect(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Intersection of two sorted, unique id arrays."""
+    if len(a) > len(b):
+        a, b = b, a
+    if not len(a):
+        return a
+    positions = np.searchsorted(b, a)
+    positions[positions == len(b)] = 0
+    return a[b[positions] == a]
+
+
+class XIIndex:
+    """Membership queries over an index store."""
+
+    def __init__(self, store: Store):
+        self.store = store
+        self._relations: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._players: Optional[Dict[str, int]] = None
+        self._teams: Optional[Dict[str, int]] = None
+        self._seasons: Optional[Dict[int, int]] = None
+        self._team_bits: Optional[np.ndarray] = None
+
+    @classmethod
+    def open(cls, path: Path = Path("diverse_english_xis.json"), store_dir: Optional[Path] = None) -> "XIIndex":
+        path = Path(path)
+        return cls(open_dataset(path.stem, path, load_xis, index_columns, store_dir))
+
+    @classmethod
+    def from_xis(cls, xis: Sequence[dict]) -> "XIIndex":
+        return cls(Store(pack(index_columns(xis), {"rows": len(xis)})))
+
+    def close(self) -> None:
+        self._relations.clear()
+        self._team_bits = None
+        self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Interned ids
+
+    @property
+    def xi_count(self) -> int:
+        return len(self.store.column("xi_team"))
+
+    @property
+    def player_count(self) -> int:
+        return len(self.store.column("player_teams_ptr")) - 1
+
+    @property
+    def team_count(self) -> int:
+        return len(self.store.column("team_players_ptr")) - 1
+
+    def player(self, key) -> int:
+        """Id of a player by Transfermarkt id."""
+        if self._players is None:
+            self._players = {k: i for i, k in enumerate(self.store.text("player_key"))}
+        return self._players[str(key)]
+
+    def team(self, name: str) -> int:
+        if self._teams is None:
+            self._teams = {k: i for i, k in enumerate(self.store.text("team"))}
+        return self._teams[name]
+
+    def season(self, year: int) -> int:
+        if self._seasons is None:
+            self._seasons = {int(y): i for i, y in enumerate(self.store.column("season").tolist())}
+        return self._seasons[int(year)]
+
+    def player_name(self, player: int) -> str:
+        return self.store.text("player_name")[player]
+
+    def team_name(self, team: int) -> str:
+        return self.store.text("team")[team]
+
+    # Adjacency
+
+    def _relation(self, name: str) -> Tuple[np.ndarray, np.ndarray]:
+        if name not in self._relations:
+            self._relations[name] = (self.store.column(name + "_ptr"), self.store.column(name))
+        return self._relations[name]
+
+    def _row(self, name: str, row: int) -> np.ndarray:
+        ptr, members = self._relation(name)
+        return members[ptr[row]:ptr[row + 1]]
+
+    def xi_players(self, xi: int) -> np.ndarray:
+        return self._row("xi_players", xi)
+
+    def player_xis(self, player: int) -> np.ndarray:
+        return self._row("player_xis", player)
+
+    def player_teams(self, player: int) -> np.ndarray:
+        return self._row("player_teams", player)
+
+    def team_players(self, team: int) -> np.ndarray:
+        return self._row("team_players", team)
+
+    def squad_players(self, team: int, season: int) -> np.ndarray:
+        """Players of a team in one season (ids from :meth:`team` and :meth:`season`)."""
+        squad_team, squad_season = self.store.column("squad_team"), self.store.column("squad_season")
+        lo, hi = np.searchsorted(squad_team, team), np.searchsorted(squad_team, team, side="right")
+        hit = lo + np.flatnonzero(squad_season[lo:hi] == season)
+        if not len(hit):
+            return self.store.column("squad_players")[:0]
+        return self._row("squad_players", int(hit[0]))
+
+    # Intersections
+
+    def played_for_all(self, teams: Iterable[int]) -> np.ndarray:
+        """Players who played for every one of ``teams``."""
+        return reduce(intersect, (self.team_players(t) for t in teams))
+
+    def shared_players(self, xis: Iterable[int]) -> np.ndarray:
+        """Players who started in every one of ``xis``."""
+        return reduce(intersect, (self.xi_players(x) for x in xis))
+
+    def shared_teams(self, players: Iterable[int]) -> np.ndarray:
+        """Teams every one of ``players`` played for."""
+        return reduce(intersect, (self.player_teams(p) for p in players))
+
+    def team_overlaps(self, a, b) -> np.ndarray:
+        """Number of players shared by each team pair ``(a[i], b[i])``."""
+        if self._team_bits is None:
+            bits = self.store.column("team_bits")
+            self._team_bits = bits.reshape(self.team_count, -1)
+        both = self._team_bits[np.asarray(a)] & self._team_bits[np.asarray(b)]
+        return _POPCOUNT[both.view(np.uint8)].sum(axis=-1, dtype=np.int64)
@@ -0,0 +1,244 @@
+"""Daily puzzle calendar that spaces out repeats of teams, leagues, seasons and players.
+
+The game used to show ``database[dayOfYear % length]``: with 195 XIs the
+sequence repeats within a year, and the file's grouping puts same-league,
+same-season teams on consecutive days. :func:`schedule` builds the
+calendar greedily instead.
+
+Every XI carries a set of *features*: itself, its team, league,
+``season_year`` and each player's Transfermarkt id. A feature that occurs in
+``c`` of the ``n`` XIs gets a fair-share gap of ``n / c`` days, the spacing
+it would have if every XI were shown once per cycle. An XI is *ready* on the
+first day all its features have rested for their gap since their last use.
+Each day takes the XI with the earliest ready day (the most overdue one), so
+rare teams and players are spaced far apart and common leagues rotate as
+fast as their share allows. Ties are broken by a hash of the XI key, not by
+file order.
+
+Ready days only grow, so they are maintained incrementally rather than
+recomputed. Showing an XI raises the ready day of the few XIs that share its
+team or a player, through an inverted index. League and season ready days
+are kept per (league, season) group. Each day is then a single vectorized
+argmin over the candidates, and a decade over 100k candidates takes
+seconds.
+
+A :class:`Calendar` is persisted as JSON. :func:`extend` replays the days
+that are already published to restore feature state, then schedules new
+days with the current XI list, so adding XIs never reshuffles published
+days.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+FEATURE_KINDS = ("xi", "team", "league", "season", "player")
+# Days of the calendar embedded in a game build; they count as published.
+WINDOW_DAYS = 366
+
+
+def xi_key(xi: dict) -> str:
+    """Stable identity of an XI: its match and team."""
+    return f"{xi.get('match_id')}:{xi['team']}"
+
+
+def features(xi: dict) -> List[Tuple[str, object]]:
+    found = [("xi", xi_key(xi)), ("team", xi["team"]), ("league", xi.get("league")), ("season", xi.get("season_year"))]
+    found.extend(("player", str(p.get("id") or p["name"])) for p in xi["players"])
+    return found
+
+
+class Calendar(NamedTuple):
+    start: dt.date
+    days: List[str]  # XI keys, one per day from ``start``
+
+    def date(self, index: int) -> dt.date:
+        return self.start + dt.timedelta(days=index)
+
+    def index(self, day: dt.date) -> int:
+        return (day - self.start).days
+
+    def window(self, first: dt.date, count: int) -> "Calendar":
+        """The days ``first`` .. ``first + count - 1`` that the calendar covers."""
+        lo = max(0, self.index(first))
+        return Calendar(self.date(lo), self.days[lo:max(lo, self.index(first) + count)])
+
+    def to_dict(self) -> dict:
+        return {"start": self.start.isoformat(), "days": self.days}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Calendar":
+        return cls(dt.date.fromisoformat(data["start"]), list(data["days"]))
+
+    def save(self, path: Path) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=0)
+            f.write("\n")
+
+    @classmethod
+    def load(cls, path: Path) -> "Calendar":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def _tiebreak(keys: Sequence[str]) -> np.ndarray:
+    return np.array(
+        [int.from_bytes(hashlib.blake2b(k.encode("utf-8"), digest_size=6).digest(), "big") for k in keys],
+        dtype=np.int64,
+    )
+
+
+def _csr(rows: np.ndarray, cols: np.ndarray, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    order = np.argsort(rows, kind="stable")
+    ptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=ptr[1:])
+    return ptr, cols[order]
+
+
+class _State:
+    """Per-XI ready days, kept up to date as XIs are shown.
+
+    League and season are shared by a large share of the XIs, so their
+    ready days are kept per (league, season) group and gathered once per
+    day. The XI itself, its team and its players are shared by few XIs;
+    using one raises the ready day of just those XIs (``narrow``) through
+    an inverted index.
+    """
+
+    def __init__(self, xis: Sequence[dict]):
+        n = len(xis)
+        self.keys = [xi_key(xi) for xi in xis]
+        self.tie = _tiebreak(self.keys)
+
+        leagues: Dict[object, int] = {}
+        seasons: Dict[object, int] = {}
+        groups: Dict[Tuple[int, int], int] = {}
+        teams: Dict[str, int] = {}
+        players: Dict[str, int] = {}
+        group_of, team_of, player_rows, player_of = [], [], [], []
+        for i, xi in enumerate(xis):
+            league = leagues.setdefault(xi.get("league"), len(leagues))
+            season = seasons.setdefault(xi.get("season_year"), len(seasons))
+            group_of.append(groups.setdefault((league, season), len(groups)))
+            team_of.append(teams.setdefault(xi["team"], len(teams)))
+            for player in xi["players"]:
+                player_rows.append(i)
+                player_of.append(players.setdefault(str(player.get("id") or player["name"]), len(players)))
+        self.group_of = np.array(group_of, dtype=np.int64)
+        pairs = np.array(list(groups), dtype=np.int64).reshape(-1, 2)
+        self.group_league, self.group_season = pairs[:, 0], pairs[:, 1]
+        self.league_gap = n / np.bincount(self.group_league[self.group_of], minlength=len(leagues))
+        self.season_gap = n / np.bincount(self.group_season[self.group_of], minlength=len(seasons))
+        self.league_ready = np.full(len(leagues), -np.inf)
+        self.season_ready = np.full(len(seasons), -np.inf)
+
+        # Narrow features are numbered XIs first, then teams, then players.
+        n_narrow = n + len(teams) + len(players)
+        rows = np.concatenate([np.arange(n), np.arange(n), np.array(player_rows, dtype=np.int64)])
+        cols = np.concatenate([
+            np.arange(n), n + np.array(team_of, dtype=np.int64), n + len(teams) + np.array(player_of, dtype=np.int64),
+        ])
+        pairs = np.unique(rows * n_narrow + cols)  # a player listed twice in one XI counts once
+        xi_rows, feature_cols = pairs // n_narrow, pairs % n_narrow
+        self.xi_features = _csr(xi_rows, feature_cols, n)
+        self.feature_xis = _csr(feature_cols, xi_rows, n_narrow)
+        self.narrow_gap = n / np.bincount(feature_cols, minlength=n_narrow)
+        self.narrow_ready = np.full(n, -np.inf)
+
+    def ready(self) -> np.ndarray:
+        group_ready = np.maximum(self.league_ready[self.group_league], self.season_ready[self.group_season])
+        return np.maximum(self.narrow_ready, group_ready[self.group_of])
+
+    def use(self, xi: int, day: int) -> None:
+        group = self.group_of[xi]
+        league, season = self.group_league[group], self.group_season[group]
+        self.league_ready[league] = day + self.league_gap[league]
+        self.season_ready[season] = day + self.season_gap[season]
+        ptr, used = self.xi_features
+        used = used[ptr[xi]:ptr[xi + 1]]
+        ptr, xis = self.feature_xis
+        counts = ptr[used + 1] - ptr[used]
+        affected = xis[np.concatenate([np.arange(ptr[f], ptr[f + 1]) for f in used])]
+        np.maximum.at(self.narrow_ready, affected, np.repeat(day + self.narrow_gap[used], counts))
+
+    def pick(self) -> int:
+        """The XI with the earliest ready day; ties go to the smallest key hash."""
+        ready = self.ready()
+        tied = np.flatnonzero(ready == ready.min())
+        return int(tied[np.argmin(self.tie[tied])])
+
+
+def _pick_days(state: _State, first_day: int, count: int) -> List[int]:
+    picks: List[int] = []
+    for day in range(first_day, first_day + count):
+        xi = state.pick()
+        state.use(xi, day)
+        picks.append(xi)
+    return picks
+
+
+def schedule(xis: Sequence[dict], days: int, start: dt.date) -> Calendar:
+    """A calendar of ``days`` days from ``start`` over ``xis``."""
+    picks = _pick_days(_State(xis), 0, days)
+    return Calendar(start, [xi_key(xis[i]) for i in picks])
+
+
+def extend(calendar: Calendar, xis: Sequence[dict], days: int, keep_until: Optional[dt.date] = None) -> Calendar:
+    """Reschedule ``calendar`` from ``keep_until`` to ``days`` days long.
+
+    Days before ``keep_until`` (default: the calendar's end, i.e. keep every
+    day) are published and kept verbatim; their XIs count as shown when the
+    remaining days are planned with the current ``xis``.
+    """
+    kept = len(calendar.days) if keep_until is None else min(len(calendar.days), max(0, calendar.index(keep_until)))
+    published = calendar.days[:kept]
+    state = _State(xis)
+    position = {xi_key(xi): i for i, xi in enumerate(xis)}
+    for day, key in enumerate(published):
+        if key in position:  # XIs dropped from the database keep their days
+            state.use(position[key], day)
+    picks = _pick_days(state, kept, max(0, days - kept))
+    return Calendar(calendar.start, published + [xi_key(xis[i]) for i in picks])
+
+
+def spacing(calendar: Calendar, xis: Sequence[dict]) -> Dict[str, dict]:
+    """Per feature kind: the smallest, 5th-percentile and median gap (days) between repeats."""
+    by_key = {xi_key(xi): xi for xi in xis}
+    report: Dict[str, dict] = {}
+    for kind in FEATURE_KINDS:
+        values: Dict[object, int] = {}
+        codes, days = [], []
+        for day, key in enumerate(calendar.days):
+            xi = by_key.get(key)
+            if xi is None:
+                continue
+            for feature_kind, value in features(xi):
+                if feature_kind == kind:
+                    codes.append(values.setdefault(value, len(values)))
+                    days.append(day)
+        codes, days = np.array(codes), np.array(days)
+        order = np.lexsort((days, codes))
+        same = codes[order][1:] == codes[order][:-1]
+        gaps = np.diff(days[order])[same]
+        report[kind] = {
+            "repeats": int(len(gaps)),
+            "min": int(gaps.min()) if len(gaps) else None,
+            "p5": float(np.percentile(gaps, 5)) if len(gaps) else None,
+            "median": float(np.median(gaps)) if len(gaps) else None,
+        }
+    return report
+
+
+def resolve(calendar: Calendar, xis: Iterable[dict]) -> List[dict]:
+    """The XI for every day of ``calendar``."""
+    by_key = {xi_key(xi): xi for xi in xis}
+    missing = [key for key in calendar.days if key not in by_key]
+    if missing:
+        raise KeyError(f"{len(missing)} calendar days reference unknown XIs, e.g. {missing[0]}")
+    return [by_key[key] for key in calendar.days]
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Run against the working tree rather than an installed copy.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,66 @@
+import pytest
+
+from squadify.aliases import AliasIndex, aliases, guess_keys, name_key
+
+
+@pytest.mark.parametrize("name, key", [
+    ("Groß", "gross"),
+    ("O'Brien", "obrien"),
+    ("Pröpper", "propper"),
+    ("Ødegaard", "odegaard"),
+    ("Łukasz  Fabiański", "lukaszfabianski"),
+    ("Aït-Nouri", "aitnouri"),
+])
+def test_name_key(name, key):
+    assert name_key(name) == key
+
+
+def test_transliterations():
+    assert aliases("Pröpper") == ["propper", "proepper"]
+    assert "oedegaard" in aliases("Ødegaard")
+
+
+def test_surnames_only():
+    assert aliases("David Luiz") == ["davidluiz", "luiz"]
+    assert aliases("De Bruyne") == ["debruyne", "bruyne"]
+    assert aliases("Lewis-Potter") == ["lewispotter", "potter"]
+    assert aliases("van der Ho.") == ["vanderho.", "derho."]
+
+
+def test_known_aliases():
+    assert aliases("Wan-Bissaka", "477758") == ["wanbissaka", "bissaka", "awb"]
+
+
+def test_guess_keys():
+    assert guess_keys("Kevin De Bruyne") == ("kevindebruyne", "debruyne", "bruyne")
+    assert guess_keys("  ") == ()
+
+
+@pytest.fixture
+def index():
+    index = AliasIndex()
+    for player_id, name in [("1", "De Bruyne"), ("2", "Konstantop."), ("3", "David Luiz"), ("4", "Groß")]:
+        index.add(player_id, name)
+    return index
+
+
+@pytest.mark.parametrize("player_id, guess", [
+    ("1", "de bruyne"), ("1", "Kevin De Bruyne"), ("1", "Bruyne"),
+    ("2", "Konstantopoulos"), ("2", "Kostas Konstantopoulos"),
+    ("3", "Luiz"), ("3", "David Luiz"),
+    ("4", "Gross"), ("4", "Pascal Groß"),
+])
+def test_accepts(index, player_id, guess):
+    assert index.accepts(player_id, guess)
+
+
+@pytest.mark.parametrize("player_id, guess", [
+    ("1", "Kevin"), ("1", "De"), ("1", "Bruyne Kevin"),
+    ("2", "Konst"), ("3", "David"), ("3", "Luiz Felipe"), ("4", "G"),
+])
+def test_rejects(index, player_id, guess):
+    assert not index.accepts(player_id, guess)
+
+
+def test_validate_unknown_players(index):
+    assert list(index.validate([("1", "Bruyne"), ("9", "Bruyne")])) == [True, False]
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from clq import analytics
+
+CSV = (
+    "Rank,Player,Position,Club(s),Nationality,Age,Seasons,Matches,SubOn,SubOff,Assists,Penalties,Goals\n"
+    "1,Marcos Tavares,Second Striker,NK Maribor,Brazil,41,9,42,5,16,4,1,16\n"
+    "2,Eran Zahavi,Centre-Forward,for 3 clubs,Israel,38,6,27,-,10,7,3,15\n"
+    "3,Someone Else,Centre-Forward,NK Maribor,Slovenia,30,2,10,-,-,0,-,5\n"
+    "3,Someone Else,Centre-Forward,NK Maribor,Slovenia,30,2,10,-,-,0,-,5\n"
+)
+
+
+@pytest.fixture
+def csv(tmp_path):
+    path = tmp_path / "top_1000_scorers.csv"
+    path.write_text(CSV, encoding="utf-8")
+    return path
+
+
+def test_frame_dtypes(csv):
+    frame = analytics.load_scorer_frame(csv)
+    assert len(frame) == 3
+    for name, dtype in analytics.SCORER_DTYPES.items():
+        assert str(frame[name].dtype) == dtype, name
+    assert str(frame["club_count"].dtype) == "Int8"
+
+
+def test_missing_fields_are_na(csv):
+    frame = analytics.load_scorer_frame(csv)
+    assert frame["sub_on"].isna().tolist() == [False, True, True]
+    assert frame["penalties"].isna().tolist() == [False, False, True]
+    assert frame["club"].isna().tolist() == [False, True, False]
+    assert frame["club_count"].tolist() == [1, 3, 1]
+
+
+def test_rollups_skip_unrecorded_penalties(csv):
+    result = analytics.aggregates(analytics.load_scorer_frame(csv))
+    club = result["club"].loc["NK Maribor"]
+    assert (club["players"], club["goals"], club["penalties"]) == (2, 21, 1)
+    assert club["penalty_share"] == pytest.approx(1 / 16)
+    assert result["summary"]["penalty_share"] == pytest.approx(4 / 31)
+    assert result["summary"]["missing"]["sub_on"] == 2
+
+
+def test_cache_is_reused_until_the_key_changes(csv, tmp_path, monkeypatch):
+    calls = []
+    aggregates = analytics.aggregates
+    monkeypatch.setattr(analytics, "aggregates", lambda frame: calls.append(len(frame)) or aggregates(frame))
+
+    first = analytics.cached_aggregates(csv, tmp_path)
+    again = analytics.cached_aggregates(csv, tmp_path)
+    assert calls == [3]
+    pd.testing.assert_frame_equal(first["club"], again["club"])
+    key = pd.read_pickle(tmp_path / analytics.CACHE_FILE)["key"]
+    assert key == {"version": analytics.VERSION, "sha256": analytics.file_digest(csv), "pandas": pd.__version__}
+
+    # A modified source ...
+    csv.write_text(CSV.replace(",16\n", ",17\n"), encoding="utf-8")
+    assert analytics.cached_aggregates(csv, tmp_path)["summary"]["goals"] == 37
+    assert calls == [3, 3]
+    # ... or a new cache version rebuilds.
+    monkeypatch.setattr(analytics, "VERSION", analytics.VERSION + 1)
+    analytics.cached_aggregates(csv, tmp_path)
+    analytics.cached_aggregates(csv, tmp_path)
+    assert calls == [3, 3, 3]
+
+
+def test_corrupt_cache_is_rebuilt(csv, tmp_path):
+    (tmp_path / analytics.CACHE_FILE).write_bytes(b"not a pickle")
+    assert analytics.cached_aggregates(csv, tmp_path)["summary"]["players"] == 3
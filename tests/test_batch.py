@@ -0,0 +1,90 @@
+import shutil
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from clq import batch
+from clq.batch import MergedTable, ParseCache, Source, find_sources, ingest_batch
+from clq.commands import cli
+from clq.ingest import FIELDS
+
+EXPORT = Path(__file__).resolve().parent.parent / "GlobalTable" / "clq_table_export.tsv"
+
+
+def test_cache_is_keyed_by_parser(tmp_path, monkeypatch):
+    sources = [Source("clq", EXPORT)]
+    output = tmp_path / "merged.clqs"
+    assert [r.cached for r in ingest_batch(sources, output)] == [False]
+    assert [r.cached for r in ingest_batch(sources, output)] == [True]
+    monkeypatch.setattr(batch, "parser_fingerprint", lambda: "changed")
+    assert [r.cached for r in ingest_batch(sources, output)] == [False]
+    table = MergedTable.open(output)
+    assert table.competitions == ["clq"]
+    table.close()
+
+
+def test_cache_entries_differ_by_parser(tmp_path):
+    old, new = ParseCache(tmp_path, "old"), ParseCache(tmp_path, "new")
+    old.put("abc", batch.Parsed([{"club": "A"}], [], 0))
+    assert old.get("abc").records == [{"club": "A"}]
+    assert new.get("abc") is None
+
+
+def test_ingest_exits_1_on_rejects(tmp_path):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    shutil.copy(EXPORT, exports / "clq.tsv")
+    with open(exports / "clq.tsv", "a", encoding="utf-8") as f:
+        f.write("999\tBroken FC\tBroken FC\t1\n")
+    result = CliRunner().invoke(cli, ["ingest", str(exports), "-o", str(tmp_path / "merged.clqs"), "--workers", "1"])
+    assert result.exit_code == 1, result.output
+    assert "1 rejected" in result.output
+
+
+def _records(*clubs):
+    return [{field: 0 for field in FIELDS} | {"rank": rank, "club": club, "points": 10 * rank, "participations": 1}
+            for rank, club in enumerate(clubs, 1)]
+
+
+def test_merge_resolves_clubs_across_competitions():
+    columns, ranges, n_clubs, collisions = batch.merge([
+        ("cl", _records("FK Bodø/Glimt", "Bayern München", "Rhyl FC (- 2020)")),
+        ("el", _records("Bodo Glimt", "FC Bayern Munich", "Celtic FC")),
+    ])
+    assert (n_clubs, collisions) == (4, [])
+    assert columns["club_id"][:6].tolist() == [0, 1, 2, 0, 1, 3]
+    combined = slice(ranges[-1]["start"], ranges[-1]["stop"])
+    assert dict(zip(columns["club"][combined], columns["points"][combined].tolist())) == {
+        "FK Bodø/Glimt": 20, "Bayern München": 40, "Rhyl FC (- 2020)": 30, "Celtic FC": 30,
+    }
+
+
+def test_merge_reports_collisions_instead_of_summing():
+    columns, ranges, n_clubs, collisions = batch.merge([
+        ("cl", _records("Rhyl FC", "Rhyl FC (- 2020)")),
+        ("el", _records("Rhyl FC (- 2020)", "RHYL FC", "Rhyl FC")),
+    ])
+    assert n_clubs == 3
+    assert columns["club_id"][:5].tolist() == [0, 1, 1, 0, 2]
+    assert collisions == [
+        batch.Collision("cl", "Rhyl FC (- 2020)", "Rhyl FC", "key"),
+        batch.Collision("el", "Rhyl FC", "RHYL FC", "exact"),
+    ]
+
+
+def test_merged_table_club(tmp_path):
+    exports = tmp_path / "exports"
+    exports.mkdir()
+    lines = EXPORT.read_text(encoding="utf-8").splitlines(keepends=True)
+    header, rows = lines[:16], lines[16:]
+    (exports / "cl.tsv").write_text("".join(header + rows[:30]), encoding="utf-8")
+    (exports / "el.tsv").write_text("".join(header + rows[20:50]), encoding="utf-8")
+    reports = ingest_batch(find_sources(exports), tmp_path / "merged.clqs")
+    assert [(r.rows, r.rejected, r.collisions) for r in reports] == [(30, 0, []), (30, 0, [])]
+    table = MergedTable.open(tmp_path / "merged.clqs")
+    assert len(table.rows()) == 50
+    assert sorted(table.club("fcsb")) == ["all", "cl"]
+    assert sorted(table.club("QARABAG")) == ["all", "cl"]
+    assert sorted(table.club(table.rows("el")[0]["club"])) == ["all", "cl", "el"]
+    assert table.club("No Such Club") == {}
+    table.close()
@@ -0,0 +1,47 @@
+import datetime as dt
+import json
+
+from squadify.build import INLINE_DAYS, PUZZLE_DIR, build_game, compact_xi
+
+
+def _xi(team, ids):
+    players = [{"id": str(i), "name": f"Player {i}", "number": str(n), "position_top": 10 * n, "position_left": 50}
+               for n, i in enumerate(ids, 1)]
+    return {"team": team, "formation": "4-4-2", "league": "Premier League", "season_year": 2020, "players": players}
+
+
+def test_compact_xi_keeps_every_slot():
+    puzzle = compact_xi(_xi("Rovers", range(11)))
+    assert puzzle["t"] == "Rovers"
+    assert [puzzle["p"][slot[0]][0] for slot in puzzle["s"]] == [f"Player {i}" for i in range(11)]
+
+
+def test_compact_xi_stores_a_repeated_player_once():
+    puzzle = compact_xi(_xi("Rovers", [1, 2, 3, 2]))
+    assert [slot[0] for slot in puzzle["s"]] == [0, 1, 2, 1]
+    assert [record[0] for record in puzzle["p"]] == ["Player 1", "Player 2", "Player 3"]
+    assert [slot[1] for slot in puzzle["s"]] == ["1", "2", "3", "4"]
+
+
+def test_aliases_only_when_needed():
+    xi = _xi("Rovers", [1, 2])
+    xi["players"][0]["name"] = "Groß"
+    xi["players"][1]["name"] = "De Bruyne"
+    assert compact_xi(xi)["p"] == [["Groß"], ["De Bruyne", ["debruyne", "bruyne"]]]
+
+
+def test_build_inlines_only_the_first_days(tmp_path):
+    xis = [_xi(f"Team {day % 3}", range(day % 3, day % 3 + 11)) for day in range(INLINE_DAYS + 5)]
+    report = build_game(xis, tmp_path, dt.date(2026, 1, 1))
+
+    assert report["days"] == len(xis)
+    assert report["shards"] == 3
+    assert report["distinct_players"] == 13
+    calendar = json.loads((tmp_path / PUZZLE_DIR / report["calendar"]["name"]).read_text())
+    assert len(calendar) == len(xis)
+    shell = (tmp_path / "index.html").read_text()
+    assert report["calendar"]["name"] in shell
+    assert json.dumps(calendar[:INLINE_DAYS], separators=(",", ":")) in shell
+    assert json.dumps(calendar, separators=(",", ":")) not in shell
+    for name in calendar:
+        assert (tmp_path / PUZZLE_DIR / f"{name}.json").exists()
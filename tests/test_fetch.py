@@ -0,0 +1,66 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from squadify.fetch import Fetcher, NotCached, Response, ResponseCache
+
+HAR = Path(__file__).resolve().parent / "data" / "squadify.har"
+
+
+@pytest.fixture
+def no_network(monkeypatch):
+    async def refuse(*args, **kwargs):
+        raise AssertionError("the test tried to open a connection")
+
+    monkeypatch.setattr(asyncio, "open_connection", refuse)
+
+
+def test_har_replay(no_network):
+    fetcher = Fetcher(har=[HAR], offline=True)
+    page, logo = fetcher.run(["https://www.squadify.cc/", "https://www.squadify.cc/logo.png"])
+    assert (page.url, page.status, page.source) == ("https://www.squadify.cc/play", 200, "har")
+    assert page.text == "<html><title>Squadify</title></html>"
+    assert page.header("content-encoding") is None
+    assert logo.body == b"\x89PNG\r\n\x1a\n\x00"
+    assert fetcher.stats["har"] == 3
+
+
+def test_offline_miss(no_network):
+    fetcher = Fetcher(har=[HAR], offline=True)
+    result, = fetcher.run(["https://www.squadify.cc/missing"], return_exceptions=True)
+    assert isinstance(result, NotCached)
+    assert fetcher.stats["errors"] == 1
+
+
+def test_cache_hit(tmp_path, no_network):
+    url = "https://www.transfermarkt.com/spielbericht/index/spielbericht/1"
+    ResponseCache(tmp_path).put("GET", Response(url, 200, [("Content-Type", "text/html")], b"<html>match</html>", "network"))
+
+    async def fetch_one():
+        async with Fetcher(cache_dir=tmp_path, max_age=3600) as fetcher:
+            return await fetcher.fetch(url)
+
+    response = asyncio.run(fetch_one())
+    assert (response.source, response.body) == ("cache", b"<html>match</html>")
+    assert Fetcher(cache_dir=tmp_path, offline=True).run([url])[0].body == b"<html>match</html>"
+
+
+def test_single_fetch_opens_its_own_pool(tmp_path):
+    # A local server stands in for the network.
+    async def handle(reader, writer):
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nETag: \"v1\"\r\n\r\nok")
+        await writer.drain()
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server, Fetcher(cache_dir=tmp_path, rate=0) as fetcher:
+            return await fetcher.fetch(f"http://127.0.0.1:{port}/page")
+
+    response = asyncio.run(main())
+    assert (response.status, response.body, response.source) == (200, b"ok", "network")
+    assert ResponseCache(tmp_path).get("GET", response.url)["body"] == b"ok"
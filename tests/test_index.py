@@ -0,0 +1,12 @@
+from squadify.index import XIIndex
+
+
+def _xi(team, year, ids):
+    return {"team": team, "season_year": year, "players": [{"id": str(i), "name": f"Player {i}"} for i in ids]}
+
+
+def test_string_and_int_years_are_one_season():
+    index = XIIndex.from_xis([_xi("Rovers", "2019", [1, 2]), _xi("Rovers", 2019, [2, 3]), _xi("Rovers", None, [4])])
+    season = index.season(2019)
+    assert index.store.column("xi_season").tolist() == [season, season, -1]
+    assert index.squad_players(index.team("Rovers"), season).tolist() == [index.player(k) for k in ("1", "2", "3")]
@@ -0,0 +1,66 @@
+import io
+import json
+
+import pytest
+
+from clq.ingest import IngestStats, ingest, iter_records, parse_row
+
+KAUNAS = "49\tFBK Kaunas (- 2012)\tFBK Kaunas (- 2012)\t8\t28\t10\t7\t11\t38 : 39\t-1\t39\t4.88\n"
+# The export's multi-line header, as in GlobalTable/clq_table_export.tsv.
+HEADER = ["#\tClub\t\n", "Participations\n", "\t\n", "Matches\n", "\n"]
+
+
+def test_parse_row():
+    assert parse_row(KAUNAS) == {
+        "rank": 49, "club": "FBK Kaunas (- 2012)", "participations": 8, "matches": 28, "wins": 10, "draws": 7,
+        "losses": 11, "goals_for": 38, "goals_against": 39, "goal_difference": -1, "points": 39,
+        "points_per_tournament": 4.88,
+    }
+
+
+def test_parse_row_without_points_per_tournament():
+    line = "366\tNK Lokomotiva Zagreb\tNK Lokomotiva Zagreb\t1\t2\t0\t0\t2\t1 : 5\t-4\t0\n"
+    assert parse_row(line)["points_per_tournament"] is None
+    assert parse_row(line.replace("\n", "\t\n"))["points_per_tournament"] is None
+
+
+@pytest.mark.parametrize("line, reason", [
+    ("1\tClub\tClub\t1\n", "columns"),
+    ("1\t \tClub\t1\t2\t1\t0\t1\t3 : 2\t1\t3\t3.00\n", "empty club"),
+    ("1\tClub\tClub\t1\t2\t1\t0\t1\t3-2\t1\t3\t3.00\n", "for : against"),
+    ("1\tClub\tClub\tone\t2\t1\t0\t1\t3 : 2\t1\t3\t3.00\n", "invalid literal"),
+])
+def test_parse_row_rejects(line, reason):
+    with pytest.raises(ValueError, match=reason):
+        parse_row(line)
+
+
+def test_iter_records_skips_header_and_reports_rejects():
+    rejected = []
+    stats = IngestStats()
+    lines = [*HEADER, KAUNAS, "50\tBroken FC\n", KAUNAS.replace("49", "51", 1)]
+    records = list(iter_records(lines, on_reject=rejected.append, stats=stats))
+    assert [r["rank"] for r in records] == [49, 51]
+    assert (stats.rows, stats.rejected, stats.skipped) == (2, 1, len(HEADER))
+    assert rejected[0].line_no == len(HEADER) + 2
+    assert rejected[0].line == "50\tBroken FC"
+    assert "columns" in rejected[0].reason
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_ingest_output_matches_json_module(fmt):
+    lines = [*HEADER, KAUNAS, "366\tNK Lokomotiva Zagreb\tNK Lokomotiva Zagreb\t1\t2\t0\t0\t2\t1 : 5\t-4\t0\n"]
+    out = io.StringIO()
+    stats = ingest(lines, out, fmt)
+    records = list(iter_records(lines))
+    if fmt == "json":
+        assert out.getvalue() == json.dumps(records, indent=2)
+    else:
+        assert out.getvalue() == "".join(json.dumps(r) + "\n" for r in records)
+    assert stats.rows == 2
+
+
+def test_ingest_empty_input_is_an_empty_array():
+    out = io.StringIO()
+    ingest(HEADER, out)
+    assert json.loads(out.getvalue()) == []
@@ -0,0 +1,73 @@
+import argparse
+
+import pytest
+
+from clq import instrument
+from clq.instrument import Profiler
+
+
+def _args(*argv):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input", nargs="?")
+    instrument.add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv(instrument.ENV_VAR, raising=False)
+    monkeypatch.delenv(instrument.CPROFILE_ENV_VAR, raising=False)
+
+
+def test_profile_flag_does_not_take_the_input():
+    args = _args("--profile", "export.tsv")
+    assert args.input == "export.tsv"
+    profiler = Profiler.from_args("run", args)
+    assert profiler.enabled and profiler.output == "-"
+
+
+def test_profile_out():
+    profiler = Profiler.from_args("run", _args("--profile-out", "report.json"))
+    assert profiler.output == "report.json"
+
+
+@pytest.mark.parametrize("value", ["0", "", "false", "False", " no "])
+def test_env_off(monkeypatch, value):
+    monkeypatch.setenv(instrument.ENV_VAR, value)
+    monkeypatch.setenv(instrument.CPROFILE_ENV_VAR, value)
+    assert not Profiler.from_args("run", _args()).enabled
+
+
+def test_env_on(monkeypatch):
+    monkeypatch.setenv(instrument.ENV_VAR, "1")
+    monkeypatch.setenv(instrument.CPROFILE_ENV_VAR, "true")
+    profiler = Profiler.from_args("run", _args())
+    assert (profiler.output, profiler.cprofile) == ("-", "run.prof")
+    monkeypatch.setenv(instrument.ENV_VAR, "report.json")
+    assert Profiler.from_args("run", _args()).output == "report.json"
+
+
+def test_disabled_stages_are_no_ops():
+    with Profiler.from_args("run", _args()) as profiler:
+        with profiler.stage("load") as stage:
+            stage.rows = 10
+    assert profiler.stages == []
+
+
+def test_cprofile_alone_skips_the_report(tmp_path, capsys):
+    dump = tmp_path / "run.prof"
+    with Profiler.from_args("run", _args("--cprofile", str(dump))) as profiler:
+        with profiler.stage("load") as stage:
+            stage.rows = 10
+    assert (profiler.trace_memory, profiler.stages) == (False, [])
+    assert dump.exists()
+    assert capsys.readouterr().err == ""
+
+
+def test_report_traces_memory(capsys):
+    with Profiler.from_args("run", _args("--profile")) as profiler:
+        with profiler.stage("load") as stage:
+            stage.rows = len([0] * 1000)
+    assert profiler.trace_memory
+    assert profiler.stages[0]["alloc_peak_bytes"] > 0
+    assert '"stage": "load"' in capsys.readouterr().err
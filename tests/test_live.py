@@ -0,0 +1,70 @@
+import pytest
+
+from clq.live import LiveTable, MatchResult, RankedSet, points_per_tournament
+
+
+def _row(rank, club, participations, wins, draws, losses, goals_for, goals_against, points):
+    return {
+        "rank": rank, "club": club, "participations": participations, "matches": wins + draws + losses,
+        "wins": wins, "draws": draws, "losses": losses, "goals_for": goals_for, "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against, "points": points,
+        "points_per_tournament": points_per_tournament(points, participations),
+    }
+
+
+RECORDS = [
+    _row(1, "GNK Dinamo Zagreb", 24, 61, 24, 23, 203, 107, 207),
+    # Published with two points more than 3W+D.
+    _row(2, "FBK Kaunas (- 2012)", 8, 10, 7, 11, 38, 39, 39),
+    _row(3, "Rhyl FC (- 2020)", 2, 0, 0, 4, 1, 19, 0),
+]
+
+
+def test_loss_keeps_published_points():
+    table = LiveTable(RECORDS)
+    table.apply(MatchResult("FBK Kaunas", "GNK Dinamo Zagreb", 0, 2, "2025"))
+    row = table.row("FBK Kaunas (- 2012)")
+    assert row["points"] == 39
+    assert row["losses"] == 12
+    assert row["goal_difference"] == -3
+    assert row["participations"] == 9
+    assert row["points_per_tournament"] == 4.33
+    assert row["rank"] == 2
+
+
+def test_results_add_points_deltas():
+    table = LiveTable(RECORDS)
+    table.apply(MatchResult("FBK Kaunas", "Rhyl FC", 1, 1, "2025"))
+    table.apply(MatchResult("Rhyl FC", "FBK Kaunas", 3, 0, "2025"))
+    assert table.row("FBK Kaunas")["points"] == 40
+    assert table.row("Rhyl FC")["points"] == 4
+    assert table.row("Rhyl FC")["participations"] == 3
+
+
+def test_new_club_and_reordering():
+    table = LiveTable(RECORDS)
+    for season in range(80):
+        table.apply(MatchResult("New Club", "Rhyl FC", 5, 0, str(season)))
+    assert table.rank("New Club") == 1
+    assert [r["club"] for r in table.top(2)] == ["New Club", "GNK Dinamo Zagreb"]
+    assert [r["rank"] for r in table.records()] == [1, 2, 3, 4]
+
+
+def test_ranked_set():
+    keys = RankedSet([5, 1, 3])
+    assert list(keys) == [1, 3, 5]
+    assert keys.rank(4) == 2
+    assert keys.select(0) == 1
+    keys.remove(3)
+    assert list(keys) == [1, 5]
+
+
+def test_ambiguous_names_are_refused():
+    table = LiveTable(RECORDS + [_row(4, "Rhyl FC", 1, 0, 0, 2, 0, 5, 0)])
+    # An exact name wins even though "Rhyl FC" and "Rhyl FC (- 2020)" share a key.
+    assert table.row("Rhyl FC")["matches"] == 2
+    assert table.row("Rhyl FC (- 2020)")["matches"] == 4
+    assert "rhyl" not in table
+    with pytest.raises(KeyError, match="more than one club"):
+        table.apply(MatchResult("FBK Kaunas", "rhyl", 1, 0, "2025"))
+    assert table.row("FBK Kaunas")["matches"] == 28
@@ -0,0 +1,38 @@
+import shutil
+
+import pytest
+
+from clq import lookup, sources
+from clq.paths import DATA_DIR
+
+
+@pytest.fixture
+def data_dir(tmp_path):
+    for name in (sources.TABLE_FILE, sources.SCORERS_FILE):
+        shutil.copy(f"{DATA_DIR}/{name}", tmp_path / name)
+    return tmp_path
+
+
+def test_every_name_round_trips(data_dir):
+    groups = lookup.build(data_dir)
+    lookup.find("club", "Celtic FC", data_dir)  # writes the cache
+    for kind in lookup.KINDS:
+        for name, rows in groups[kind].items():
+            assert lookup.find(kind, name, data_dir) == rows
+
+
+def test_normalized_and_missing_names(data_dir):
+    assert lookup.find("club", "  celtic   fc ", data_dir)[0]["club"] == "Celtic FC"
+    assert lookup.find("player", "Nobody At All", data_dir) == []
+    with pytest.raises(ValueError):
+        lookup.find("coach", "x", data_dir)
+
+
+def test_damaged_or_stale_cache_is_rebuilt(data_dir):
+    lookup.find("club", "Celtic FC", data_dir)
+    (data_dir / lookup.CACHE_FILE).write_bytes(b"CLQL junk")
+    assert lookup.find("club", "Celtic FC", data_dir)
+    table = data_dir / sources.TABLE_FILE
+    table.write_text('[{"rank": 1, "club": "Only Club"}]', encoding="utf-8")
+    assert lookup.find("club", "Celtic FC", data_dir) == []
+    assert lookup.find("club", "only club", data_dir) == [{"rank": 1, "club": "Only Club"}]
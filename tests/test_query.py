@@ -0,0 +1,72 @@
+import pytest
+
+from clq import sources, store
+from clq.query import CLUB_SORT_COLUMNS, QueryEngine, Relation
+from clq.store import Store, pack
+
+
+@pytest.fixture(scope="module")
+def records():
+    return sources.load_table(sources.table_path())
+
+
+@pytest.fixture(scope="module")
+def clubs(records):
+    data = Store(pack(store.table_columns(records), {"rows": len(records)}))
+    return Relation(data, keys=("club",), sortable=CLUB_SORT_COLUMNS)
+
+
+def _values(relation, ids, by):
+    return [row[by] for row in relation.rows(ids)]
+
+
+@pytest.mark.parametrize("by", ["points", "goal_difference", "matches"])
+def test_top_matches_a_sort(clubs, records, by):
+    assert _values(clubs, clubs.top(by, 15), by) == sorted((r[by] for r in records), reverse=True)[:15]
+    assert _values(clubs, clubs.top(by, 15, ascending=True), by) == sorted(r[by] for r in records)[:15]
+
+
+def test_top_with_bounds(clubs, records):
+    ids = clubs.top("points_per_tournament", 20, where={"participations": (10, None), "matches": (None, 60)})
+    expected = sorted(
+        (r for r in records if r["participations"] >= 10 and r["matches"] <= 60),
+        key=lambda r: r["points_per_tournament"], reverse=True,
+    )[:20]
+    rows = clubs.rows(ids)
+    assert [r["points_per_tournament"] for r in rows] == [r["points_per_tournament"] for r in expected]
+    assert all(r["participations"] >= 10 and r["matches"] <= 60 for r in rows)
+
+
+def test_top_skips_missing_values(clubs, records):
+    recorded = [r["points_per_tournament"] for r in records if r["points_per_tournament"] is not None]
+    assert _values(clubs, clubs.top("points_per_tournament", len(records), ascending=True), "points_per_tournament") \
+        == sorted(recorded)
+
+
+@pytest.mark.parametrize("lo, hi", [(50, 100), (None, -40), (300, None), (1000, None)])
+def test_range(clubs, records, lo, hi):
+    ids = clubs.select({"points": (lo, hi)}, order_by="points", ascending=False)
+    expected = sorted(
+        (r["points"] for r in records if (lo is None or r["points"] >= lo) and (hi is None or r["points"] <= hi)),
+        reverse=True,
+    )
+    assert _values(clubs, ids, "points") == expected
+
+
+def test_range_with_two_bounds_and_limit(clubs, records):
+    ids = clubs.select({"points": (20, 60), "participations": (5, 8)}, order_by="points", ascending=False, limit=5)
+    rows = clubs.rows(ids)
+    assert len(rows) == 5
+    assert all(20 <= r["points"] <= 60 and 5 <= r["participations"] <= 8 for r in rows)
+    assert [r["points"] for r in rows] == sorted((r["points"] for r in rows), reverse=True)
+
+
+def test_unindexed_column_is_an_error(clubs):
+    with pytest.raises(KeyError, match="no sorted index"):
+        clubs.top("wins")
+
+
+def test_club_lookup(tmp_path):
+    engine = QueryEngine.open(store_dir=tmp_path)
+    assert [r["rank"] for r in engine.club("  fbk KAUNAS (- 2012) ")] == [49]
+    assert engine.club("Dinamo Zagreb")[0]["club"] == "GNK Dinamo Zagreb"
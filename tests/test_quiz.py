@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+
+from clq import quiz
+from clq.query import QueryEngine
+from clq.quiz import CHUNK_SIZE, QuizBank, generate
+
+
+@pytest.fixture(scope="module")
+def bank():
+    return QuizBank.open()
+
+
+def test_batches_are_distinct_and_answerable(bank):
+    questions = generate(500, seed=3, bank=bank)
+    assert len(questions) == 500
+    assert len({q["id"] for q in questions}) == 500
+    for q in questions:
+        assert 0 <= q["answer"] < len(q["options"]) == len(q["values"])
+        assert len(set(q["options"])) == len(q["options"])
+
+
+def test_same_seed_same_batch(bank):
+    assert generate(300, seed=7, bank=bank) == generate(300, seed=7, bank=bank)
+    assert generate(300, seed=7, bank=bank) != generate(300, seed=8, bank=bank)
+
+
+def test_worker_pool_matches_serial(bank, monkeypatch):
+    n = CHUNK_SIZE * 3
+    serial = generate(n, seed=11, bank=bank)
+    # Force the pool path even on a single-CPU machine.
+    monkeypatch.setattr(quiz.os, "cpu_count", lambda: 4)
+    assert generate(n, seed=11, workers=2) == serial
+
+
+def test_missing_nationalities_are_not_options():
+    table = quiz._totals(["Brazil", None, "", "Israel", "Brazil", " "], np.array([3.0, 9.0, 8.0, 2.0, np.nan, 7.0]))
+    assert [table.names[i] for i in table.order] == ["Brazil", "Israel"]
+    assert table.values.tolist() == [3.0, 2.0]
+
+
+def test_nationality_options_are_named(bank):
+    groups = bank.nationality_goals.groups(np.random.default_rng(0), 200)
+    assert all(bank.nationality_goals.names[bank.nationality_goals.order[i]] for i in groups.ravel())
+
+
+def test_bank_uses_the_cached_rollup(bank, monkeypatch):
+    from clq import analytics
+
+    # The same questions as a bank that sums the store's columns itself ...
+    assert generate(1000, seed=5, bank=QuizBank(QueryEngine.open())) == generate(1000, seed=5, bank=bank)
+    # ... without recomputing the rollup while the CSV is unchanged.
+    monkeypatch.setattr(analytics, "aggregates", lambda frame: pytest.fail("aggregates recomputed"))
+    QuizBank.open()
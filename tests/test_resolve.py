@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+
+from clq.resolve import ClubResolver, club_key
+
+CLUBS = [
+    "FC Bayern München", "Bangor City (- 2025)", "1.FC Kosice (1951 - 2004)", "FK Bodø/Glimt",
+    "Red Star", "FC Red Star", "Sparta Praha", "Sparta Prahu", "Slavia Praha",
+]
+
+
+@pytest.fixture(scope="module")
+def resolver():
+    return ClubResolver(CLUBS)
+
+
+@pytest.mark.parametrize("name, key", [
+    ("FC Bayern München", "bayern munchen"),
+    ("  BAYERN  münchen ", "bayern munchen"),
+    ("FK Bodø/Glimt", "bodo glimt"),
+    ("Bangor City (- 2025)", "bangor city"),
+    ("Bangor City ( -2025)", "bangor city"),
+    ("1.FC Kosice (1951 - 2004)", "1 kosice"),
+    ("Fußball", "fussball"),
+    ("FC", "fc"),
+])
+def test_club_key(name, key):
+    assert club_key(name) == key
+
+
+def test_exact_and_key_matches(resolver):
+    assert resolver.resolve("FK Bodø/Glimt")[1:] == ("FK Bodø/Glimt", 1.0, "exact")
+    assert resolver.resolve("Bodo Glimt")[1:] == ("FK Bodø/Glimt", 1.0, "key")
+    assert resolver.resolve("bangor city")[1:] == ("Bangor City (- 2025)", 1.0, "key")
+
+
+def test_fuzzy_above_threshold(resolver):
+    match = resolver.resolve("Bayern Munich")
+    assert (match.club, match.method) == ("FC Bayern München", "fuzzy")
+    assert resolver.threshold <= match.score < 1.0
+
+
+def test_fuzzy_below_threshold(resolver):
+    assert resolver.resolve("Celtic") is None
+    assert resolver.resolve("Praha") is None
+    assert ClubResolver(CLUBS, threshold=0.3).resolve("Praha") is not None
+
+
+def test_ties_go_to_the_better_ranked_club(resolver):
+    # "Red Star" and "FC Red Star" fold to the same key; the exact spelling
+    # still wins, anything else takes the earlier (higher-ranked) row.
+    assert resolver.resolve("FC Red Star").club == "FC Red Star"
+    assert resolver.resolve("red star").club == "Red Star"
+    # "Sparta Prah" is equally close to both Sparta rows.
+    match = resolver.resolve("Sparta Prah")
+    assert (match.club, match.method) == ("Sparta Praha", "fuzzy")
+    assert ClubResolver(CLUBS[::-1]).resolve("Sparta Prah").club == "Sparta Prahu"
+
+
+def test_multi_club_rows_are_unresolved(resolver):
+    assert resolver.resolve("for 3 clubs") is None
+
+
+def test_join(resolver):
+    records = [{"club": "Bodo Glimt"}, {"club": "Celtic"}, {"club": None}, {"club": "Bodo Glimt"}]
+    assert np.array_equal(resolver.join(records), [3, -1, -1, 3])
@@ -0,0 +1,67 @@
+import datetime as dt
+
+import pytest
+
+from squadify.schedule import Calendar, extend, resolve, schedule, spacing, xi_key
+
+START = dt.date(2026, 1, 1)
+
+
+@pytest.fixture(scope="module")
+def xis():
+    # 60 XIs: 12 teams in 3 leagues over 5 seasons, listed team by team like
+    # the scraped database, so a plain rotation shows a team on consecutive days.
+    found = []
+    for i in range(60):
+        team = i // 5
+        season = 2015 + i % 5
+        found.append({
+            "match_id": 1000 + i,
+            "team": f"Team {team}",
+            "league": f"League {team % 3}",
+            "season_year": season,
+            "players": [{"id": str(team * 20 + (season + k) % 20), "name": f"P{k}"} for k in range(11)],
+        })
+    return found
+
+
+def _rotation(xis, days):
+    return Calendar(START, [xi_key(xis[day % len(xis)]) for day in range(days)])
+
+
+def test_every_xi_is_shown(xis):
+    calendar = schedule(xis, 2 * len(xis), START)
+    assert set(calendar.days) == {xi_key(xi) for xi in xis}
+
+
+def test_spacing_beats_the_rotation(xis):
+    days = 3 * len(xis)
+    report = spacing(schedule(xis, days, START), xis)
+    baseline = spacing(_rotation(xis, days), xis)
+    assert report["xi"]["min"] >= len(xis) // 2
+    assert baseline["team"]["min"] == baseline["player"]["min"] == 1
+    for kind in ("team", "player"):
+        assert report[kind]["min"] > baseline[kind]["min"], kind
+        assert report[kind]["p5"] > baseline[kind]["p5"], kind
+    assert report["league"]["median"] > baseline["league"]["median"]
+
+
+def test_schedule_is_deterministic(xis):
+    assert schedule(xis, 90, START) == schedule(list(xis), 90, START)
+
+
+def test_extend_keeps_published_days(xis):
+    calendar = schedule(xis[:40], 100, START)
+    extended = extend(calendar, xis, 200, keep_until=START + dt.timedelta(days=30))
+    assert extended.days[:30] == calendar.days[:30]
+    assert len(extended.days) == 200
+    assert {xi_key(xi) for xi in xis[40:]} <= set(extended.days)
+
+
+def test_calendar_round_trip(xis, tmp_path):
+    calendar = schedule(xis, 20, START)
+    calendar.save(tmp_path / "calendar.json")
+    loaded = Calendar.load(tmp_path / "calendar.json")
+    assert loaded == calendar
+    assert loaded.window(START + dt.timedelta(days=5), 3).days == calendar.days[5:8]
+    assert [xi["match_id"] for xi in resolve(loaded, xis)] == [int(key.split(":")[0]) for key in loaded.days]
@@ -0,0 +1,97 @@
+import asyncio
+import datetime as dt
+import json
+import os
+import shutil
+import threading
+import time
+
+import pytest
+
+from clq import sources
+from clq.paths import DATA_DIR
+from clq.server import App, respond
+
+
+@pytest.fixture
+def app(tmp_path):
+    for name in (sources.TABLE_FILE, sources.SCORERS_FILE):
+        shutil.copy(os.path.join(DATA_DIR, name), tmp_path / name)
+    return App(tmp_path, xis_path=tmp_path / "none.json", calendar_path=tmp_path / "none.json",
+               today=lambda: dt.date(2026, 1, 1))
+
+
+def _bump(path):
+    later = time.time() + 5
+    os.utime(path, (later, later))
+
+
+def test_failed_reload_is_retried(app, tmp_path):
+    table = tmp_path / sources.TABLE_FILE
+    good = table.read_text(encoding="utf-8")
+    table.write_text(good[:1000], encoding="utf-8")  # half-written
+    _bump(table)
+    with pytest.raises(ValueError):
+        app.reload_if_changed()
+    assert json.loads(app.get("/club/Celtic FC").body)["rows"]  # old data still served
+    with pytest.raises(ValueError):
+        app.reload_if_changed()  # still changed, so tried again
+    table.write_text(good.replace("Celtic FC", "Celtic Glasgow"), encoding="utf-8")
+    _bump(table)
+    assert app.reload_if_changed()
+    assert not app.reload_if_changed()
+    assert json.loads(app.get("/club/Celtic Glasgow").body)["rows"][0]["club"] == "Celtic Glasgow"
+
+
+def test_respond_caches_and_revalidates(app):
+    async def run():
+        status, headers, body = await respond(app, "GET", "/quiz?n=50&seed=1", {})
+        assert status == 200 and len(json.loads(body)["questions"]) == 50
+        etag = dict(headers)["ETag"]
+        assert (await respond(app, "GET", "/quiz?seed=1&n=50", {"if-none-match": etag}))[0] == 304
+        assert (await respond(app, "GET", "/nowhere", {}))[0] == 404
+        assert (await respond(app, "POST", "/quiz", {}))[0] == 405
+
+    asyncio.run(run())
+    assert app.cache.hits == 1
+
+
+def test_indexes_are_built_on_load(app):
+    for relation in (app.engine.clubs, app.engine.scorers):
+        assert set(relation._hash) == set(relation.keys)
+        assert set(relation._sorted) == set(relation.sortable)
+        assert set(relation._columns) == set(relation.store.names)
+    assert app.engine._resolver is not None
+
+
+def test_reload_closes_old_stores_after_inflight_renders(app, tmp_path, monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    render = app.render
+
+    def slow_render(path, params):
+        started.set()
+        release.wait(5)
+        return render(path, params)
+
+    monkeypatch.setattr(app, "render", slow_render)
+    closed = []
+    first = app.engine
+    monkeypatch.setattr(first, "close", lambda: closed.append(first))
+
+    async def run():
+        pending = asyncio.ensure_future(app.get_async("/club/Celtic FC"))
+        await asyncio.get_running_loop().run_in_executor(None, started.wait, 5)
+        _bump(tmp_path / sources.TABLE_FILE)
+        assert app.reload_if_changed()
+        assert closed == []  # the render may still be reading the old stores
+        release.set()
+        payload = await pending
+        assert closed == [first]
+        return payload
+
+    assert json.loads(asyncio.run(run()).body)["rows"]
+    second = app.engine
+    monkeypatch.setattr(second, "close", lambda: closed.append(second))
+    _bump(tmp_path / sources.SCORERS_FILE)
+    assert app.reload_if_changed()
+    assert closed == [first, second]  # nothing in flight: closed right away
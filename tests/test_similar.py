@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from clq.similar import FIRST_ROUNDS, ClubIndex, KDTree
+
+
+def _brute(points, queries):
+    return np.sqrt(((queries[:, None, :] - points[None, :, :]) ** 2).sum(axis=2))
+
+
+@pytest.fixture(scope="module")
+def points():
+    return np.random.default_rng(1).normal(size=(2000, 4))
+
+
+@pytest.mark.parametrize("leaf_size", [None, 4, 5000])
+@pytest.mark.parametrize("k", [1, 7, 40])
+def test_query_matches_brute_force(points, leaf_size, k):
+    queries = np.vstack([points[:50], np.random.default_rng(2).normal(scale=2.0, size=(300, 4))])
+    dist, ids = KDTree(points, leaf_size).query(queries, k)
+    brute = _brute(points, queries)
+    expected = np.sort(brute, axis=1)[:, :k]
+    np.testing.assert_allclose(dist, expected)
+    np.testing.assert_allclose(np.take_along_axis(brute, ids, axis=1), dist)
+    assert (dist[:50, 0] == 0).all() and (ids[:50, 0] == np.arange(50)).all()
+
+
+def test_small_leaves_visit_beyond_the_first_rounds(points):
+    # A far-away query with 4-point buckets must look at many more than FIRST_ROUNDS buckets.
+    query = np.full((1, 4), 3.0)
+    dist, _ = KDTree(points, leaf_size=4).query(query, 4 * FIRST_ROUNDS + 1)
+    np.testing.assert_allclose(dist[0], np.sort(_brute(points, query)[0])[:4 * FIRST_ROUNDS + 1])
+
+
+@pytest.mark.parametrize("radius", [0.0, 0.5, 1.5])
+def test_query_radius_matches_brute_force(points, radius):
+    queries = np.vstack([points[:20], np.random.default_rng(3).normal(size=(100, 4))])
+    found = KDTree(points, leaf_size=16).query_radius(queries, radius)
+    brute = _brute(points, queries)
+    for row, ids in zip(brute, found):
+        assert set(ids.tolist()) == set(np.flatnonzero(row <= radius).tolist())
+        assert (np.diff(row[ids]) >= 0).all()
+
+
+def test_ties_and_k_beyond_the_rows():
+    grid = np.array([[x, y] for x in range(3) for y in range(3)], dtype=np.float64)
+    tree = KDTree(grid, leaf_size=2)
+    dist, ids = tree.query([[1.0, 1.0]], 5)
+    # The centre, then its four neighbours at distance 1 in any order.
+    assert dist[0].tolist() == [0.0, 1.0, 1.0, 1.0, 1.0]
+    assert ids[0, 0] == 4 and set(ids[0, 1:].tolist()) == {1, 3, 5, 7}
+    dist, ids = tree.query([[0.0, 0.0]], 50)
+    assert ids.shape == (1, 9) and sorted(ids[0].tolist()) == list(range(9))
+    assert [ids.tolist() for ids in tree.query_radius([[0.0, 0.0]], 1.0)] == [[0, 1, 3]]
+
+
+def _columns(records):
+    names = ("matches", "wins", "draws", "losses", "goals_for", "goal_difference", "points", "participations",
+             "points_per_tournament")
+    return {name: np.array([r[i] for r in records], dtype=np.float64) for i, name in enumerate(names)}
+
+
+@pytest.fixture
+def clubs():
+    records = [
+        (10, 5, 2, 3, 20, 5, 17, 3, 5.67),
+        (10, 5, 2, 3, 20, 5, 17, 3, 5.67),  # the same record as the first club
+        (10, 1, 3, 6, 5, -10, 6, 2, 3.0),
+        (12, 6, 2, 4, 22, 6, 20, 4, 5.0),
+    ]
+    return ClubIndex(["Alpha", "Beta", "Gamma", "Delta"], _columns(records))
+
+
+def test_neighbours_exclude_the_club_itself(clubs):
+    dist, ids = clubs.neighbours([0, 1, 2, 3], 2)
+    assert [row[0] for row in ids.tolist()[:2]] == [1, 0]  # the tied twin, at distance 0
+    assert dist[0, 0] == dist[1, 0] == 0.0
+    for row, found in enumerate(ids.tolist()):
+        assert row not in found
+
+
+def test_neighbours_with_k_beyond_the_table(clubs):
+    dist, ids = clubs.neighbours([0, 2], 10)
+    assert ids.shape == (2, 3)
+    assert sorted(ids[0].tolist()) == [1, 2, 3] and sorted(ids[1].tolist()) == [0, 1, 3]
+    assert [n.club for n in clubs.similar("alpha", 10)][0] == "Beta"
+    assert "Alpha" not in {n.club for n in clubs.within("Alpha", 100.0)}
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from clq import sources, store
+from clq.store import INT_NULL, Store, pack, write_store
+
+
+def test_round_trip(tmp_path):
+    columns = {
+        "n": np.array([3, INT_NULL, -1], dtype=np.int32),
+        "x": np.array([0.5, np.nan, 2.0]),
+        "name": ["Groß", None, "Groß"],
+    }
+    path = write_store(tmp_path / "t.clqs", columns, {"rows": 3, "source": "test"})
+    with Store.open(path) as data:
+        assert data.meta == {"rows": 3, "source": "test"}
+        assert len(data) == 3
+        assert data.names == ["n", "x", "name"]
+        assert data.is_text("name") and not data.is_text("n")
+        assert data.column("n").tolist() == [3, INT_NULL, -1]
+        assert data.text("name") == ["Groß", None, "Groß"]
+        assert data.strings == ["Groß"]
+        assert data.code("Groß") == 0 and data.code("Gross") == -1
+        assert [data.row(i) for i in range(3)] == [
+            {"n": 3, "x": 0.5, "name": "Groß"},
+            {"n": None, "x": None, "name": None},
+            {"n": -1, "x": 2.0, "name": "Groß"},
+        ]
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_table_records_round_trip():
+    records = sources.load_table(sources.table_path())
+    data = Store(pack(store.table_columns(records), {"rows": len(records)}))
+    assert [data.row(i) for i in range(len(data))] == records
+
+
+def test_rejects_other_files():
+    with pytest.raises(ValueError, match="not a CLQ store"):
+        Store(b"JUNK" + bytes(60))
+
+
+def test_open_dataset_rebuilds_when_the_source_changes(tmp_path):
+    source = tmp_path / "rows.txt"
+    source.write_text("a\nb\n")
+
+    def load(path):
+        return path.read_text().split()
+
+    def to_columns(rows):
+        return {"value": rows}
+
+    with store.open_dataset("rows", source, load, to_columns) as data:
+        assert data.text("value") == ["a", "b"]
+    source.write_text("a\nb\nc\n")
+    with store.open_dataset("rows", source, load, to_columns) as data:
+        assert data.text("value") == ["a", "b", "c"]
@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from clq import sources
+from clq.validate import validate_scorers, validate_table
+
+
+def _counts(report):
+    return {r.rule.name: r.count for r in report.results if r.count}
+
+
+def _row(rank, club, wins, draws, losses, goals_for, goals_against, participations=2):
+    points = 3 * wins + draws
+    return {
+        "rank": rank, "club": club, "participations": participations, "matches": wins + draws + losses,
+        "wins": wins, "draws": draws, "losses": losses, "goals_for": goals_for, "goals_against": goals_against,
+        "goal_difference": goals_for - goals_against, "points": points,
+        "points_per_tournament": round(points / participations, 2),
+    }
+
+
+@pytest.fixture
+def rows():
+    return [
+        _row(1, "Alpha", 6, 1, 1, 15, 5),
+        _row(2, "Beta", 5, 2, 1, 12, 6),
+        _row(3, "Gamma", 4, 1, 3, 10, 9),
+        _row(4, "Delta", 2, 2, 4, 7, 12),
+        _row(5, "Epsilon", 1, 0, 7, 3, 20),
+    ]
+
+
+def _write(tmp_path, rows, fmt):
+    path = tmp_path / f"table.{fmt}"
+    with open(path, "w", encoding="utf-8") as f:
+        if fmt == "json":
+            json.dump(rows, f, indent=2)
+        else:
+            f.writelines(json.dumps(r) + "\n" for r in rows)
+    return path
+
+
+@pytest.mark.parametrize("fmt", ["json", "jsonl"])
+def test_clean_table(tmp_path, rows, fmt):
+    report = validate_table(_write(tmp_path, rows, fmt))
+    assert report.ok and report.rows == 5 and not report.warnings
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 2, 1000])
+def test_errors_are_found_across_chunks(tmp_path, rows, chunk_rows):
+    rows[1]["points"] += 2                      # points and points_per_tournament
+    rows[2]["losses"] = -1                      # non_negative and results
+    rows[3]["goal_difference"] = 0              # goal_difference
+    rows[4]["rank"] = 3                         # rank_order
+    rows[4]["points_per_tournament"] = None     # warning only
+    report = validate_table(_write(tmp_path, rows, "json"), chunk_rows=chunk_rows)
+    assert _counts(report) == {
+        "non_negative": 1, "results": 1, "points": 1, "goal_difference": 1, "points_per_tournament": 1,
+        "rank_order": 1, "points_per_tournament_missing": 1,
+    }
+    assert (report.errors, report.warnings, report.ok) == (5, 2, False)
+    points = next(r for r in report.results if r.rule.name == "points")
+    assert [(v.row, v.label) for v in points.examples] == [(2, "Beta")]
+    assert points.examples[0].values == {"wins": 5, "draws": 2, "points": 19}
+
+
+def test_points_order(tmp_path, rows):
+    rows[0], rows[1] = rows[1], rows[0]
+    rows[0]["rank"], rows[1]["rank"] = 1, 2
+    report = validate_table(_write(tmp_path, rows, "jsonl"))
+    assert _counts(report) == {"points_order": 1}
+    assert report.to_dict()["violations"][0]["examples"][0]["label"] == "Alpha"
+
+
+def test_published_data():
+    table = validate_table(sources.table_path())
+    assert _counts(table) == {"points": 1, "points_per_tournament_missing": 51}
+    assert table.results[2].examples[0].label == "FBK Kaunas (- 2012)"
+    assert table.ok
+    assert "0 errors, 52 warnings" in table.format()
+    assert validate_scorers(sources.scorers_path()).ok
+
+
+def test_scorer_errors(tmp_path):
+    path = tmp_path / "scorers.csv"
+    path.write_text(
+        "Rank,Player,Position,Club(s),Nationality,Age,Seasons,Matches,SubOn,SubOff,Assists,Penalties,Goals\n"
+        "1,Marcos Tavares,Second Striker,NK Maribor,Brazil,41,9,42,5,16,4,1,16\n"
+        "2,Eran Zahavi,Centre-Forward,for 3 clubs,Israel,38,6,27,-,10,7,9,8\n"
+        "3,Someone Else,Winger,Club,Country,30,2,5,6,-,0,0,9\n",
+        encoding="utf-8",
+    )
+    report = validate_scorers(path, chunk_rows=2)
+    assert _counts(report) == {"penalties": 1, "sub_on": 1, "goals_order": 1}
+    assert [v.label for r in report.results for v in r.examples] == ["Eran Zahavi", "Someone Else", "Someone Else"]